@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional
+from aws_cdk import aws_ec2
+from aws_cdk.core import NestedStack
+from aws_ci_cd_fargate.ecs_fargate_with_ci_cd import EcsFargateWithCiCd
+from aws_ci_cd_fargate.parameters.fleet_service_parameters import FleetServiceParams
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
+from aws_ci_cd_fargate.source.shared_resources import SharedResources
+
+
+class EcsFargateFleet:
+    """
+    Creates many ECS Fargate services with blue/green CI/CD deployments which share one ecs cluster,
+    one pipeline artifacts bucket and common roles.
+    """
+    def __init__(
+            self,
+            scope,
+            prefix: str,
+            vpc: aws_ec2.Vpc,
+            services: List[FleetServiceParams],
+            resource_mode: str = ResourceMode.CUSTOM,
+            services_per_stack: Optional[int] = None
+    ) -> None:
+        """
+        Constructor.
+
+        :param scope: A CF stack in which to create resources.
+        :param prefix: The prefix for shared resources. E.g. Shop.
+        :param vpc: Virtual private cloud (VPC).
+        :param services: Parameters of every service in a fleet.
+        :param resource_mode: How ecs services and their deployment groups are managed. ResourceMode.NATIVE
+        is recommended for fleets, since it saves a lambda function, roles and invocations per service.
+        :param services_per_stack: If specified, services are split into nested stacks of this size. Nested stacks
+        are deployed in parallel and each of them has its own CloudFormation resource limit.
+        Shared resources stay in a given stack.
+        """
+        prefixes = [service.prefix for service in services]
+        duplicate_prefixes = sorted({name for name in prefixes if prefixes.count(name) > 1})
+
+        if duplicate_prefixes:
+            raise ValueError(f'Service prefixes must be unique, duplicates: {duplicate_prefixes}.')
+
+        self.__validate_rule_priorities(services)
+
+        if services_per_stack is not None and services_per_stack < 1:
+            raise ValueError('Services per stack must be a positive number.')
+
+        self.shared_resources = SharedResources(scope, prefix=prefix, vpc=vpc)
+
+        self.nested_stacks: List[NestedStack] = []
+        self.services: Dict[str, EcsFargateWithCiCd] = {}
+
+        for index, service in enumerate(services):
+            service_scope = scope
+
+            if services_per_stack:
+                if index % services_per_stack == 0:
+                    self.nested_stacks.append(NestedStack(
+                        scope, prefix + f'FargateServices{len(self.nested_stacks) + 1}'
+                    ))
+
+                service_scope = self.nested_stacks[-1]
+
+            self.services[service.prefix] = EcsFargateWithCiCd(
+                service_scope,
+                prefix=service.prefix,
+                vpc=vpc,
+                lb_params=service.lb_params,
+                ecs_params=service.ecs_params,
+                lb_listener_params=service.lb_listener_params,
+                pipeline_params=service.pipeline_params,
+                deployment_params=service.deployment_params,
+                deployment_alarms=service.deployment_alarms,
+                lifecycle_hook_params=service.lifecycle_hook_params,
+                resource_mode=resource_mode,
+                shared_resources=self.shared_resources
+            )
+
+    @staticmethod
+    def __validate_rule_priorities(services: List[FleetServiceParams]) -> None:
+        """
+        Checks that services sharing a listener do not share a listener rule priority.
+
+        :param services: Parameters of every service in a fleet.
+
+        :return: No return.
+        """
+        owners = {}
+
+        for service in services:
+            listener_params = service.lb_listener_params
+
+            for listener in [listener_params.production_listener, listener_params.deployment_listener]:
+                key = (listener.node.path, listener_params.rule_priority)
+
+                if key in owners:
+                    raise ValueError(
+                        f'Services {owners[key]} and {service.prefix} use the same rule priority '
+                        f'{listener_params.rule_priority} on listener {listener.node.path}.'
+                    )
+
+                owners[key] = service.prefix
@@ -1,11 +1,18 @@
+from typing import Optional
 from aws_cdk import aws_ec2
+from aws_ci_cd_fargate.parameters.deployment_parameters import DeploymentParams
 from aws_ci_cd_fargate.parameters.lb_listener_parameters import LbListenerParameters
+from aws_ci_cd_fargate.parameters.lifecycle_hook_parameters import LifecycleHookParams
 from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
+from aws_ci_cd_fargate.source.deployment_alarms import DeploymentAlarms
 from aws_ci_cd_fargate.source.ecs_main import Ecs
 from aws_ci_cd_fargate.source.ecs_pipeline import EcsPipeline
 from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
 from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
 from aws_ci_cd_fargate.source.lb_listener_config import LbListenerConfig
+from aws_ci_cd_fargate.source.lifecycle_hooks.lifecycle_hooks import LifecycleHooks
+from aws_ci_cd_fargate.source.shared_resources import SharedResources
 
 
 class EcsFargateWithCiCd:
@@ -20,7 +27,12 @@ class EcsFargateWithCiCd:
             lb_params: LoadBalancerParams,
             ecs_params: EcsParams,
             lb_listener_params: LbListenerParameters,
-            pipeline_params: PipelineParams
+            pipeline_params: PipelineParams,
+            deployment_params: Optional[DeploymentParams] = None,
+            deployment_alarms: bool = False,
+            lifecycle_hook_params: Optional[LifecycleHookParams] = None,
+            resource_mode: str = ResourceMode.CUSTOM,
+            shared_resources: Optional[SharedResources] = None
     ) -> None:
         """
         Constructor.
@@ -32,24 +44,70 @@ class EcsFargateWithCiCd:
         :param ecs_params: Compute power parameters for newly deployed container.
         :param lb_listener_params: Parameters two configure existing listeners with listener rules.
         :param pipeline_params: Configuration parameters for ci/cd pipeline.
+        :param deployment_params: Configuration parameters for blue/green deployments.
+        :param deployment_alarms: Whether to create target response time and 5xx alarms (with thresholds taken from
+        loadbalancer parameters) which stop and roll back a deployment when triggered.
+        :param lifecycle_hook_params: If specified, deployments warm up and load test new containers through
+        the deployment listener before production traffic is shifted to them.
+        :param resource_mode: How an ecs service and its deployment group are managed. One of ResourceMode
+        constants. ResourceMode.NATIVE saves a lambda function, a role and an invocation per resource on every
+        stack create and update. Read README before switching an existing stack.
+        :param shared_resources: Resources shared with other services (see EcsFargateFleet). If not specified,
+        a service gets its own cluster, artifacts bucket and roles.
         """
+        if resource_mode not in ResourceMode.ALL:
+            raise ValueError(f'Unsupported resource mode {resource_mode}.')
+
         self.lb_listener_config = LbListenerConfig(
             scope,
             prefix=prefix,
             vpc=vpc,
             listener_params=lb_listener_params,
-            healthy_http_codes=lb_params.healthy_http_codes,
-            health_check_path=lb_params.health_check_path
+            lb_params=lb_params,
+            target_group_port=ecs_params.container_port
         )
 
+        self.deployment_alarms = None
+
+        if deployment_alarms:
+            self.deployment_alarms = DeploymentAlarms(
+                scope,
+                prefix=prefix,
+                lb_params=lb_params,
+                load_balancer_full_name=self.lb_listener_config.load_balancer_full_name,
+                production_target_group=self.lb_listener_config.production_target_group,
+                deployment_target_group=self.lb_listener_config.deployment_target_group
+            )
+
         self.ecs = Ecs(
             scope,
             prefix=prefix,
             ecs_params=ecs_params,
             lb_listener_config=self.lb_listener_config,
-            vpc=vpc
+            vpc=vpc,
+            resource_mode=resource_mode,
+            cluster=shared_resources.cluster if shared_resources else None,
+            capacity_provider_associations=(
+                shared_resources.capacity_provider_associations if shared_resources else None
+            ),
+            task_execution_role=shared_resources.task_execution_role if shared_resources else None
         )
 
+        self.lifecycle_hooks = None
+
+        if lifecycle_hook_params:
+            self.lifecycle_hooks = LifecycleHooks(
+                scope,
+                prefix=prefix,
+                hook_params=lifecycle_hook_params,
+                ecs_params=ecs_params,
+                vpc=vpc
+            )
+
+        task_def = self.ecs.create_task_def()
+        app_spec = self.ecs.create_appspec(self.lifecycle_hooks.hooks if self.lifecycle_hooks else None)
+        self.ecs.validate_ports(task_def, app_spec)
+
         self.pipeline = EcsPipeline(
             scope,
             prefix=prefix,
@@ -57,10 +115,16 @@ class EcsFargateWithCiCd:
             deployments_listener=lb_listener_params.deployment_listener,
             ecs_service=self.ecs.service,
             ecs_cluster=self.ecs.cluster,
-            task_def=self.ecs.create_task_def(),
-            app_spec=self.ecs.create_appspec(),
-            build_environment=pipeline_params.build_environment,
-            docker_build_args=pipeline_params.docker_build_args,
+            task_def=task_def,
+            app_spec=app_spec,
+            pipeline_params=pipeline_params,
+            cpu_architecture=ecs_params.cpu_architecture,
+            deployment_params=deployment_params or DeploymentParams(),
+            deployment_alarm_names=self.deployment_alarms.alarm_names if self.deployment_alarms else [],
             production_target_group=self.lb_listener_config.production_target_group,
-            deployment_target_group=self.lb_listener_config.deployment_target_group
+            deployment_target_group=self.lb_listener_config.deployment_target_group,
+            resource_mode=resource_mode,
+            artifacts_bucket=shared_resources.artifacts_bucket if shared_resources else None,
+            deployment_group_role=shared_resources.deployment_group_role if shared_resources else None,
+            custom_resource_role=shared_resources.custom_resource_role(scope) if shared_resources else None
         )
@@ -0,0 +1,65 @@
+from typing import Any, Dict, List, Optional
+from aws_cdk import aws_ecs
+
+
+class ContainerParams:
+    """
+    Parameters class which specifies an additional (sidecar) container running next to the main container
+    e.g. a local caching proxy or a telemetry collector.
+    """
+    # Conditions which must be met by a container before a dependent container starts.
+    START = 'START'
+    COMPLETE = 'COMPLETE'
+    SUCCESS = 'SUCCESS'
+    HEALTHY = 'HEALTHY'
+
+    def __init__(
+            self,
+            name: str,
+            image: str,
+            cpu: Optional[int] = None,
+            memory_reservation: Optional[int] = None,
+            memory_limit: Optional[int] = None,
+            essential: bool = True,
+            environment: Optional[Dict[str, Any]] = None,
+            container_ports: Optional[List[int]] = None,
+            depends_on: Optional[Dict[str, str]] = None,
+            command: Optional[List[str]] = None,
+            health_check: Optional[aws_ecs.HealthCheck] = None
+    ) -> None:
+        """
+        Constructor.
+
+        :param name: A unique (within a task) name of a container.
+        :param image: An image of a container e.g. public.ecr.aws/docker/library/redis:6.
+        :param cpu: Cpu units reserved for a container. The rest of task cpu units is shared by all containers.
+        :param memory_reservation: Memory (MiB) reserved for a container.
+        :param memory_limit: Memory (MiB) after which a container is killed.
+        :param essential: Whether a whole task should be stopped if this container stops.
+        :param environment: Environment that will be passed to a running container.
+        :param container_ports: Ports on which a container listens.
+        :param depends_on: Containers (by name) which must meet a given condition (START, COMPLETE, SUCCESS
+        or HEALTHY) before this container starts. E.g. {'proxy': ContainerParams.HEALTHY}.
+        :param command: A command to run instead of an image's default command.
+        :param health_check: A container health check. Required by dependent containers waiting for HEALTHY.
+
+        :return: No return.
+        """
+        self.name = name
+        self.image = image
+        self.cpu = cpu
+        self.memory_reservation = memory_reservation
+        self.memory_limit = memory_limit
+        self.essential = essential
+        self.environment = environment or {}
+        self.container_ports = container_ports or []
+        self.depends_on = depends_on or {}
+        self.command = command
+        self.health_check = health_check
+
+        for container_name, condition in self.depends_on.items():
+            if condition not in [self.START, self.COMPLETE, self.SUCCESS, self.HEALTHY]:
+                raise ValueError(f'Unsupported dependency condition {condition} on container {container_name}.')
+
+        if self.memory_reservation and self.memory_limit and self.memory_reservation > self.memory_limit:
+            raise ValueError(f'Memory reservation of container {name} can not exceed its memory limit.')
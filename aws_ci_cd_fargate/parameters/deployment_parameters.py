@@ -0,0 +1,87 @@
+from typing import List, Optional
+
+
+class DeploymentParams:
+    """
+    Parameters class which specifies how blue/green deployments shift traffic to newly deployed containers.
+    """
+    # Built-in CodeDeploy deployment configurations for ECS.
+    ALL_AT_ONCE = 'CodeDeployDefault.ECSAllAtOnce'
+    CANARY_10_PERCENT_5_MINUTES = 'CodeDeployDefault.ECSCanary10Percent5Minutes'
+    CANARY_10_PERCENT_15_MINUTES = 'CodeDeployDefault.ECSCanary10Percent15Minutes'
+    LINEAR_10_PERCENT_EVERY_1_MINUTES = 'CodeDeployDefault.ECSLinear10PercentEvery1Minutes'
+    LINEAR_10_PERCENT_EVERY_3_MINUTES = 'CodeDeployDefault.ECSLinear10PercentEvery3Minutes'
+
+    # Traffic shifting types for custom deployment configurations.
+    CANARY = 'TimeBasedCanary'
+    LINEAR = 'TimeBasedLinear'
+
+    def __init__(
+            self,
+            deployment_config_name: Optional[str] = None,
+            traffic_shift_type: Optional[str] = None,
+            traffic_shift_percentage: Optional[int] = None,
+            traffic_shift_interval: Optional[int] = None,
+            termination_wait_time: int = 5,
+            deployment_ready_wait_time: Optional[int] = None,
+            alarm_names: Optional[List[str]] = None,
+            ignore_poll_alarm_failure: bool = False
+    ) -> None:
+        """
+        Constructor.
+
+        :param deployment_config_name: A name of an existing (e.g. built-in) deployment configuration.
+        Defaults to all at once deployments. Can not be used together with a custom traffic shifting configuration.
+        :param traffic_shift_type: Either CANARY or LINEAR. If specified, a custom deployment configuration is created.
+        Canary shifts a given percentage of traffic first and the rest after the interval. Linear shifts a given
+        percentage of traffic every interval until all traffic is shifted.
+        :param traffic_shift_percentage: Percentage (1-99) of traffic shifted in a single step.
+        :param traffic_shift_interval: Minutes between traffic shifting steps.
+        :param termination_wait_time: Minutes (0-2880) to keep old (blue) containers running after a successful
+        deployment. Old containers allow an instant rollback, but double the amount of running containers.
+        :param deployment_ready_wait_time: Minutes (1-2880) to wait for a manual traffic reroute before a deployment
+        is stopped. If not specified, traffic is rerouted as soon as new containers are ready.
+        :param alarm_names: Names of existing CloudWatch alarms which stop and roll back a deployment when triggered.
+        :param ignore_poll_alarm_failure: Whether a deployment should continue if alarm states can not be retrieved.
+
+        :return: No return.
+        """
+        self.deployment_config_name = deployment_config_name
+        self.traffic_shift_type = traffic_shift_type
+        self.traffic_shift_percentage = traffic_shift_percentage
+        self.traffic_shift_interval = traffic_shift_interval
+        self.termination_wait_time = termination_wait_time
+        self.deployment_ready_wait_time = deployment_ready_wait_time
+        self.alarm_names = alarm_names or []
+        self.ignore_poll_alarm_failure = ignore_poll_alarm_failure
+
+        if not 0 <= termination_wait_time <= 2880:
+            raise ValueError('Termination wait time must be between 0 and 2880 minutes.')
+
+        if deployment_ready_wait_time is not None and not 1 <= deployment_ready_wait_time <= 2880:
+            raise ValueError('Deployment ready wait time must be between 1 and 2880 minutes.')
+
+        if traffic_shift_type is None:
+            self.deployment_config_name = deployment_config_name or self.ALL_AT_ONCE
+            return
+
+        if deployment_config_name:
+            raise ValueError('Specify either a deployment config name or a custom traffic shifting type, not both.')
+
+        if traffic_shift_type not in [self.CANARY, self.LINEAR]:
+            raise ValueError(f'Unsupported traffic shifting type {traffic_shift_type}.')
+
+        if traffic_shift_percentage is None or not 1 <= traffic_shift_percentage <= 99:
+            raise ValueError('Traffic shifting percentage must be between 1 and 99.')
+
+        if traffic_shift_interval is None or traffic_shift_interval < 1:
+            raise ValueError('Traffic shifting interval must be at least 1 minute.')
+
+    @property
+    def custom_traffic_shift(self) -> bool:
+        """
+        Tells whether a custom deployment configuration should be created.
+
+        :return: True if traffic shifting is custom.
+        """
+        return self.traffic_shift_type is not None
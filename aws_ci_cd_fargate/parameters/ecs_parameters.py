@@ -1,11 +1,20 @@
-from typing import List, Dict, Any
-from aws_cdk import aws_ec2
+from typing import List, Dict, Any, Optional
+from aws_cdk import aws_ec2, aws_ecs, aws_logs
+from aws_ci_cd_fargate.parameters.container_parameters import ContainerParams
+from aws_ci_cd_fargate.parameters.scaling_parameters import ScalingTarget, ScheduledScaling
 
 
 class EcsParams:
     """
     Parameters class which specifies deployed container and ecs parameters such as name, port, etc.
     """
+    # A name of a FireLens log router container.
+    LOG_ROUTER_NAME = 'log_router'
+
+    # CPU architectures supported by Fargate.
+    X86_64 = 'X86_64'
+    ARM64 = 'ARM64'
+
     def __init__(
             self,
             container_name: str,
@@ -14,7 +23,35 @@ class EcsParams:
             container_environment: Dict[str, Any],
             ecs_security_groups: List[aws_ec2.SecurityGroup],
             ecs_subnets: List[aws_ec2.Subnet],
-            cpu_threshold: int = 50
+            cpu_threshold: int = 50,
+            scaling_targets: Optional[List[ScalingTarget]] = None,
+            min_capacity: int = 1,
+            max_capacity: int = 5,
+            desired_count: Optional[int] = None,
+            scheduled_scaling: Optional[List[ScheduledScaling]] = None,
+            fargate_spot_weight: Optional[int] = None,
+            fargate_weight: int = 1,
+            fargate_base: int = 0,
+            cpu_architecture: str = X86_64,
+            container_ports: Optional[List[int]] = None,
+            ulimits: Optional[List[aws_ecs.Ulimit]] = None,
+            health_check: Optional[aws_ecs.HealthCheck] = None,
+            start_timeout: Optional[int] = None,
+            stop_timeout: Optional[int] = None,
+            ephemeral_storage: Optional[int] = None,
+            init_process_enabled: bool = False,
+            sidecars: Optional[List[ContainerParams]] = None,
+            container_depends_on: Optional[Dict[str, str]] = None,
+            log_retention: Optional[aws_logs.RetentionDays] = None,
+            log_non_blocking: bool = False,
+            log_max_buffer_size: Optional[str] = None,
+            firelens_options: Optional[Dict[str, str]] = None,
+            firelens_image: str = 'public.ecr.aws/aws-observability/aws-for-fluent-bit:stable',
+            health_check_grace_period: int = 0,
+            propagate_tags: Optional[str] = None,
+            enable_execute_command: bool = False,
+            platform_version: Optional[str] = None,
+            container_secrets: Optional[Dict[str, aws_ecs.Secret]] = None
     ) -> None:
         """
         Constructor.
@@ -29,6 +66,62 @@ class EcsParams:
         kick in. If an average containers' cpu utilization is below this threshold, the amount of servers should be
         decreased. On the contrary, if an average containers' cpu utilization is above this threshold, the amount
         of servers will be increased.
+        :param scaling_targets: Additional metrics (e.g. requests per container, memory utilization) to track
+        alongside cpu utilization. The service is scaled out if any of the metrics is above its target and scaled
+        in only if all of them are below their targets.
+        :param min_capacity: The minimum amount of running containers autoscaling can scale in to.
+        :param max_capacity: The maximum amount of running containers autoscaling can scale out to.
+        :param desired_count: The amount of containers to run when the service is created. Defaults to min capacity.
+        Afterwards the amount is managed by autoscaling.
+        :param scheduled_scaling: Scheduled changes of min and max capacity. Use them to have containers running
+        before predictable traffic peaks, since target tracking reacts only after the load has already increased.
+        :param fargate_spot_weight: If specified, containers are placed using FARGATE and FARGATE_SPOT capacity
+        providers instead of FARGATE launch type. The weight specifies a relative share of containers
+        (after the base amount) that run on cheaper, interruptible FARGATE_SPOT capacity.
+        :param fargate_weight: A relative share of containers (after the base amount) that run on FARGATE capacity.
+        Used only together with fargate spot weight.
+        :param fargate_base: The amount of containers that always run on FARGATE capacity.
+        Used only together with fargate spot weight.
+        :param cpu_architecture: Either X86_64 or ARM64. ARM64 runs containers on Graviton processors, which
+        give a better price-performance. Deployed images are built for the same architecture.
+        :param container_ports: Ports on which a container listens. The first port receives loadbalancer
+        traffic, the other ones (e.g. a gRPC port) are only mapped. Defaults to [80]. Prefer unprivileged
+        ports (>= 1024), so the application does not need to run as root.
+        :param ulimits: Resource limits of a container e.g. a "nofile" limit for services holding many
+        open connections.
+        :param health_check: A container health check. ECS replaces a container failing it, which usually
+        happens sooner than a loadbalancer health check marks the container unhealthy.
+        :param start_timeout: Seconds (up to 120) to wait for a container to reach its desired state before
+        giving up.
+        :param stop_timeout: Seconds (up to 120) to wait before a container is killed if it does not exit
+        on its own after receiving SIGTERM. Defaults to 30 seconds.
+        :param ephemeral_storage: GiB (21-200) of task storage. Defaults to 20 GiB.
+        :param init_process_enabled: Whether an init process should run inside a container to forward signals
+        and reap zombie processes. Shared memory size is not configurable, since Fargate does not support it.
+        :param sidecars: Additional containers running next to the main container in the same task. Container cpu
+        and ram are task totals shared by all containers.
+        :param container_depends_on: Sidecars (by name) which must meet a given condition (START, COMPLETE,
+        SUCCESS or HEALTHY) before the main container starts.
+        :param log_retention: How long container logs are kept in CloudWatch. Defaults to 2 years.
+        :param log_non_blocking: Whether container logs should be buffered in memory and written to CloudWatch
+        in the background. By default a container blocks on stdout writes whenever CloudWatch slows down.
+        Buffered logs are lost when the buffer overflows.
+        :param log_max_buffer_size: A size of a non-blocking log buffer e.g. 25m. Defaults to 1m.
+        :param firelens_options: If specified, a FireLens log router (Fluent Bit) container is added to a task
+        and containers send logs to it instead of CloudWatch. The options configure a Fluent Bit output plugin
+        e.g. {'Name': 'firehose', 'region': 'eu-west-1', 'delivery_stream': 'my-stream'}. The output must be
+        permitted by the task role.
+        :param firelens_image: A Fluent Bit image of a log router container.
+        :param health_check_grace_period: Seconds to ignore failing loadbalancer health checks of a newly started
+        container. Give slow starting services (e.g. JVM) enough time to warm up before they are killed.
+        :param propagate_tags: Either SERVICE or TASK_DEFINITION. Where tags of started containers are taken from.
+        :param enable_execute_command: Whether "aws ecs execute-command" can open a shell in a running container.
+        Applied only when a service is created.
+        :param platform_version: A Fargate platform version e.g. 1.4.0. Defaults to LATEST. Applied when
+        a service is created and with every deployment afterwards.
+        :param container_secrets: Secrets Manager secrets or SSM parameters injected into a container as environment
+        variables on start, e.g. {'DB_PASSWORD': aws_ecs.Secret.from_secrets_manager(secret, 'password')}.
+        The task execution role is granted read access to exactly these secrets.
 
         :return: No return.
         """
@@ -39,3 +132,171 @@ class EcsParams:
         self.ecs_security_groups = ecs_security_groups
         self.ecs_subnets = ecs_subnets
         self.cpu_threshold = cpu_threshold
+        self.scaling_targets = scaling_targets or []
+        self.min_capacity = min_capacity
+        self.max_capacity = max_capacity
+        self.desired_count = desired_count if desired_count is not None else min_capacity
+        self.scheduled_scaling = scheduled_scaling or []
+        self.fargate_spot_weight = fargate_spot_weight
+        self.fargate_weight = fargate_weight
+        self.fargate_base = fargate_base
+        self.cpu_architecture = cpu_architecture
+        self.container_ports = container_ports or [80]
+        self.ulimits = ulimits or []
+        self.health_check = health_check
+        self.start_timeout = start_timeout
+        self.stop_timeout = stop_timeout
+        self.ephemeral_storage = ephemeral_storage
+        self.init_process_enabled = init_process_enabled
+
+        self.sidecars = sidecars or []
+        self.container_depends_on = container_depends_on or {}
+        self.log_retention = log_retention
+        self.log_non_blocking = log_non_blocking
+        self.log_max_buffer_size = log_max_buffer_size
+        self.firelens_options = firelens_options
+        self.firelens_image = firelens_image
+
+        self.health_check_grace_period = health_check_grace_period
+        self.propagate_tags = propagate_tags
+        self.enable_execute_command = enable_execute_command
+        self.platform_version = platform_version
+        self.container_secrets = container_secrets or {}
+
+        for name in self.container_secrets:
+            if name in self.container_environment:
+                raise ValueError(f'Variable {name} can not be both an environment variable and a secret.')
+
+        if self.propagate_tags not in [None, 'SERVICE', 'TASK_DEFINITION']:
+            raise ValueError(f'Unsupported propagate tags value {self.propagate_tags}.')
+
+        if not 0 <= self.health_check_grace_period <= 2147483647:
+            raise ValueError(
+                f'Health check grace period must be between 0 and 2147483647 seconds, '
+                f'got {self.health_check_grace_period}.'
+            )
+
+        if self.log_max_buffer_size and not self.log_non_blocking:
+            raise ValueError('Log max buffer size can only be used with non-blocking logs.')
+
+        self.__validate_sidecars()
+
+        for name, timeout in [('start_timeout', self.start_timeout), ('stop_timeout', self.stop_timeout)]:
+            if timeout is not None and not 2 <= timeout <= 120:
+                raise ValueError(f'{name} must be between 2 and 120 seconds, got {timeout}.')
+
+        if self.ephemeral_storage is not None and not 21 <= self.ephemeral_storage <= 200:
+            raise ValueError(f'Ephemeral storage must be between 21 and 200 GiB, got {self.ephemeral_storage}.')
+
+        if len(set(self.container_ports)) != len(self.container_ports):
+            raise ValueError(f'Container ports must be unique, got {self.container_ports}.')
+
+        for port in self.container_ports:
+            if not 1 <= port <= 65535:
+                raise ValueError(f'Container port must be between 1 and 65535, got {port}.')
+
+        if self.cpu_architecture not in [self.X86_64, self.ARM64]:
+            raise ValueError(f'Unsupported cpu architecture {self.cpu_architecture}.')
+
+        if not 0 <= self.min_capacity <= self.desired_count <= self.max_capacity:
+            raise ValueError(
+                f'Capacity must satisfy 0 <= min ({self.min_capacity}) <= desired ({self.desired_count}) '
+                f'<= max ({self.max_capacity}).'
+            )
+
+        if self.fargate_spot_weight is not None:
+            if not 0 <= self.fargate_base <= 100000:
+                raise ValueError('Fargate base must be between 0 and 100000.')
+
+            if not (0 <= self.fargate_weight <= 1000 and 0 <= self.fargate_spot_weight <= 1000):
+                raise ValueError('Capacity provider weights must be between 0 and 1000.')
+
+            if self.fargate_weight + self.fargate_spot_weight == 0:
+                raise ValueError('At least one capacity provider weight must be greater than 0.')
+
+    def __validate_sidecars(self) -> None:
+        """
+        Validates that sidecar containers fit into a task and their dependencies can be met.
+
+        :return: No return.
+        """
+        names = [self.container_name] + [sidecar.name for sidecar in self.sidecars]
+
+        if self.firelens_options is not None:
+            names.append(self.LOG_ROUTER_NAME)
+
+        if len(set(names)) != len(names):
+            raise ValueError(f'Container names must be unique, got {names}.')
+
+        # All containers of a task share a single network interface.
+        ports = self.container_ports + [port for sidecar in self.sidecars for port in sidecar.container_ports]
+
+        if len(set(ports)) != len(ports):
+            raise ValueError(f'Container ports must be unique within a task, got {ports}.')
+
+        if sum(sidecar.cpu or 0 for sidecar in self.sidecars) >= self.container_cpu:
+            raise ValueError('Sidecar cpu reservations must leave cpu units for the main container.')
+
+        if sum(sidecar.memory_reservation or 0 for sidecar in self.sidecars) >= self.container_ram:
+            raise ValueError('Sidecar memory reservations must leave memory for the main container.')
+
+        health_checks = {sidecar.name: sidecar.health_check for sidecar in self.sidecars}
+        health_checks[self.container_name] = self.health_check
+
+        dependencies = [(self.container_name, self.container_depends_on)]
+        dependencies += [(sidecar.name, sidecar.depends_on) for sidecar in self.sidecars]
+
+        for name, depends_on in dependencies:
+            for dependency, condition in depends_on.items():
+                if dependency not in names or dependency == name:
+                    raise ValueError(f'Container {name} depends on an unknown container {dependency}.')
+
+                if condition == ContainerParams.HEALTHY and not health_checks.get(dependency):
+                    raise ValueError(f'Container {dependency} must have a health check to be waited for.')
+
+    @property
+    def container_port(self) -> int:
+        """
+        Returns a container port which receives loadbalancer traffic.
+
+        :return: Container port.
+        """
+        return self.container_ports[0]
+
+    @property
+    def capacity_provider_strategy(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Creates a capacity provider strategy for ecs service.
+
+        :return: A list of capacity provider strategy items or None if FARGATE launch type is used.
+        """
+        if self.fargate_spot_weight is None:
+            return None
+
+        return [
+            {
+                'capacityProvider': 'FARGATE',
+                'base': self.fargate_base,
+                'weight': self.fargate_weight
+            },
+            {
+                'capacityProvider': 'FARGATE_SPOT',
+                'weight': self.fargate_spot_weight
+            }
+        ]
+
+    @property
+    def runtime_platform(self) -> Optional[Dict[str, str]]:
+        """
+        Creates a runtime platform for a task definition. X86_64 (Linux) is the default platform of Fargate tasks,
+        hence it is not set explicitly and existing task definitions are not replaced.
+
+        :return: Runtime platform object or None for the default platform.
+        """
+        if self.cpu_architecture == self.X86_64:
+            return None
+
+        return {
+            'cpuArchitecture': self.cpu_architecture,
+            'operatingSystemFamily': 'LINUX'
+        }
@@ -0,0 +1,48 @@
+from typing import Optional
+from aws_ci_cd_fargate.parameters.deployment_parameters import DeploymentParams
+from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
+from aws_ci_cd_fargate.parameters.lb_listener_parameters import LbListenerParameters
+from aws_ci_cd_fargate.parameters.lifecycle_hook_parameters import LifecycleHookParams
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+
+
+class FleetServiceParams:
+    """
+    Parameters class which specifies a single service of a fleet (see EcsFargateFleet). Each service gets its own
+    target groups, listener rules, task definition, ecs service and pipelines.
+    """
+    def __init__(
+            self,
+            prefix: str,
+            lb_params: LoadBalancerParams,
+            ecs_params: EcsParams,
+            lb_listener_params: LbListenerParameters,
+            pipeline_params: PipelineParams,
+            deployment_params: Optional[DeploymentParams] = None,
+            deployment_alarms: bool = False,
+            lifecycle_hook_params: Optional[LifecycleHookParams] = None
+    ) -> None:
+        """
+        Constructor.
+
+        :param prefix: A unique (within a fleet) prefix for resources of this service. E.g. Wordpress.
+        :param lb_params: Loadbalancer parameters.
+        :param ecs_params: Compute power parameters for newly deployed container.
+        :param lb_listener_params: Parameters to configure existing listeners with listener rules. Rule priorities
+        must be unique among services sharing the same listeners.
+        :param pipeline_params: Configuration parameters for ci/cd pipeline.
+        :param deployment_params: Configuration parameters for blue/green deployments.
+        :param deployment_alarms: Whether to create deployment alarms. See EcsFargateWithCiCd.
+        :param lifecycle_hook_params: Deployment lifecycle hooks. See EcsFargateWithCiCd.
+
+        :return: No return.
+        """
+        self.prefix = prefix
+        self.lb_params = lb_params
+        self.ecs_params = ecs_params
+        self.lb_listener_params = lb_listener_params
+        self.pipeline_params = pipeline_params
+        self.deployment_params = deployment_params
+        self.deployment_alarms = deployment_alarms
+        self.lifecycle_hook_params = lifecycle_hook_params
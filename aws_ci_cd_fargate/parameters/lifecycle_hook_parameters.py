@@ -0,0 +1,122 @@
+import math
+
+from typing import List, Optional
+
+
+class LifecycleHookParams:
+    """
+    Parameters class which specifies blue/green deployment lifecycle hooks. The hooks send requests to newly
+    deployed (green) containers through the deployment (test) listener before production traffic is shifted.
+    """
+    def __init__(
+            self,
+            test_url: str,
+            warm_up_paths: Optional[List[str]] = None,
+            warm_up_requests: int = 10,
+            load_test_path: Optional[str] = None,
+            load_test_requests: int = 200,
+            load_test_concurrency: int = 10,
+            max_p99_latency: Optional[float] = None,
+            max_error_rate: Optional[float] = None,
+            request_timeout: int = 10,
+            hook_timeout: int = 5
+    ) -> None:
+        """
+        Constructor.
+
+        :param test_url: A base url of the deployment listener e.g. http://internal-my-lb.eu-west-1.elb.amazonaws.com:8080.
+        Hooks run inside ecs subnets, hence the url must be reachable from there. Hooks also report their status
+        to the CodeDeploy API, hence ecs subnets must reach it too (through a NAT gateway or a CodeDeploy
+        interface vpc endpoint). Otherwise a hook never reports its status and every deployment waits for
+        the CodeDeploy hook timeout (one hour) and fails.
+        :param warm_up_paths: Paths (e.g. ["/health", "/api/products"]) requested after test traffic is shifted
+        to green containers to warm up their caches, connection pools and JIT. Warm up never fails a deployment.
+        :param warm_up_requests: How many times each warm up path is requested.
+        :param load_test_path: A path requested by a short load test right before production traffic is shifted.
+        :param load_test_requests: A total amount of load test requests.
+        :param load_test_concurrency: An amount of concurrent load test requests.
+        :param max_p99_latency: Seconds. A deployment fails if p99 load test latency exceeds this value.
+        :param max_error_rate: 0-1. A deployment fails if a share of failed (5xx or timed out) load test requests
+        exceeds this value.
+        :param request_timeout: Seconds after which a single request is considered failed.
+        :param hook_timeout: Minutes (1-15) after which a hook function is stopped. A stopped function never reports
+        its status, hence a deployment then waits for the CodeDeploy hook timeout (one hour) and only then fails.
+        Requests of every hook must fit within this time even if all of them time out.
+
+        :return: No return.
+        """
+        self.test_url = test_url.rstrip('/')
+        self.warm_up_paths = warm_up_paths or []
+        self.warm_up_requests = warm_up_requests
+        self.load_test_path = load_test_path
+        self.load_test_requests = load_test_requests
+        self.load_test_concurrency = load_test_concurrency
+        self.max_p99_latency = max_p99_latency
+        self.max_error_rate = max_error_rate
+        self.request_timeout = request_timeout
+        self.hook_timeout = hook_timeout
+
+        if not self.warm_up_paths and not self.load_test_path:
+            raise ValueError('Specify warm up paths, a load test path or both.')
+
+        if self.load_test_path and self.max_p99_latency is None and self.max_error_rate is None:
+            raise ValueError('A load test requires a p99 latency threshold, an error rate threshold or both.')
+
+        if self.max_error_rate is not None and not 0 <= self.max_error_rate <= 1:
+            raise ValueError('Max error rate must be between 0 and 1.')
+
+        for name in ['warm_up_requests', 'load_test_requests', 'load_test_concurrency', 'request_timeout']:
+            if getattr(self, name) <= 0:
+                raise ValueError(f'{name} must be a positive number, got {getattr(self, name)}.')
+
+        if not 1 <= self.hook_timeout <= 15:
+            raise ValueError('Hook timeout must be between 1 and 15 minutes.')
+
+        for hook, duration in [('Warm up', self.max_warm_up_duration), ('Load test', self.max_load_test_duration)]:
+            if duration > self.hook_timeout * 60:
+                raise ValueError(
+                    f'{hook} may take up to {duration} seconds if all requests time out, '
+                    f'which exceeds the hook timeout of {self.hook_timeout} minutes.'
+                )
+
+    @property
+    def warm_up(self) -> bool:
+        """
+        Tells whether a warm up hook should be created.
+
+        :return: True if warm up paths are specified.
+        """
+        return len(self.warm_up_paths) > 0
+
+    @property
+    def max_warm_up_duration(self) -> int:
+        """
+        Calculates how long a warm up hook may take if all of its requests time out.
+        Each path is requested separately by (at most) 10 concurrent requests.
+
+        :return: Seconds.
+        """
+        rounds = math.ceil(self.warm_up_requests / min(self.warm_up_requests, 10))
+
+        return len(self.warm_up_paths) * rounds * self.request_timeout
+
+    @property
+    def max_load_test_duration(self) -> int:
+        """
+        Calculates how long a load test hook may take if all of its requests time out.
+
+        :return: Seconds.
+        """
+        if not self.load_test:
+            return 0
+
+        return math.ceil(self.load_test_requests / self.load_test_concurrency) * self.request_timeout
+
+    @property
+    def load_test(self) -> bool:
+        """
+        Tells whether a load test hook should be created.
+
+        :return: True if a load test path is specified.
+        """
+        return self.load_test_path is not None
@@ -1,12 +1,29 @@
-from typing import List, Optional
-from aws_cdk import aws_ec2
+from typing import List, Optional, Dict
 
 
 class LoadBalancerParams:
+    # Protocol versions of requests sent to targets.
+    HTTP1 = 'HTTP1'
+    HTTP2 = 'HTTP2'
+    GRPC = 'GRPC'
+
     def __init__(
             self,
             healthy_http_codes: Optional[List[int]] = None,
-            health_check_path: Optional[str] = None
+            health_check_path: Optional[str] = None,
+            latency_p95_threshold: Optional[float] = None,
+            latency_p99_threshold: Optional[float] = None,
+            http_5xx_threshold: Optional[int] = None,
+            alarm_evaluation_periods: int = 2,
+            deregistration_delay: Optional[int] = None,
+            slow_start: Optional[int] = None,
+            least_outstanding_requests: bool = False,
+            health_check_interval: Optional[int] = None,
+            health_check_timeout: Optional[int] = None,
+            healthy_threshold_count: Optional[int] = None,
+            unhealthy_threshold_count: Optional[int] = None,
+            protocol_version: Optional[str] = None,
+            healthy_grpc_codes: Optional[List[int]] = None
     ) -> None:
         """
         Constructor.
@@ -15,8 +32,101 @@ class LoadBalancerParams:
         (healthy) or not. Specify a list of http codes that your service can return and should be treated as healthy.
         :param health_check_path: The deployed instance is constantly pinged to determine if it is available
         (healthy) or not. Specify a path for that ping.
+        :param latency_p95_threshold: Seconds. If p95 target response time exceeds this value during a deployment,
+        the deployment is stopped and rolled back. Used only when deployment alarms are enabled.
+        :param latency_p99_threshold: Seconds. If p99 target response time exceeds this value during a deployment,
+        the deployment is stopped and rolled back. Used only when deployment alarms are enabled.
+        :param http_5xx_threshold: If a count of 5xx responses returned by targets per minute exceeds this value
+        during a deployment, the deployment is stopped and rolled back. Used only when deployment alarms are enabled.
+        :param alarm_evaluation_periods: Number of consecutive minutes a threshold must be breached to trigger
+        a deployment alarm.
+        :param deregistration_delay: Seconds (0-3600) to wait for in-flight requests before a deregistered
+        container is removed from a target group. Defaults to 300 seconds, which slows down every
+        blue/green cutover. Keep it slightly above your longest request duration.
+        :param slow_start: Seconds (30-900) during which a newly registered container receives a linearly
+        increasing share of traffic e.g. to warm up caches. Disabled by default.
+        :param least_outstanding_requests: Whether requests should be routed to a container with the least
+        outstanding requests instead of round robin. Can not be used together with slow start.
+        :param health_check_interval: Seconds (5-300) between health checks. Defaults to 30 seconds.
+        :param health_check_timeout: Seconds (2-120) after which a health check is considered failed.
+        Must be less than the health check interval.
+        :param healthy_threshold_count: Consecutive successful health checks (2-10) before a container is
+        considered healthy and receives traffic. Defaults to 5.
+        :param unhealthy_threshold_count: Consecutive failed health checks (2-10) before a container is
+        considered unhealthy. Defaults to 2.
+        :param protocol_version: Either HTTP1, HTTP2 or GRPC. Protocol version of requests sent to containers.
+        Defaults to HTTP1.
+        :param healthy_grpc_codes: gRPC status codes treated as healthy. Used only with GRPC protocol version,
+        in which case healthy http codes are ignored. Defaults to 12 (not implemented).
 
         :return: No return.
         """
         self.healthy_http_codes: [List[int]] = healthy_http_codes or [200]
         self.health_check_path: str = health_check_path or '/'
+        self.latency_p95_threshold: Optional[float] = latency_p95_threshold
+        self.latency_p99_threshold: Optional[float] = latency_p99_threshold
+        self.http_5xx_threshold: Optional[int] = http_5xx_threshold
+        self.alarm_evaluation_periods: int = alarm_evaluation_periods
+        self.deregistration_delay: Optional[int] = deregistration_delay
+        self.slow_start: Optional[int] = slow_start
+        self.least_outstanding_requests: bool = least_outstanding_requests
+        self.health_check_interval: Optional[int] = health_check_interval
+        self.health_check_timeout: Optional[int] = health_check_timeout
+        self.healthy_threshold_count: Optional[int] = healthy_threshold_count
+        self.unhealthy_threshold_count: Optional[int] = unhealthy_threshold_count
+        self.protocol_version: Optional[str] = protocol_version
+        self.healthy_grpc_codes: List[int] = healthy_grpc_codes or [12]
+
+        self.__validate()
+
+    def __validate(self) -> None:
+        """
+        Validates target group parameters, so an invalid configuration fails on synth
+        rather than in the middle of a deployment.
+
+        :return: No return.
+        """
+        ranges = [
+            ('deregistration_delay', self.deregistration_delay, 0, 3600),
+            ('slow_start', self.slow_start, 30, 900),
+            ('health_check_interval', self.health_check_interval, 5, 300),
+            ('health_check_timeout', self.health_check_timeout, 2, 120),
+            ('healthy_threshold_count', self.healthy_threshold_count, 2, 10),
+            ('unhealthy_threshold_count', self.unhealthy_threshold_count, 2, 10),
+        ]
+
+        for name, value, minimum, maximum in ranges:
+            if value is not None and not minimum <= value <= maximum:
+                raise ValueError(f'{name} must be between {minimum} and {maximum}, got {value}.')
+
+        if self.slow_start is not None and self.least_outstanding_requests:
+            raise ValueError('Slow start can not be used together with least outstanding requests algorithm.')
+
+        if (
+                self.health_check_timeout is not None and
+                self.health_check_timeout >= (self.health_check_interval or 30)
+        ):
+            raise ValueError('Health check timeout must be less than health check interval.')
+
+        if self.protocol_version not in [None, self.HTTP1, self.HTTP2, self.GRPC]:
+            raise ValueError(f'Unsupported protocol version {self.protocol_version}.')
+
+    @property
+    def target_group_attributes(self) -> Dict[str, str]:
+        """
+        Creates target group attributes.
+
+        :return: A dictionary of target group attribute keys and values.
+        """
+        attributes = {}
+
+        if self.deregistration_delay is not None:
+            attributes['deregistration_delay.timeout_seconds'] = str(self.deregistration_delay)
+
+        if self.slow_start is not None:
+            attributes['slow_start.duration_seconds'] = str(self.slow_start)
+
+        if self.least_outstanding_requests:
+            attributes['load_balancing.algorithm.type'] = 'least_outstanding_requests'
+
+        return attributes
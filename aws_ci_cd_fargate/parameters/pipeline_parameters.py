@@ -1,11 +1,32 @@
 from typing import Optional, Dict, Any
+from aws_cdk import aws_codebuild
 
 
 class PipelineParams:
+    # Compute types supported by CodeBuild for ARM (Graviton) build images.
+    ARM_COMPUTE_TYPES = [
+        aws_codebuild.ComputeType.SMALL,
+        aws_codebuild.ComputeType.LARGE
+    ]
+
     def __init__(
             self,
             build_environment: Optional[Dict[str, Any]] = None,
-            docker_build_args: Optional[Dict[str, str]] = None
+            docker_build_args: Optional[Dict[str, str]] = None,
+            build_cache: bool = True,
+            build_cache_tag: str = 'buildcache',
+            build_compute_type: Optional[aws_codebuild.ComputeType] = None,
+            build_image: Optional[aws_codebuild.IBuildImage] = None,
+            build_arm: bool = False,
+            build_timeout: Optional[int] = None,
+            build_queue_timeout: Optional[int] = None,
+            single_pipeline: bool = False,
+            build_secrets: Optional[Dict[str, str]] = None,
+            build_parameters: Optional[Dict[str, str]] = None,
+            soci_index: bool = False,
+            soci_version: str = '0.4.0',
+            zstd_image: bool = False,
+            max_image_size: Optional[int] = None
     ) -> None:
         """
         Constructor.
@@ -13,6 +34,98 @@ class PipelineParams:
         :param build_environment: Environment variables for a build step. You can put here various config
         parameters, urls, secrets, etc.
         :param docker_build_args: Build arguments for docker build command.
+        :param build_cache: Whether docker layers should be cached between builds. When enabled, CodeBuild keeps
+        a local docker layer and source cache and the image build reuses layers from a previously pushed cache image.
+        :param build_cache_tag: An ECR image tag to which the build cache is pushed and from which it is pulled
+        on the next build. Use "latest" to reuse the latest deployed image instead of a dedicated cache image.
+        :param build_compute_type: CodeBuild compute type for the docker build project. Defaults to MEDIUM for x86
+        builds and LARGE for ARM builds.
+        :param build_image: CodeBuild image for the docker build project. Defaults to the standard 5.0 image
+        (Ubuntu with Docker 19+ and BuildKit) for x86 builds and the Amazon Linux 2 aarch64 image for ARM builds.
+        :param build_arm: Whether the docker build should run on an ARM (Graviton) build host.
+        :param build_timeout: Minutes (5-480) after which a running build is stopped.
+        :param build_queue_timeout: Minutes (5-480) after which a queued build is stopped.
+        :param single_pipeline: Whether source, build and deploy stages should live in a single pipeline.
+        A built image is then handed straight to a deployment stage instead of starting a separate ECR to ECS
+        pipeline, which has to fetch its sources again. By default two pipelines are created.
+        :param build_secrets: Environment variables of a build step taken from Secrets Manager. Values are secret
+        ids in CodeBuild format (secret-id[:json-key[:version-stage[:version-id]]]).
+        :param build_parameters: Environment variables of a build step taken from SSM Parameter Store.
+        Values are parameter names.
+        A build project is granted read access to exactly these secrets and parameters.
+        :param soci_index: Whether a SOCI (Seekable OCI) index should be created and pushed for every built image.
+        With an index Fargate lazily loads image layers, hence containers start before the whole image is pulled.
+        :param soci_version: A version of the SOCI snapshotter release whose CLI creates indexes.
+        :param zstd_image: Whether a zstd compressed image variant should be built, pushed (tagged $IMAGE_TAG-zstd)
+        and deployed. Zstd layers decompress faster. The gzip compressed image is still pushed with the usual tags.
+        Requires docker buildx in a build image and a single pipeline, since only a build artifact of a single
+        pipeline points to the variant. Can not be used together with a SOCI index, which is created for
+        the gzip compressed image.
+        :param max_image_size: MiB. A build fails if a built (uncompressed) image exceeds this size, so container
+        startup time does not regress unnoticed.
         """
         self.build_environment: Dict[str, Any] = build_environment or {}
         self.docker_build_args: Dict[str, str] = docker_build_args or {}
+        self.build_cache: bool = build_cache
+        self.build_cache_tag: str = build_cache_tag
+        self.build_arm: bool = build_arm
+        self.build_timeout: Optional[int] = build_timeout
+        self.build_queue_timeout: Optional[int] = build_queue_timeout
+        self.single_pipeline: bool = single_pipeline
+        self.build_secrets: Dict[str, str] = build_secrets or {}
+        self.build_parameters: Dict[str, str] = build_parameters or {}
+        self.soci_index: bool = soci_index
+        self.soci_version: str = soci_version
+        self.zstd_image: bool = zstd_image
+        self.max_image_size: Optional[int] = max_image_size
+
+        if build_arm:
+            self.build_image: aws_codebuild.IBuildImage = build_image or aws_codebuild.LinuxBuildImage.AMAZON_LINUX_2_ARM_2
+            self.build_compute_type: aws_codebuild.ComputeType = build_compute_type or aws_codebuild.ComputeType.LARGE
+        else:
+            self.build_image = build_image or aws_codebuild.LinuxBuildImage.STANDARD_5_0
+            self.build_compute_type = build_compute_type or aws_codebuild.ComputeType.MEDIUM
+
+        self.__validate()
+
+    def __validate(self) -> None:
+        """
+        Validates build environment combinations, so an invalid configuration fails on synth
+        rather than in the middle of a pipeline run.
+
+        :return: No return.
+        """
+        is_arm_image = self.build_image.type == 'ARM_CONTAINER'
+
+        if self.build_arm != is_arm_image:
+            raise ValueError(
+                f'Build image type {self.build_image.type} does not match build architecture '
+                f'({"ARM" if self.build_arm else "x86"}).'
+            )
+
+        if is_arm_image and self.build_compute_type not in self.ARM_COMPUTE_TYPES:
+            raise ValueError(
+                f'ARM build images support only {[c.value for c in self.ARM_COMPUTE_TYPES]} compute types, '
+                f'got {self.build_compute_type.value}.'
+            )
+
+        names = list(self.build_environment) + list(self.build_secrets) + list(self.build_parameters)
+
+        if len(set(names)) != len(names):
+            raise ValueError('Build environment, secret and parameter variable names must be unique.')
+
+        if self.soci_index and self.zstd_image:
+            raise ValueError('A SOCI index and a zstd image are alternatives and can not be used together.')
+
+        if self.zstd_image and not self.single_pipeline:
+            raise ValueError(
+                'A zstd image is deployed only by a single pipeline. A separate ECR to ECS pipeline deploys '
+                'the gzip compressed image, set single_pipeline=True.'
+            )
+
+        if self.max_image_size is not None and self.max_image_size <= 0:
+            raise ValueError(f'Max image size must be positive, got {self.max_image_size}.')
+
+        for name, timeout in [('build_timeout', self.build_timeout), ('build_queue_timeout', self.build_queue_timeout)]:
+            if timeout is not None and not 5 <= timeout <= 480:
+                raise ValueError(f'{name} must be between 5 and 480 minutes, got {timeout}.')
@@ -0,0 +1,22 @@
+class ResourceMode:
+    """
+    Specifies how an ecs service and its blue/green deployment group are managed.
+
+    CUSTOM - custom resources backed by lambda functions manage them through AWS SDK calls (default).
+    NATIVE - CloudFormation manages them natively (AWS::ECS::Service and AWS::CodeDeploy::DeploymentGroup),
+    hence no lambda functions, roles or invocations are needed on stack creates and updates.
+
+    RETAIN, DETACH and IMPORT are intermediate steps of a migration from CUSTOM to NATIVE without recreating
+    a running service (see README):
+    RETAIN - custom resources with a retain deletion policy, so removing them keeps a service and a group.
+    DETACH - neither custom nor native resources. A running service and a group are left untouched.
+    IMPORT - native resources with a retain deletion policy and no new dependencies, as CloudFormation requires
+    for importing existing resources into a stack.
+    """
+    CUSTOM = 'custom'
+    RETAIN = 'retain'
+    DETACH = 'detach'
+    IMPORT = 'import'
+    NATIVE = 'native'
+
+    ALL = [CUSTOM, RETAIN, DETACH, IMPORT, NATIVE]
@@ -0,0 +1,93 @@
+from typing import Optional
+from aws_cdk import aws_cloudwatch
+
+
+class ScalingTarget:
+    """
+    Parameters class which specifies an additional metric to track when scaling ecs service in and out.
+    """
+    CPU = 'cpu'
+    MEMORY = 'memory'
+    REQUEST_COUNT = 'request_count'
+    CUSTOM = 'custom'
+
+    def __init__(
+            self,
+            name: str,
+            metric_type: str,
+            target_value: float,
+            scale_in_cooldown: Optional[int] = None,
+            scale_out_cooldown: Optional[int] = None,
+            custom_metric: Optional[aws_cloudwatch.IMetric] = None
+    ) -> None:
+        """
+        Constructor.
+
+        :param name: A unique (within a service) alphanumeric name of a scaling target e.g. Requests.
+        :param metric_type: One of CPU, MEMORY, REQUEST_COUNT or CUSTOM. CPU and MEMORY track average service
+        utilization in percent. REQUEST_COUNT tracks loadbalancer requests per container (target) per minute
+        of both target groups, since they swap roles after every deployment.
+        CUSTOM tracks a given CloudWatch metric.
+        :param target_value: A metric value to maintain. If an average metric value is above this target,
+        the amount of containers is increased. On the contrary, if it is below, the amount of containers is decreased.
+        :param scale_in_cooldown: Seconds to wait after a scale in activity before another scale in activity can start.
+        :param scale_out_cooldown: Seconds to wait after a scale out activity before another scale out activity
+        can start.
+        :param custom_metric: A CloudWatch metric to track. Required (and allowed) only for CUSTOM metric type.
+
+        :return: No return.
+        """
+        if metric_type not in [self.CPU, self.MEMORY, self.REQUEST_COUNT, self.CUSTOM]:
+            raise ValueError(f'Unsupported scaling metric type {metric_type}.')
+
+        if (metric_type == self.CUSTOM) != (custom_metric is not None):
+            raise ValueError('A custom metric must be specified if and only if metric type is CUSTOM.')
+
+        self.name = name
+        self.metric_type = metric_type
+        self.target_value = target_value
+        self.scale_in_cooldown = scale_in_cooldown
+        self.scale_out_cooldown = scale_out_cooldown
+        self.custom_metric = custom_metric
+
+
+class ScheduledScaling:
+    """
+    Parameters class which specifies a scheduled change of ecs service capacity e.g. before a daily traffic peak.
+    """
+    def __init__(
+            self,
+            name: str,
+            cron: str,
+            min_capacity: Optional[int] = None,
+            max_capacity: Optional[int] = None,
+            time_zone: Optional[str] = None
+    ) -> None:
+        """
+        Constructor.
+
+        :param name: A unique (within a service) alphanumeric name of a scheduled action e.g. MorningPeak.
+        :param cron: A cron expression of 6 fields (minutes, hours, day of month, month, day of week, year)
+        e.g. "0 7 ? * MON-FRI *". Read more:
+        https://docs.aws.amazon.com/autoscaling/application/userguide/scheduled-scaling-using-cron-expressions.html
+        :param min_capacity: A new minimum amount of running containers.
+        :param max_capacity: A new maximum amount of running containers.
+        :param time_zone: An IANA time zone (e.g. Europe/Vilnius) in which the cron expression is evaluated.
+        Defaults to UTC.
+
+        :return: No return.
+        """
+        if min_capacity is None and max_capacity is None:
+            raise ValueError('At least one of min capacity or max capacity must be specified.')
+
+        if min_capacity is not None and max_capacity is not None and min_capacity > max_capacity:
+            raise ValueError(f'Min capacity ({min_capacity}) can not exceed max capacity ({max_capacity}).')
+
+        if len(cron.split()) != 6:
+            raise ValueError(f'Cron expression must consist of 6 fields, got "{cron}".')
+
+        self.name = name
+        self.cron = cron
+        self.min_capacity = min_capacity
+        self.max_capacity = max_capacity
+        self.time_zone = time_zone
@@ -0,0 +1,26 @@
+from typing import Any, Dict, Optional
+
+
+def to_cfn_properties(value: Any, renames: Optional[Dict[str, str]] = None) -> Any:
+    """
+    Converts AWS SDK call parameters (camelCase keys) to CloudFormation resource properties (PascalCase keys).
+    This allows custom and native resources to be rendered from the same parameters.
+
+    :param value: SDK call parameters or any nested value of them.
+    :param renames: Keys whose CloudFormation names differ from their capitalized SDK names
+    e.g. {'ecsServices': 'ECSServices'}.
+
+    :return: CloudFormation properties.
+    """
+    renames = renames or {}
+
+    if isinstance(value, dict):
+        return {
+            renames.get(key, key[0].upper() + key[1:]): to_cfn_properties(item, renames)
+            for key, item in value.items()
+        }
+
+    if isinstance(value, list):
+        return [to_cfn_properties(item, renames) for item in value]
+
+    return value
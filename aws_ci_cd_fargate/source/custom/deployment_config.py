@@ -1,8 +1,34 @@
-from typing import Any, Dict, Optional
+import hashlib
+import json
+import jsii
+
+from typing import Any, Dict, List, Optional
 from aws_cdk import core
 from aws_cdk.aws_codecommit import Repository
-from aws_cdk.aws_iam import Role, PolicyStatement, PolicyDocument, Effect, ServicePrincipal
-from aws_cdk.custom_resources import AwsCustomResource, PhysicalResourceId
+from aws_cdk.aws_iam import IRole, Role, PolicyStatement, PolicyDocument, Effect, ServicePrincipal
+from aws_cdk.custom_resources import AwsCustomResource, AwsCustomResourcePolicy, PhysicalResourceId
+from aws_ci_cd_fargate.source.custom.shared_role import drop_resource_policy
+
+
+@jsii.implements(core.IStringProducer)
+class ContentHash:
+    """
+    Produces a hash of synthesized (resolved) values, which changes whenever any of the values changes.
+    """
+    def __init__(self, stack: core.Stack, values: List[Any]) -> None:
+        """
+        Constructor.
+
+        :param stack: A stack in whose context values are resolved.
+        :param values: Values (possibly containing tokens) to hash.
+        """
+        self.__stack = stack
+        self.__values = values
+
+    def produce(self, context: core.IResolveContext) -> str:
+        resolved = self.__stack.resolve(self.__values)
+
+        return hashlib.sha256(json.dumps(resolved, sort_keys=True).encode()).hexdigest()[:16]
 
 
 class DeploymentConfig:
@@ -15,7 +41,8 @@ class DeploymentConfig:
             prefix: str,
             code_repository: Repository,
             task_definition: str,
-            app_spec: str
+            app_spec: str,
+            role: Optional[IRole] = None
     ) -> None:
         """
         Constructor.
@@ -25,30 +52,58 @@ class DeploymentConfig:
         :param code_repository: A codecommit git repository to push configuration files for ecs deployment.
         :param task_definition: A document which describes how ecs deployment should behave.
         :param app_spec: A document which describes how ecs deployment should behave.
+        :param role: An existing (shared) role of the custom resource which already grants its calls.
+        Created if not specified.
         """
         self.__stack = stack
         self.__prefix = prefix
         self.__code_repository = code_repository
         self.__task_definition = task_definition
         self.__app_spec = app_spec
+        self.__custom_resource_role = role
 
-    def get_resource(self):
+    def get_resource(self) -> AwsCustomResource:
         """
-        Creates a custom resource to manage an ecs deployment configuration.
-
-        :param scope: A scope in which this resource should be created.
+        Creates custom resources to manage an ecs deployment configuration. The first one creates a branch with
+        configuration files when a stack is created. The other two read a head commit of the branch and commit
+        the files on top of it whenever they change, so changes of a stack reach deployed tasks.
 
-        :return: Custom resource to manage an ecs deployment configuration.
+        :return: Custom resource which commits the latest deployment configuration.
         """
-        return AwsCustomResource(
+        role = self.__custom_resource_role or self.__role()
+
+        initial_commit = AwsCustomResource(
             self.__stack,
             self.__prefix + "CustomDeploymentConfigResource",
             on_create=self.__on_create(),
-            on_update=self.__on_update(),
-            on_delete=self.__on_delete(),
-            role=self.__role()
+            role=role,
+            policy=AwsCustomResourcePolicy.from_sdk_calls(resources=[self.__code_repository.repository_arn])
+        )
+
+        branch_head = AwsCustomResource(
+            self.__stack,
+            self.__prefix + "CustomDeploymentConfigBranchHead",
+            on_update=self.__get_branch(),
+            role=role,
+            policy=AwsCustomResourcePolicy.from_sdk_calls(resources=[self.__code_repository.repository_arn])
         )
 
+        branch_head.node.add_dependency(initial_commit)
+
+        update_commit = AwsCustomResource(
+            self.__stack,
+            self.__prefix + "CustomDeploymentConfigUpdateResource",
+            on_update=self.__update_commit(branch_head.get_response_field('branch.commitId')),
+            role=role,
+            policy=AwsCustomResourcePolicy.from_sdk_calls(resources=[self.__code_repository.repository_arn])
+        )
+
+        if self.__custom_resource_role:
+            for resource in [initial_commit, branch_head, update_commit]:
+                drop_resource_policy(resource)
+
+        return update_commit
+
     def __role(self) -> Role:
         """
         A role for custom resource which manages ecs deployment configuration.
@@ -64,6 +119,7 @@ class DeploymentConfig:
                         PolicyStatement(
                             actions=[
                                 "codecommit:CreateCommit",
+                                "codecommit:GetBranch",
                             ],
                             resources=[self.__code_repository.repository_arn],
                             effect=Effect.ALLOW
@@ -93,7 +149,7 @@ class DeploymentConfig:
 
     def __on_create(self) -> Optional[Dict[Any, Any]]:
         """
-        Creates an "on_create" command.
+        Creates an "on_create" command which creates a branch with configuration files.
 
         :return: A dictionary command.
         """
@@ -104,33 +160,67 @@ class DeploymentConfig:
                 'branchName': 'master',
                 'repositoryName': self.__code_repository.repository_name,
                 'commitMessage': 'Initial appspec and taskdef files.',
-                'putFiles': [
-                    {
-                        'filePath': 'taskdef.json',
-                        'fileMode': 'NORMAL',
-                        'fileContent': self.__task_definition,
-                    }, {
-                        'filePath': 'appspec.yaml',
-                        'fileMode': 'NORMAL',
-                        'fileContent': self.__app_spec,
-                    }
-                ]
+                'putFiles': self.__put_files()
             },
             "physical_resource_id": PhysicalResourceId.of(self.__prefix + 'CreateCommit')
         }
 
-    def __on_update(self) -> Optional[Dict[Any, Any]]:
+    def __get_branch(self) -> Optional[Dict[Any, Any]]:
         """
-        Creates an "on_update" command".
+        Creates a command which reads a head commit of the branch. A physical id is a hash of configuration files,
+        hence the command is called again (and the head is read again) whenever the files change.
 
         :return: A dictionary command.
         """
-        return None
+        content_hash = core.Lazy.uncached_string(ContentHash(self.__stack, [self.__task_definition, self.__app_spec]))
 
-    def __on_delete(self) -> Optional[Dict[Any, Any]]:
+        return {
+            "service": self.service_name(),
+            "action": "getBranch",
+            "parameters": {
+                'branchName': 'master',
+                'repositoryName': self.__code_repository.repository_name
+            },
+            "physical_resource_id": PhysicalResourceId.of(self.__prefix + 'BranchHead' + content_hash)
+        }
+
+    def __update_commit(self, parent_commit_id: str) -> Optional[Dict[Any, Any]]:
         """
-        Creates an "on_delete" command".
+        Creates a command which commits configuration files on top of a given commit.
+        Committing unchanged files (e.g. right after the branch is created) is not an error.
+
+        :param parent_commit_id: A head commit of the branch.
 
         :return: A dictionary command.
         """
-        return None
+        return {
+            "service": self.service_name(),
+            "action": "createCommit",
+            "parameters": {
+                'branchName': 'master',
+                'repositoryName': self.__code_repository.repository_name,
+                'parentCommitId': parent_commit_id,
+                'commitMessage': 'Update appspec and taskdef files.',
+                'putFiles': self.__put_files()
+            },
+            "physical_resource_id": PhysicalResourceId.of(self.__prefix + 'UpdateCommit'),
+            "ignore_error_codes_matching": 'NoChangeException'
+        }
+
+    def __put_files(self) -> List[Dict[str, str]]:
+        """
+        Creates configuration files to commit.
+
+        :return: A list of files.
+        """
+        return [
+            {
+                'filePath': 'taskdef.json',
+                'fileMode': 'NORMAL',
+                'fileContent': self.__task_definition,
+            }, {
+                'filePath': 'appspec.yaml',
+                'fileMode': 'NORMAL',
+                'fileContent': self.__app_spec,
+            }
+        ]
@@ -1,11 +1,13 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from aws_cdk import core
 from aws_cdk.aws_codecommit import Repository
-from aws_cdk.aws_codedeploy import EcsApplication
+from aws_cdk.aws_codedeploy import CfnDeploymentGroup, EcsApplication
 from aws_cdk.aws_ecs import Cluster
 from aws_cdk.aws_elasticloadbalancingv2 import CfnListener
-from aws_cdk.aws_iam import Role, PolicyStatement, PolicyDocument, Effect, ServicePrincipal, CompositePrincipal
-from aws_cdk.custom_resources import AwsCustomResource, PhysicalResourceId
+from aws_cdk.aws_iam import IRole, Role, PolicyStatement, PolicyDocument, Effect, ServicePrincipal, CompositePrincipal
+from aws_cdk.custom_resources import AwsCustomResource, AwsCustomResourcePolicy, PhysicalResourceId
+from aws_ci_cd_fargate.source.custom.cfn_properties import to_cfn_properties
+from aws_ci_cd_fargate.source.custom.shared_role import drop_resource_policy
 
 
 class DeploymentGroup:
@@ -25,6 +27,13 @@ class DeploymentGroup:
             production_target_group,
             deployment_target_group,
             ecs_cluster: Cluster,
+            deployment_config_name: str = 'CodeDeployDefault.ECSAllAtOnce',
+            termination_wait_time: int = 5,
+            deployment_ready_wait_time: Optional[int] = None,
+            alarm_names: Optional[List[str]] = None,
+            ignore_poll_alarm_failure: bool = False,
+            deployment_group_role: Optional[IRole] = None,
+            custom_resource_role: Optional[IRole] = None
     ) -> None:
         """
         Constructor.
@@ -38,6 +47,16 @@ class DeploymentGroup:
         :param main_listener: A loadbalancer's main listener for main traffic.
         :param deployments_listener: A loadbalancer's testing listener for testing traffic.
         :param ecs_cluster: An ecs cluster in which our ecs application is located.
+        :param deployment_config_name: A name of a deployment configuration which specifies how traffic is shifted
+        to newly deployed containers.
+        :param termination_wait_time: Minutes to keep old (blue) containers running after a successful deployment.
+        :param deployment_ready_wait_time: Minutes to wait for a manual traffic reroute before a deployment is
+        stopped. If not specified, traffic is rerouted as soon as new containers are ready.
+        :param alarm_names: Names of CloudWatch alarms which stop and roll back a deployment when triggered.
+        :param ignore_poll_alarm_failure: Whether a deployment should continue if alarm states can not be retrieved.
+        :param deployment_group_role: An existing (shared) role assumed by CodeDeploy. Created if not specified.
+        :param custom_resource_role: An existing (shared) role of the custom resource which already grants
+        its calls. Created if not specified.
         """
         self.__stack = stack
         self.__prefix = prefix
@@ -50,43 +69,31 @@ class DeploymentGroup:
         self.__production_target_group = production_target_group
         self.__deployment_target_group = deployment_target_group
         self.__ecs_cluster = ecs_cluster
+        self.__deployment_config_name = deployment_config_name
+        self.__termination_wait_time = termination_wait_time
+        self.__deployment_ready_wait_time = deployment_ready_wait_time
+        self.__alarm_names = alarm_names or []
+        self.__ignore_poll_alarm_failure = ignore_poll_alarm_failure
 
-        self.__custom_resource_role = Role(
-            self.__stack,
-            self.__prefix + 'CustomFargateDeploymentGroupRole',
-            inline_policies={
-                self.__prefix + 'CustomFargateDeploymentGroupPolicy': PolicyDocument(
-                    statements=[
-                        PolicyStatement(
-                            actions=[
-                                "codedeploy:GetDeploymentGroup",
-                                "codedeploy:CreateDeploymentGroup",
-                                "codedeploy:DeleteDeploymentGroup",
-                                "codedeploy:UpdateDeploymentGroup",
-                            ],
-                            resources=['*'],
-                            effect=Effect.ALLOW
-                        ),
-                        PolicyStatement(
-                            actions=[
-                                "logs:CreateLogGroup",
-                                "logs:CreateLogStream",
-                                "logs:PutLogEvents"
-                            ],
-                            resources=['*'],
-                            effect=Effect.ALLOW
-                        )
-                    ]
-                )},
-            assumed_by=ServicePrincipal('lambda.amazonaws.com')
-        )
+        self.__deployment_group_role = deployment_group_role or self.create_deployment_group_role(stack, prefix)
+        self.__custom_resource_role = custom_resource_role
 
-        self.__deployment_group_role = Role(
-            self.__stack,
-            self.__prefix + 'FargateDeploymentGroupRole',
+    @staticmethod
+    def create_deployment_group_role(stack: core.Stack, prefix: str) -> Role:
+        """
+        Creates a role assumed by CodeDeploy to run blue/green deployments.
+
+        :param stack: A CloudFormation stack to which add this resource.
+        :param prefix: Prefix for resource names.
+
+        :return: Deployment group role.
+        """
+        return Role(
+            stack,
+            prefix + 'FargateDeploymentGroupRole',
             path='/',
             inline_policies={
-                self.__prefix + 'FargateDeploymentGroupPolicy': PolicyDocument(
+                prefix + 'FargateDeploymentGroupPolicy': PolicyDocument(
                     statements=[
                         PolicyStatement(
                             actions=[
@@ -119,21 +126,94 @@ class DeploymentGroup:
             )
         )
 
+    @staticmethod
+    def create_custom_resource_role(stack: core.Stack, prefix: str) -> Role:
+        """
+        Creates a role of the custom resource which manages a deployment group.
+
+        :param stack: A CloudFormation stack to which add this resource.
+        :param prefix: Prefix for resource names.
+
+        :return: Custom resource role.
+        """
+        return Role(
+            stack,
+            prefix + 'CustomFargateDeploymentGroupRole',
+            inline_policies={
+                prefix + 'CustomFargateDeploymentGroupPolicy': PolicyDocument(
+                    statements=[
+                        PolicyStatement(
+                            actions=[
+                                "codedeploy:GetDeploymentGroup",
+                                "codedeploy:CreateDeploymentGroup",
+                                "codedeploy:DeleteDeploymentGroup",
+                                "codedeploy:UpdateDeploymentGroup",
+                            ],
+                            resources=['*'],
+                            effect=Effect.ALLOW
+                        ),
+                        PolicyStatement(
+                            actions=[
+                                "logs:CreateLogGroup",
+                                "logs:CreateLogStream",
+                                "logs:PutLogEvents"
+                            ],
+                            resources=['*'],
+                            effect=Effect.ALLOW
+                        )
+                    ]
+                )},
+            assumed_by=ServicePrincipal('lambda.amazonaws.com')
+        )
+
     def get_resource(self):
         """
         Creates a custom resource to manage a deployment group.
 
         :return: Custom resource to manage a deployment group.
         """
-        return AwsCustomResource(
+        custom_resource_role = self.__custom_resource_role or self.create_custom_resource_role(
+            self.__stack,
+            self.__prefix
+        )
+
+        resource = AwsCustomResource(
             scope=self.__stack,
             id=self.__prefix + "CustomFargateDeploymentGroupResource",
             on_create=self.__on_create(),
             on_update=self.__on_update(),
             on_delete=self.__on_delete(),
-            role=self.__custom_resource_role
+            role=custom_resource_role,
+            policy=AwsCustomResourcePolicy.from_sdk_calls(resources=AwsCustomResourcePolicy.ANY_RESOURCE)
+        )
+
+        if self.__custom_resource_role:
+            drop_resource_policy(resource)
+
+        return resource
+
+    def get_native_resource(self) -> core.CfnResource:
+        """
+        Creates a native CloudFormation deployment group from the same parameters as the custom resource.
+
+        :return: Native deployment group resource.
+        """
+        parameters = {
+            'deploymentGroupName': self.__prefix + 'FargateDeploymentGroup',
+            **self.__parameters()
+        }
+
+        # Target group pairs (required by ecs deployment groups) are not yet supported by the typed properties.
+        # Properties are not set as overrides of CfnDeploymentGroup, since references in overrides
+        # are not wired across stacks (e.g. into nested stacks).
+        deployment_group = core.CfnResource(
+            self.__stack, self.__prefix + 'FargateDeploymentGroupResource',
+            type=CfnDeploymentGroup.CFN_RESOURCE_TYPE_NAME,
+            properties=to_cfn_properties(parameters, {'ecsServices': 'ECSServices'})
         )
 
+        return deployment_group
+
     @staticmethod
     def service_name() -> str:
         """
@@ -143,6 +223,79 @@ class DeploymentGroup:
         """
         return 'CodeDeploy'
 
+    def __parameters(self) -> Dict[str, Any]:
+        """
+        Creates deployment group parameters shared by both create and update commands.
+        Keeping a single source for them ensures that an update never drifts from a freshly created group.
+
+        :return: Deployment group parameters.
+        """
+        if self.__deployment_ready_wait_time is None:
+            deployment_ready_option = {
+                'actionOnTimeout': 'CONTINUE_DEPLOYMENT',
+            }
+        else:
+            deployment_ready_option = {
+                'actionOnTimeout': 'STOP_DEPLOYMENT',
+                'waitTimeInMinutes': self.__deployment_ready_wait_time
+            }
+
+        return {
+            'applicationName': self.__ecs_application.application_name,
+            'deploymentConfigName': self.__deployment_config_name,
+            'serviceRoleArn': self.__deployment_group_role.role_arn,
+            'autoRollbackConfiguration': {
+                'enabled': True,
+                'events': ['DEPLOYMENT_FAILURE', 'DEPLOYMENT_STOP_ON_ALARM', 'DEPLOYMENT_STOP_ON_REQUEST']
+            },
+            'alarmConfiguration': {
+                'enabled': len(self.__alarm_names) > 0,
+                'ignorePollAlarmFailure': self.__ignore_poll_alarm_failure,
+                'alarms': [{'name': name} for name in self.__alarm_names]
+            },
+            'deploymentStyle': {
+                'deploymentType': 'BLUE_GREEN',
+                'deploymentOption': 'WITH_TRAFFIC_CONTROL'
+            },
+            'blueGreenDeploymentConfiguration': {
+                'terminateBlueInstancesOnDeploymentSuccess': {
+                    'action': 'TERMINATE',
+                    'terminationWaitTimeInMinutes': self.__termination_wait_time
+                },
+                'deploymentReadyOption': deployment_ready_option,
+            },
+            'loadBalancerInfo': {
+                'targetGroupPairInfoList': [
+                    {
+                        'targetGroups': [
+                            {
+                                'name': self.__production_target_group.attr_target_group_name,
+                            },
+                            {
+                                'name': self.__deployment_target_group.attr_target_group_name,
+                            },
+                        ],
+                        'prodTrafficRoute': {
+                            'listenerArns': [
+                                self.__main_listener.ref
+                            ]
+                        },
+                        'testTrafficRoute': {
+                            'listenerArns': [
+                                self.__deployments_listener.ref
+                            ]
+                        }
+                    },
+                ]
+            },
+            'ecsServices': [
+                {
+                    'serviceName': self.__prefix + 'FargateService',
+                    'clusterName': self.__ecs_cluster.cluster_name
+                },
+            ],
+        }
+
     def __on_create(self) -> Optional[Dict[Any, Any]]:
         """
         Creates an "on_create" command.
@@ -153,57 +306,8 @@ class DeploymentGroup:
             "service": self.service_name(),
             "action": "createDeploymentGroup",
             "parameters": {
-                'applicationName': self.__ecs_application.application_name,
                 'deploymentGroupName': self.__prefix + 'FargateDeploymentGroup',
-                'deploymentConfigName': 'CodeDeployDefault.ECSAllAtOnce',
-                'serviceRoleArn': self.__deployment_group_role.role_arn,
-                'autoRollbackConfiguration': {
-                    'enabled': True,
-                    'events': ['DEPLOYMENT_FAILURE', 'DEPLOYMENT_STOP_ON_ALARM', 'DEPLOYMENT_STOP_ON_REQUEST']
-                },
-                'deploymentStyle': {
-                    'deploymentType': 'BLUE_GREEN',
-                    'deploymentOption': 'WITH_TRAFFIC_CONTROL'
-                },
-                'blueGreenDeploymentConfiguration': {
-                    'terminateBlueInstancesOnDeploymentSuccess': {
-                        'action': 'TERMINATE',
-                        'terminationWaitTimeInMinutes': 5
-                    },
-                    'deploymentReadyOption': {
-                        'actionOnTimeout': 'CONTINUE_DEPLOYMENT',
-                    },
-                },
-                'loadBalancerInfo': {
-                    'targetGroupPairInfoList': [
-                        {
-                            'targetGroups': [
-                                {
-                                    'name': self.__production_target_group.attr_target_group_name,
-                                },
-                                {
-                                    'name': self.__deployment_target_group.attr_target_group_name,
-                                },
-                            ],
-                            'prodTrafficRoute': {
-                                'listenerArns': [
-                                    self.__main_listener.ref
-                                ]
-                            },
-                            'testTrafficRoute': {
-                                'listenerArns': [
-                                    self.__deployments_listener.ref
-                                ]
-                            }
-                        },
-                    ]
-                },
-                'ecsServices': [
-                    {
-                        'serviceName': self.__prefix + 'FargateService',
-                        'clusterName': self.__ecs_cluster.cluster_name
-                    },
-                ],
+                **self.__parameters()
             },
             "physical_resource_id": PhysicalResourceId.of(self.__prefix + 'DeploymentGroup'),
         }
@@ -218,57 +322,8 @@ class DeploymentGroup:
             "service": self.service_name(),
             "action": "updateDeploymentGroup",
             "parameters": {
-                'applicationName': self.__ecs_application.application_name,
                 'currentDeploymentGroupName': self.__prefix + 'FargateDeploymentGroup',
-                'deploymentConfigName': 'CodeDeployDefault.ECSAllAtOnce',
-                'serviceRoleArn': self.__deployment_group_role.role_arn,
-                'autoRollbackConfiguration': {
-                    'enabled': True,
-                    'events': ['DEPLOYMENT_FAILURE', 'DEPLOYMENT_STOP_ON_ALARM', 'DEPLOYMENT_STOP_ON_REQUEST']
-                },
-                'deploymentStyle': {
-                    'deploymentType': 'BLUE_GREEN',
-                    'deploymentOption': 'WITH_TRAFFIC_CONTROL'
-                },
-                'blueGreenDeploymentConfiguration': {
-                    'terminateBlueInstancesOnDeploymentSuccess': {
-                        'action': 'TERMINATE',
-                        'terminationWaitTimeInMinutes': 5
-                    },
-                    'deploymentReadyOption': {
-                        'actionOnTimeout': 'CONTINUE_DEPLOYMENT',
-                    },
-                },
-                'loadBalancerInfo': {
-                    'targetGroupPairInfoList': [
-                        {
-                            'targetGroups': [
-                                {
-                                    'name': self.__production_target_group.attr_target_group_name,
-                                },
-                                {
-                                    'name': self.__deployment_target_group.attr_target_group_name,
-                                },
-                            ],
-                            'prodTrafficRoute': {
-                                'listenerArns': [
-                                    self.__main_listener.ref
-                                ]
-                            },
-                            'testTrafficRoute': {
-                                'listenerArns': [
-                                    self.__deployments_listener.ref
-                                ]
-                            }
-                        },
-                    ]
-                },
-                'ecsServices': [
-                    {
-                        'serviceName': self.__prefix + 'FargateService',
-                        'clusterName': self.__ecs_cluster.cluster_name
-                    },
-                ],
+                **self.__parameters()
             },
             "physical_resource_id": PhysicalResourceId.of(self.__prefix + 'DeploymentGroup'),
         }
@@ -279,8 +334,6 @@ class DeploymentGroup:
 
         :return: A dictionary command.
         """
-
-
         return {
             "service": self.service_name(),
             "action": "deleteDeploymentGroup",
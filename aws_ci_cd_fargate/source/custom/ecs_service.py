@@ -1,7 +1,8 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from aws_cdk import core, aws_ecs
 from aws_cdk.aws_elasticloadbalancingv2 import CfnTargetGroup
 from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
+from aws_ci_cd_fargate.source.custom.cfn_properties import to_cfn_properties
 from aws_ecs_service.ecs_service import EcsService as EcsServiceCustomResource
 
 
@@ -51,24 +52,57 @@ class EcsService:
             on_delete_action=self.__on_delete()
         )
 
+    def get_native_resource(self) -> core.CfnResource:
+        """
+        Creates a native CloudFormation ecs service from the same parameters as the custom resource.
+
+        :return: Native ecs service resource.
+        """
+        parameters = self.__on_create()
+        # A task definition family (rather than a revision) never changes, hence CloudFormation never tries
+        # to update a task definition of a blue/green service, which only CodeDeploy is allowed to do.
+        # The latest (CDK created) revision of the family is used when a service is created.
+        parameters['taskDefinition'] = self.__task.family
+
+        # Properties are not set as overrides of aws_ecs.CfnService, since references in overrides
+        # are not wired across stacks (e.g. into nested stacks).
+        service = core.CfnResource(
+            self.__stack, self.__prefix + 'FargateService',
+            type=aws_ecs.CfnService.CFN_RESOURCE_TYPE_NAME,
+            properties=to_cfn_properties(parameters)
+        )
+
+        service.node.add_dependency(self.__task)
+
+        return service
+
+    @property
+    def load_balancers(self) -> List[Dict[str, Any]]:
+        """
+        Creates a loadbalancer configuration of ecs service.
+
+        :return: A list of loadbalancer configurations.
+        """
+        return [
+            {
+                'containerName': self.__ecs_params.container_name,
+                'containerPort': self.__ecs_params.container_port,
+                'targetGroupArn': self.__production_target_group.ref
+            }
+        ]
+
     def __on_create(self) -> Optional[Dict[Any, Any]]:
         """
         Creates an "on_create" command.
 
         :return: A dictionary command.
         """
-        return {
+        parameters = {
             'cluster': self.__cluster.cluster_arn,
             'serviceName': self.__prefix + 'FargateService',
             'taskDefinition': self.__task.task_definition_arn,
-            'loadBalancers': [
-                {
-                    'containerName': self.__ecs_params.container_name,
-                    'containerPort': 80,
-                    'targetGroupArn': self.__production_target_group.ref
-                }
-            ],
-            'desiredCount': 1,
+            'loadBalancers': self.load_balancers,
+            'desiredCount': self.__ecs_params.desired_count,
             'networkConfiguration': {
                 'awsvpcConfiguration': {
                     'assignPublicIp': 'DISABLED',
@@ -79,9 +113,49 @@ class EcsService:
             'deploymentController': {
                 'type': 'CODE_DEPLOY'
             },
-            'launchType': 'FARGATE'
+            'enableExecuteCommand': self.__ecs_params.enable_execute_command,
+            **self.__placement(),
+            **self.__parameters()
+        }
+
+        if self.__ecs_params.platform_version:
+            parameters['platformVersion'] = self.__ecs_params.platform_version
+
+        return parameters
+
+    def __parameters(self) -> Dict[str, Any]:
+        """
+        Creates service parameters shared by "on_create" and "on_update" commands. Only parameters which
+        can be updated for services using the blue/green (CODE_DEPLOY) deployment controller are allowed here.
+
+        A deployment configuration is not set, since it has no effect: CodeDeploy replaces containers of such
+        services, ECS ignores minimum and maximum percents of Fargate containers and supports a deployment
+        circuit breaker only for rolling updates (ECS deployment controller).
+
+        :return: A dictionary of parameters.
+        """
+        parameters = {
+            'healthCheckGracePeriodSeconds': self.__ecs_params.health_check_grace_period
         }
 
+        if self.__ecs_params.propagate_tags:
+            parameters['propagateTags'] = self.__ecs_params.propagate_tags
+
+        return parameters
+
+    def __placement(self) -> Dict[str, Any]:
+        """
+        Creates either a launch type or a capacity provider strategy parameter.
+
+        :return: A dictionary with a single placement parameter.
+        """
+        capacity_provider_strategy = self.__ecs_params.capacity_provider_strategy
+
+        if capacity_provider_strategy:
+            return {'capacityProviderStrategy': capacity_provider_strategy}
+
+        return {'launchType': 'FARGATE'}
+
     def __on_update(self) -> Optional[Dict[Any, Any]]:
         """
         Creates an "on_update" command".
@@ -91,7 +165,7 @@ class EcsService:
         return {
             'cluster': self.__cluster.cluster_arn,
             'service': self.__prefix + 'FargateService',
-            'healthCheckGracePeriodSeconds': 0
+            **self.__parameters()
         }
 
     def __on_delete(self) -> Optional[Dict[Any, Any]]:
@@ -0,0 +1,17 @@
+from aws_cdk.custom_resources import AwsCustomResource
+
+
+def drop_resource_policy(resource: AwsCustomResource) -> None:
+    """
+    Removes a policy which a custom resource attaches to its role. Used when a shared role already grants
+    calls of the custom resource (see SharedResources), since these policies add up with every custom resource
+    and would exceed the IAM policy size limit of a role.
+
+    Only a CloudFormation resource of the policy is removed, so the custom resource does not depend on
+    a resource which no longer exists.
+
+    :param resource: A custom resource run with a shared role.
+
+    :return: No return.
+    """
+    resource.node.find_child('CustomResourcePolicy').node.try_remove_child('Resource')
@@ -0,0 +1,140 @@
+from typing import List, Optional
+from aws_cdk import aws_cloudwatch, aws_elasticloadbalancingv2
+from aws_cdk.core import Stack, Duration
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+
+
+class DeploymentAlarms:
+    """
+    Class that creates CloudWatch alarms which stop and roll back a blue/green deployment when
+    newly deployed containers respond slower or fail more often than configured thresholds allow.
+    """
+    def __init__(
+            self,
+            scope: Stack,
+            prefix: str,
+            lb_params: LoadBalancerParams,
+            load_balancer_full_name: str,
+            production_target_group: aws_elasticloadbalancingv2.CfnTargetGroup,
+            deployment_target_group: aws_elasticloadbalancingv2.CfnTargetGroup
+    ) -> None:
+        """
+        Constructor.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param prefix: A prefix for newly created resources.
+        :param lb_params: Loadbalancer parameters containing alarm thresholds.
+        :param load_balancer_full_name: A full name (app/name/id) of a loadbalancer which serves the traffic.
+        :param production_target_group: A target group where your blue instances are serving production traffic.
+        :param deployment_target_group: A target group where your green instances are ready to serve production traffic.
+        """
+        if all(threshold is None for threshold in [
+            lb_params.latency_p95_threshold,
+            lb_params.latency_p99_threshold,
+            lb_params.http_5xx_threshold
+        ]):
+            raise ValueError('Deployment alarms require at least one threshold in loadbalancer parameters.')
+
+        self.__scope = scope
+        self.__prefix = prefix
+        self.__lb_params = lb_params
+        self.__load_balancer_full_name = load_balancer_full_name
+
+        self.alarms: List[aws_cloudwatch.Alarm] = []
+
+        # Target groups swap their roles after every successful deployment, i.e. new (green) containers
+        # are registered to the deployment target group first and to the production target group next time.
+        # Hence both target groups are monitored.
+        for name, target_group in [('DeplTG', deployment_target_group), ('ProdTG', production_target_group)]:
+            self.alarms.extend(self.__create_alarms(name, target_group))
+
+    @property
+    def alarm_names(self) -> List[str]:
+        """
+        Returns names of all created alarms.
+
+        :return: A list of alarm names.
+        """
+        return [alarm.alarm_name for alarm in self.alarms]
+
+    def __create_alarms(
+            self,
+            name: str,
+            target_group: aws_elasticloadbalancingv2.CfnTargetGroup
+    ) -> List[aws_cloudwatch.Alarm]:
+        """
+        Creates alarms for a single target group.
+
+        :param name: A name of a target group used in construct ids.
+        :param target_group: A target group to monitor.
+
+        :return: A list of created alarms.
+        """
+        alarms = [
+            self.__create_alarm(
+                alarm_id=name + 'P95Latency',
+                target_group=target_group,
+                metric_name='TargetResponseTime',
+                statistic='p95',
+                threshold=self.__lb_params.latency_p95_threshold
+            ),
+            self.__create_alarm(
+                alarm_id=name + 'P99Latency',
+                target_group=target_group,
+                metric_name='TargetResponseTime',
+                statistic='p99',
+                threshold=self.__lb_params.latency_p99_threshold
+            ),
+            self.__create_alarm(
+                alarm_id=name + 'Http5xx',
+                target_group=target_group,
+                metric_name='HTTPCode_Target_5XX_Count',
+                statistic='Sum',
+                threshold=self.__lb_params.http_5xx_threshold
+            )
+        ]
+
+        return [alarm for alarm in alarms if alarm]
+
+    def __create_alarm(
+            self,
+            alarm_id: str,
+            target_group: aws_elasticloadbalancingv2.CfnTargetGroup,
+            metric_name: str,
+            statistic: str,
+            threshold: Optional[float]
+    ) -> Optional[aws_cloudwatch.Alarm]:
+        """
+        Creates a single target group alarm.
+
+        :param alarm_id: Construct id suffix.
+        :param target_group: A target group to monitor.
+        :param metric_name: A name of an application loadbalancer metric.
+        :param statistic: Metric statistic e.g. Sum or p99.
+        :param threshold: Alarm threshold. If not specified, an alarm is not created.
+
+        :return: Created alarm or None.
+        """
+        if threshold is None:
+            return None
+
+        metric = aws_cloudwatch.Metric(
+            namespace='AWS/ApplicationELB',
+            metric_name=metric_name,
+            dimensions={
+                'LoadBalancer': self.__load_balancer_full_name,
+                'TargetGroup': target_group.attr_target_group_full_name
+            },
+            statistic=statistic,
+            period=Duration.minutes(1)
+        )
+
+        return aws_cloudwatch.Alarm(
+            self.__scope, self.__prefix + 'Fargate' + alarm_id + 'Alarm',
+            metric=metric,
+            threshold=threshold,
+            evaluation_periods=self.__lb_params.alarm_evaluation_periods,
+            comparison_operator=aws_cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+            # No traffic means no regression.
+            treat_missing_data=aws_cloudwatch.TreatMissingData.NOT_BREACHING
+        )
@@ -1,8 +1,13 @@
+import inspect
 import json
+import re
 
+from typing import Any, Dict, List, Optional
 from aws_cdk import aws_logs, aws_ecs, aws_applicationautoscaling, aws_ec2, aws_iam
-from aws_cdk.core import Stack, RemovalPolicy
+from aws_cdk.core import Stack, RemovalPolicy, Duration, Fn
 from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
+from aws_ci_cd_fargate.parameters.scaling_parameters import ScalingTarget
 from aws_ci_cd_fargate.source.custom.ecs_service import EcsService
 from aws_ci_cd_fargate.source.lb_listener_config import LbListenerConfig
 from aws_ecs_cluster.ecs_cluster import EcsCluster
@@ -17,7 +22,11 @@ class Ecs:
             prefix: str,
             ecs_params: EcsParams,
             lb_listener_config: LbListenerConfig,
-            vpc: aws_ec2.Vpc
+            vpc: aws_ec2.Vpc,
+            resource_mode: str = ResourceMode.CUSTOM,
+            cluster: Optional[aws_ecs.ICluster] = None,
+            capacity_provider_associations: Optional[aws_ecs.CfnClusterCapacityProviderAssociations] = None,
+            task_execution_role: Optional[aws_iam.IRole] = None
     ) -> None:
         """
         Constructor.
@@ -27,79 +36,184 @@ class Ecs:
         :param ecs_params: Compute power parameters for newly deployed container.
         :param lb_listener_config: Listeners configuration for blue-green deployments.
         :param vpc: Virtual Private Cloud in which loadbalancer and other instances are/will be located.
+        :param resource_mode: How an ecs service is managed. One of ResourceMode constants.
+        :param cluster: An existing (shared) ecs cluster. A new cluster is created if not specified.
+        :param capacity_provider_associations: Capacity providers of an existing cluster. Required with
+        a cluster if a capacity provider strategy is used.
+        :param task_execution_role: An existing (shared) task execution role. Ignored if container secrets are
+        specified, since secrets are granted to a service's own execution role.
         """
         self.prefix = prefix
         self.aws_region = scope.region
         self.ecs_params = ecs_params
 
-        self.task_execution_role = aws_iam.Role(
-            scope, prefix + 'FargateTaskExecutionRole',
-            path='/',
-            inline_policies={
-                prefix + 'FargateTaskExecutionPolicy': aws_iam.PolicyDocument(
-                    statements=[aws_iam.PolicyStatement(
-                        actions=[
-                            "ecr:GetAuthorizationToken",
-                            "ecr:BatchCheckLayerAvailability",
-                            "ecr:GetDownloadUrlForLayer",
-                            "ecr:BatchGetImage",
-                            "logs:CreateLogStream",
-                            "logs:PutLogEvents",
-                            "cloudtrail:LookupEvents"
-                        ],
-                        resources=['*'],
-                        effect=aws_iam.Effect.ALLOW)]
-                )},
-            assumed_by=aws_iam.ServicePrincipal('ecs-tasks.amazonaws.com'),
-        )
+        if task_execution_role and not self.ecs_params.container_secrets:
+            self.task_execution_role = task_execution_role
+        else:
+            self.task_execution_role = self.create_task_execution_role(scope, prefix)
 
         self.log_group = aws_logs.LogGroup(
             scope, prefix + 'FargateEcsLogGroup',
             log_group_name=f'/aws/ecs/fargate/{prefix}',
+            retention=self.ecs_params.log_retention,
             removal_policy=RemovalPolicy.DESTROY
         )
 
-        self.cluster = EcsCluster(
-            scope, prefix + 'FargateCluster',
-            cluster_name=prefix + 'FargateCluster',
-            vpc=vpc
-        )
+        self.cluster = cluster or self.create_cluster(scope, prefix, vpc)
+        self.capacity_provider_associations = capacity_provider_associations
+
+        if cluster and self.ecs_params.capacity_provider_strategy and not capacity_provider_associations:
+            raise ValueError('A capacity provider strategy requires capacity providers of a given cluster.')
+
+        if not cluster and self.ecs_params.capacity_provider_strategy:
+            self.capacity_provider_associations = self.create_capacity_provider_associations(
+                scope, prefix, self.cluster, self.ecs_params.capacity_provider_strategy
+            )
 
         self.task = aws_ecs.FargateTaskDefinition(
             scope, prefix + 'FargateTaskDefinition',
             cpu=int(self.ecs_params.container_cpu), memory_limit_mib=int(self.ecs_params.container_ram), family=prefix.lower(),
-            execution_role=self.task_execution_role
+            execution_role=self.task_execution_role,
+            ephemeral_storage_gib=self.ecs_params.ephemeral_storage
         )
 
+        # Runtime platform is not yet supported by the higher level task definition construct.
+        if self.ecs_params.runtime_platform:
+            self.task.node.default_child.add_property_override('RuntimePlatform', {
+                'CpuArchitecture': self.ecs_params.runtime_platform['cpuArchitecture'],
+                'OperatingSystemFamily': self.ecs_params.runtime_platform['operatingSystemFamily']
+            })
+
+        self.log_router = None
+
+        if self.ecs_params.firelens_options is not None:
+            self.log_router = self.task.add_firelens_log_router(
+                EcsParams.LOG_ROUTER_NAME,
+                image=aws_ecs.ContainerImage.from_registry(self.ecs_params.firelens_image),
+                firelens_config=aws_ecs.FirelensConfig(type=aws_ecs.FirelensLogRouterType.FLUENTBIT),
+                essential=True,
+                memory_reservation_mib=50,
+                logging=self.__create_awslogs_driver()
+            )
+
+        if self.ecs_params.enable_execute_command:
+            # Permissions for a session manager agent running inside containers.
+            self.task.add_to_task_role_policy(aws_iam.PolicyStatement(
+                actions=[
+                    'ssmmessages:CreateControlChannel',
+                    'ssmmessages:CreateDataChannel',
+                    'ssmmessages:OpenControlChannel',
+                    'ssmmessages:OpenDataChannel'
+                ],
+                resources=['*'],
+                effect=aws_iam.Effect.ALLOW
+            ))
+
         self.container = self.task.add_container(
             self.ecs_params.container_name,
+            # A placeholder image which runs until the first image is built and deployed through a pipeline.
             image=aws_ecs.ContainerImage.from_registry('eexit/mirror-http-server:latest'),
-            logging=aws_ecs.AwsLogDriver(stream_prefix=prefix, log_group=self.log_group)
+            environment={key: str(value) for key, value in self.ecs_params.container_environment.items()},
+            secrets=self.ecs_params.container_secrets or None,
+            logging=self.__create_log_driver(),
+            health_check=self.ecs_params.health_check,
+            start_timeout=Duration.seconds(self.ecs_params.start_timeout) if self.ecs_params.start_timeout else None,
+            stop_timeout=Duration.seconds(self.ecs_params.stop_timeout) if self.ecs_params.stop_timeout else None,
+            linux_parameters=aws_ecs.LinuxParameters(
+                scope, prefix + 'FargateLinuxParameters',
+                init_process_enabled=True
+            ) if self.ecs_params.init_process_enabled else None
         )
-        self.container.add_port_mappings(aws_ecs.PortMapping(container_port=80))
+        self.container.add_ulimits(*self.ecs_params.ulimits)
 
-        self.service = EcsService(
+        self.sidecars = {
+            sidecar.name: self.task.add_container(
+                sidecar.name,
+                image=aws_ecs.ContainerImage.from_registry(sidecar.image),
+                cpu=sidecar.cpu,
+                memory_reservation_mib=sidecar.memory_reservation,
+                memory_limit_mib=sidecar.memory_limit,
+                essential=sidecar.essential,
+                environment={key: str(value) for key, value in sidecar.environment.items()},
+                command=sidecar.command,
+                health_check=sidecar.health_check,
+                logging=self.__create_log_driver()
+            ) for sidecar in self.ecs_params.sidecars
+        }
+
+        for sidecar in self.ecs_params.sidecars:
+            self.sidecars[sidecar.name].add_port_mappings(*[
+                aws_ecs.PortMapping(container_port=port) for port in sidecar.container_ports
+            ])
+
+        containers = {self.container.container_name: self.container, **self.sidecars}
+        dependencies = [(self.container, self.ecs_params.container_depends_on)]
+        dependencies += [(self.sidecars[sidecar.name], sidecar.depends_on) for sidecar in self.ecs_params.sidecars]
+
+        for container, depends_on in dependencies:
+            container.add_container_dependencies(*[
+                aws_ecs.ContainerDependency(
+                    container=containers[name],
+                    condition=aws_ecs.ContainerDependencyCondition(condition)
+                ) for name, condition in depends_on.items()
+            ])
+        self.container.add_port_mappings(*[
+            aws_ecs.PortMapping(container_port=port) for port in self.ecs_params.container_ports
+        ])
+
+        self.service_definition = EcsService(
             stack=scope,
             prefix=prefix,
             cluster=self.cluster,
             task=self.task,
             ecs_params=self.ecs_params,
             production_target_group=lb_listener_config.production_target_group
-        ).get_resource().custom_resource
+        )
+
+        self.service = None
+
+        if resource_mode in [ResourceMode.CUSTOM, ResourceMode.RETAIN]:
+            self.service = self.service_definition.get_resource().custom_resource
+        elif resource_mode in [ResourceMode.IMPORT, ResourceMode.NATIVE]:
+            self.service = self.service_definition.get_native_resource()
+
+        if resource_mode in [ResourceMode.RETAIN, ResourceMode.IMPORT]:
+            self.service.apply_removal_policy(RemovalPolicy.RETAIN)
+
+        if self.service:
+            self.service.node.add_dependency(lb_listener_config.production_target_group)
+            self.service.node.add_dependency(lb_listener_config.deployment_target_group)
 
-        self.service.node.add_dependency(lb_listener_config.production_target_group)
-        self.service.node.add_dependency(lb_listener_config.deployment_target_group)
+            if self.capacity_provider_associations:
+                self.service.node.add_dependency(self.capacity_provider_associations)
 
         self.scalable_target = aws_applicationautoscaling.ScalableTarget(
             scope, prefix + 'FargateScalableTarget',
-            min_capacity=1,
-            max_capacity=5,
+            min_capacity=self.ecs_params.min_capacity,
+            max_capacity=self.ecs_params.max_capacity,
             service_namespace=aws_applicationautoscaling.ServiceNamespace.ECS,
             resource_id='/'.join(['service', self.cluster.cluster_name, prefix + 'FargateService']),
             scalable_dimension='ecs:service:DesiredCount'
         )
 
-        self.scalable_target.node.add_dependency(self.service)
+        # An import must not change existing resources, hence the dependency is added only after it.
+        if self.service and resource_mode != ResourceMode.IMPORT:
+            self.scalable_target.node.add_dependency(self.service)
+
+        for index, scheduled_scaling in enumerate(self.ecs_params.scheduled_scaling):
+            self.scalable_target.scale_on_schedule(
+                prefix + 'FargateScheduledScaling' + scheduled_scaling.name,
+                schedule=aws_applicationautoscaling.Schedule.expression(f'cron({scheduled_scaling.cron})'),
+                min_capacity=scheduled_scaling.min_capacity,
+                max_capacity=scheduled_scaling.max_capacity
+            )
+
+            if scheduled_scaling.time_zone:
+                # Time zone is not yet supported by the higher level scalable target construct.
+                self.scalable_target.node.default_child.add_property_override(
+                    f'ScheduledActions.{index}.Timezone',
+                    scheduled_scaling.time_zone
+                )
 
         self.scaling_policy = aws_applicationautoscaling.TargetTrackingScalingPolicy(
             scope, prefix + 'FargateScalingPolicy',
@@ -110,11 +224,212 @@ class Ecs:
             disable_scale_in=False
         )
 
-    def create_appspec(self) -> str:
+        self.additional_scaling_policies = [
+            policy
+            for scaling_target in self.ecs_params.scaling_targets
+            for policy in self.__create_scaling_policies(scope, scaling_target, lb_listener_config)
+        ]
+
+    @staticmethod
+    def create_task_execution_role(scope: Stack, prefix: str) -> aws_iam.Role:
+        """
+        Creates a task execution role which allows pulling images and writing logs.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param prefix: A prefix for newly created resources.
+
+        :return: Task execution role.
+        """
+        return aws_iam.Role(
+            scope, prefix + 'FargateTaskExecutionRole',
+            path='/',
+            inline_policies={
+                prefix + 'FargateTaskExecutionPolicy': aws_iam.PolicyDocument(
+                    statements=[aws_iam.PolicyStatement(
+                        actions=[
+                            "ecr:GetAuthorizationToken",
+                            "ecr:BatchCheckLayerAvailability",
+                            "ecr:GetDownloadUrlForLayer",
+                            "ecr:BatchGetImage",
+                            "logs:CreateLogStream",
+                            "logs:PutLogEvents",
+                            "cloudtrail:LookupEvents"
+                        ],
+                        resources=['*'],
+                        effect=aws_iam.Effect.ALLOW)]
+                )},
+            assumed_by=aws_iam.ServicePrincipal('ecs-tasks.amazonaws.com'),
+        )
+
+    @staticmethod
+    def create_cluster(scope: Stack, prefix: str, vpc: aws_ec2.Vpc) -> EcsCluster:
+        """
+        Creates an ecs cluster.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param prefix: A prefix for newly created resources.
+        :param vpc: Virtual Private Cloud in which containers are located.
+
+        :return: Ecs cluster.
+        """
+        return EcsCluster(
+            scope, prefix + 'FargateCluster',
+            cluster_name=prefix + 'FargateCluster',
+            vpc=vpc
+        )
+
+    @staticmethod
+    def create_capacity_provider_associations(
+            scope: Stack,
+            prefix: str,
+            cluster: aws_ecs.ICluster,
+            capacity_provider_strategy: List[Dict[str, Any]]
+    ) -> aws_ecs.CfnClusterCapacityProviderAssociations:
+        """
+        Associates FARGATE and FARGATE_SPOT capacity providers with a cluster.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param prefix: A prefix for newly created resources.
+        :param cluster: An ecs cluster.
+        :param capacity_provider_strategy: A default capacity provider strategy of a cluster.
+
+        :return: Capacity provider associations.
+        """
+        return aws_ecs.CfnClusterCapacityProviderAssociations(
+            scope, prefix + 'FargateCapacityProviders',
+            cluster=cluster.cluster_name,
+            capacity_providers=['FARGATE', 'FARGATE_SPOT'],
+            default_capacity_provider_strategy=[
+                aws_ecs.CfnClusterCapacityProviderAssociations.CapacityProviderStrategyProperty(
+                    capacity_provider=item['capacityProvider'],
+                    base=item.get('base'),
+                    weight=item['weight']
+                ) for item in capacity_provider_strategy
+            ]
+        )
+
+    def __create_log_driver(self) -> aws_ecs.LogDriver:
+        """
+        Creates a log driver for containers. Logs are sent either to a FireLens log router or to CloudWatch.
+
+        :return: Log driver.
+        """
+        if self.ecs_params.firelens_options is not None:
+            return aws_ecs.FireLensLogDriver(options=self.ecs_params.firelens_options)
+
+        return self.__create_awslogs_driver()
+
+    def __create_awslogs_driver(self) -> aws_ecs.LogDriver:
+        """
+        Creates a log driver which sends container logs to CloudWatch.
+
+        :return: Log driver.
+        """
+        if not self.ecs_params.log_non_blocking:
+            return aws_ecs.AwsLogDriver(stream_prefix=self.prefix, log_group=self.log_group)
+
+        options = {
+            'awslogs-group': self.log_group.log_group_name,
+            'awslogs-region': self.aws_region,
+            'awslogs-stream-prefix': self.prefix,
+            'mode': 'non-blocking'
+        }
+
+        if self.ecs_params.log_max_buffer_size:
+            options['max-buffer-size'] = self.ecs_params.log_max_buffer_size
+
+        # Buffer size is not yet supported by the higher level awslogs driver.
+        return aws_ecs.GenericLogDriver(log_driver='awslogs', options=options)
+
+    def __create_scaling_policies(
+            self,
+            scope: Stack,
+            scaling_target: ScalingTarget,
+            lb_listener_config: LbListenerConfig
+    ) -> List[aws_applicationautoscaling.TargetTrackingScalingPolicy]:
+        """
+        Creates target tracking scaling policies attached to the service's scalable target.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param scaling_target: Parameters of a metric to track.
+        :param lb_listener_config: Listeners configuration for blue-green deployments.
+
+        :return: Scaling policies.
+        """
+        policy_name = self.prefix + 'FargateScalingPolicy' + scaling_target.name
+
+        if scaling_target.metric_type != ScalingTarget.REQUEST_COUNT:
+            return [self.__create_scaling_policy(scope, policy_name, scaling_target)]
+
+        # Target groups swap their roles after every successful deployment, i.e. production traffic is served
+        # by the deployment target group after the first deployment and by the production target group after
+        # the next one. Hence requests are tracked on both target groups. A target group without containers
+        # publishes no requests and target tracking does not act on missing data.
+        return [
+            self.__create_scaling_policy(
+                scope,
+                policy_name + name,
+                scaling_target,
+                # Resource label format: app/<load-balancer-name>/<id>/targetgroup/<target-group-name>/<id>.
+                resource_label=Fn.join('/', [
+                    lb_listener_config.load_balancer_full_name,
+                    target_group.attr_target_group_full_name
+                ])
+            ) for name, target_group in [
+                ('ProdTG', lb_listener_config.production_target_group),
+                ('DeplTG', lb_listener_config.deployment_target_group)
+            ]
+        ]
+
+    def __create_scaling_policy(
+            self,
+            scope: Stack,
+            policy_name: str,
+            scaling_target: ScalingTarget,
+            resource_label: Optional[str] = None
+    ) -> aws_applicationautoscaling.TargetTrackingScalingPolicy:
+        """
+        Creates a target tracking scaling policy attached to the service's scalable target.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param policy_name: A name of a scaling policy.
+        :param scaling_target: Parameters of a metric to track.
+        :param resource_label: A target group of which requests are tracked. Used only with REQUEST_COUNT metric.
+
+        :return: Scaling policy.
+        """
+        predefined_metrics = {
+            ScalingTarget.CPU: aws_applicationautoscaling.PredefinedMetric.ECS_SERVICE_AVERAGE_CPU_UTILIZATION,
+            ScalingTarget.MEMORY: aws_applicationautoscaling.PredefinedMetric.ECS_SERVICE_AVERAGE_MEMORY_UTILIZATION,
+            ScalingTarget.REQUEST_COUNT: aws_applicationautoscaling.PredefinedMetric.ALB_REQUEST_COUNT_PER_TARGET,
+        }
+
+        return aws_applicationautoscaling.TargetTrackingScalingPolicy(
+            scope, policy_name,
+            policy_name=policy_name,
+            scaling_target=self.scalable_target,
+            target_value=scaling_target.target_value,
+            predefined_metric=predefined_metrics.get(scaling_target.metric_type),
+            custom_metric=scaling_target.custom_metric,
+            resource_label=resource_label,
+            scale_in_cooldown=(
+                Duration.seconds(scaling_target.scale_in_cooldown)
+                if scaling_target.scale_in_cooldown is not None else None
+            ),
+            scale_out_cooldown=(
+                Duration.seconds(scaling_target.scale_out_cooldown)
+                if scaling_target.scale_out_cooldown is not None else None
+            ),
+            disable_scale_in=False
+        )
+
+    def create_appspec(self, hooks: Optional[List[Dict[str, str]]] = None) -> str:
         """
         Creates an application specification object which will be used for deploying new containers through a pipeline.
         The application specification object specifies parameters about the ECS service.
 
+        :param hooks: Lifecycle event and hook function name pairs run during a deployment.
+
         :return: Application specification object.
         """
         app_spec = (
@@ -126,9 +441,30 @@ class Ecs:
             f'        TaskDefinition: <TASK_DEFINITION>',
             f'        LoadBalancerInfo:',
             f'          ContainerName: "{self.container.container_name}"',
-            f'          ContainerPort: 80',
+            f'          ContainerPort: {self.ecs_params.container_port}',
         )
 
+        if self.ecs_params.platform_version:
+            app_spec += (f'        PlatformVersion: "{self.ecs_params.platform_version}"',)
+
+        if self.ecs_params.capacity_provider_strategy:
+            # Pins task sets created by deployments to the same capacity providers as the service.
+            app_spec += (f'        CapacityProviderStrategy:',)
+
+            for item in self.ecs_params.capacity_provider_strategy:
+                app_spec += (f'          - CapacityProvider: "{item["capacityProvider"]}"',)
+
+                if 'base' in item:
+                    app_spec += (f'            Base: {item["base"]}',)
+
+                app_spec += (f'            Weight: {item["weight"]}',)
+
+        if hooks:
+            app_spec += (f'Hooks:',)
+            app_spec += tuple(
+                f'  - {event}: "{function_name}"' for hook in hooks for event, function_name in hook.items()
+            )
+
         return '\n'.join(app_spec)
 
     def create_task_def(self) -> str:
@@ -136,41 +472,97 @@ class Ecs:
         Creates a task definition object which will be used for deploying new containers through a pipeline.
         The task definition object specifies parameters about newly created containers.
 
+        The object is rendered from the CDK task definition, hence every container setting
+        reaches containers deployed through a pipeline too. References (e.g. to roles or secrets
+        of other stacks) are resolved only on synth in a context of a stack which uses the object.
+
         :return: Task definition object.
         """
+        cfn_task: aws_ecs.CfnTaskDefinition = self.task.node.default_child
+
         definition = {
-            'executionRoleArn': self.task.execution_role.role_arn,
-            'taskRoleArn': self.task.task_role.role_arn,
-            'containerDefinitions': [
-                {
-                    'name': self.ecs_params.container_name,
-                    'image': "<IMAGE1_NAME>",
-                    'essential': True,
-                    'environment': [
-                        {'name': key, 'value': value} for key, value in self.ecs_params.container_environment.items()
-                    ],
-                    'portMappings': [
-                        {
-                            'containerPort': 80
-                        }
-                    ],
-                    'logConfiguration': {
-                        'logDriver': 'awslogs',
-                        'options': {
-                            'awslogs-group': self.log_group.log_group_name,
-                            'awslogs-region': self.aws_region,
-                            'awslogs-stream-prefix': self.prefix
-                        }
-                    }
-                }
-            ],
-            'requiresCompatibilities': [
-                'FARGATE'
-            ],
-            'networkMode': 'awsvpc',
-            'cpu': str(self.ecs_params.container_cpu),
-            'memory': str(self.ecs_params.container_ram),
-            'family': self.prefix.lower()
+            'containerDefinitions': self.__container_definitions(),
+            'cpu': cfn_task.cpu,
+            'memory': cfn_task.memory,
+            'family': cfn_task.family,
+            'networkMode': cfn_task.network_mode,
+            'requiresCompatibilities': cfn_task.requires_compatibilities,
+            'executionRoleArn': cfn_task.execution_role_arn,
+            'taskRoleArn': cfn_task.task_role_arn,
+            'ephemeralStorage': cfn_task.ephemeral_storage,
+            'volumes': cfn_task.volumes
+        }
+
+        # Runtime platform is set through a property override which is not a part of task definition properties.
+        if self.ecs_params.runtime_platform:
+            definition['runtimePlatform'] = self.ecs_params.runtime_platform
+
+        return Stack.of(self.task).to_json_string(definition, 4)
+
+    def __container_definitions(self) -> List[aws_ecs.CfnTaskDefinition.ContainerDefinitionProperty]:
+        """
+        Renders definitions of all containers of a task. The main container's image is replaced with
+        a placeholder which a pipeline replaces with a newly built image.
+
+        :return: A list of container definitions.
+        """
+        containers = ([self.log_router] if self.log_router else []) + [self.container, *self.sidecars.values()]
+        definitions = [container.render_container_definition() for container in containers]
+
+        for index, container in enumerate(containers):
+            if container is self.container:
+                # Container definitions are immutable, hence the main one is copied field by field.
+                fields = inspect.signature(type(definitions[index])).parameters
+
+                definitions[index] = type(definitions[index])(**{
+                    **{name: getattr(definitions[index], name) for name in fields},
+                    'image': '<IMAGE1_NAME>'
+                })
+
+        return definitions
+
+    def validate_ports(self, task_def: str, app_spec: str) -> None:
+        """
+        Checks that an application specification and an ecs service send loadbalancer traffic to a port which
+        is mapped by the deployed container of a rendered task definition object. A disagreement would otherwise
+        surface only as a failed deployment.
+
+        :param task_def: Task definition object created by create_task_def.
+        :param app_spec: Application specification object created by create_appspec.
+
+        :return: No return.
+        """
+        resolved = Stack.of(self.task).resolve(task_def)
+
+        # References (e.g. to roles) are joined into the object with intrinsic functions. They are always string
+        # values and never ports, hence they are replaced with a placeholder to parse the object.
+        if isinstance(resolved, dict):
+            resolved = ''.join(part if isinstance(part, str) else '<REFERENCE>' for part in resolved['Fn::Join'][1])
+
+        deployed_containers = [
+            container for container in json.loads(resolved)['containerDefinitions']
+            if container['image'] == '<IMAGE1_NAME>'
+        ]
+
+        if len(deployed_containers) != 1:
+            raise ValueError('Task definition object must have exactly one container with a deployed image.')
+
+        container_name = deployed_containers[0]['name']
+        container_ports = [mapping['containerPort'] for mapping in deployed_containers[0].get('portMappings', [])]
+
+        service_lb = self.service_definition.load_balancers[0]
+
+        sources = {
+            'appspec': (
+                re.search(r'ContainerName: "(.+)"', app_spec).group(1),
+                int(re.search(r'ContainerPort: (\d+)', app_spec).group(1))
+            ),
+            'service': (service_lb['containerName'], service_lb['containerPort'])
         }
 
-        return json.dumps(definition, indent=4)
+        for source, (name, port) in sources.items():
+            if name != container_name or port not in container_ports:
+                raise ValueError(
+                    f'Container {name} port {port} in {source} does not match the deployed container '
+                    f'{container_name} of a task definition, which maps ports {container_ports}.'
+                )
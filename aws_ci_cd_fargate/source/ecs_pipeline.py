@@ -1,14 +1,17 @@
 import re
 
-from typing import Any, Dict
+from typing import List, Optional
 from aws_cdk.core import RemovalPolicy
-from aws_cdk.custom_resources import AwsCustomResource
 from aws_empty_bucket.empty_s3_bucket import EmptyS3Bucket
 from aws_empty_ecr_repository.empty_ecr_repository import EmptyEcrRepository
+from aws_ci_cd_fargate.parameters.deployment_parameters import DeploymentParams
+from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
 from aws_ci_cd_fargate.source.pipeline_commit_to_ecr import PipelineCommitToEcr
 from aws_ci_cd_fargate.source.pipeline_ecr_to_ecs import PipelineEcrToEcs
 from aws_cdk import (
     aws_ecs,
+    aws_iam,
     aws_codecommit,
     aws_elasticloadbalancingv2,
     aws_s3,
@@ -26,14 +29,20 @@ class EcsPipeline:
             prefix: str,
             main_listener: aws_elasticloadbalancingv2.CfnListener,
             deployments_listener: aws_elasticloadbalancingv2.CfnListener,
-            ecs_service: AwsCustomResource,
+            ecs_service: Optional[core.Construct],
             ecs_cluster: aws_ecs.Cluster,
             task_def: str,
             app_spec: str,
-            build_environment: Dict[str, Any],
-            docker_build_args: Dict[str, str],
+            pipeline_params: PipelineParams,
+            cpu_architecture: str,
+            deployment_params: DeploymentParams,
+            deployment_alarm_names: List[str],
             production_target_group,
-            deployment_target_group
+            deployment_target_group,
+            resource_mode: str = ResourceMode.CUSTOM,
+            artifacts_bucket: Optional[aws_s3.IBucket] = None,
+            deployment_group_role: Optional[aws_iam.IRole] = None,
+            custom_resource_role: Optional[aws_iam.IRole] = None
     ) -> None:
         """
         Constructor.
@@ -43,22 +52,25 @@ class EcsPipeline:
         :param main_listener: A listener which receives incoming traffic and forwards it to a target group.
         :param deployments_listener: A listener which receives incoming traffic and forwards it to a target group.
         This listener is used for blue/green deployment.
-        :param ecs_service: Ecs service to which create this pipeline.
+        :param ecs_service: Ecs service to which create this pipeline. None if the service is not managed by
+        this stack (see ResourceMode.DETACH).
         :param ecs_cluster: ECS cluster in which the ECS service is.
         :param task_def: Task definition object defining the parameters for a newly deployed container.
         :param app_spec: App specification object defining the ecs service modifications.
-        :param build_environment: Environment variables for a build step. You can put here various config
-        parameters, urls, secrets, etc.
-        :param docker_build_args: Build arguments for docker build command.
+        :param pipeline_params: Configuration parameters for ci/cd pipeline.
+        :param cpu_architecture: CPU architecture (X86_64 or ARM64) of deployed containers.
+        :param deployment_params: Configuration parameters for blue/green deployments.
+        :param deployment_alarm_names: Names of alarms (in addition to the ones in deployment parameters) which
+        stop and roll back a deployment when triggered.
         :param production_target_group: A target group where your blue instances are serving production traffic.
         :param deployment_target_group: A target group where your green instances are ready to serve production traffic.
+        :param resource_mode: How a deployment group is managed. One of ResourceMode constants.
+        :param artifacts_bucket: An existing (shared) pipeline artifacts bucket. Created if not specified.
+        :param deployment_group_role: An existing (shared) role assumed by CodeDeploy. Created if not specified.
+        :param custom_resource_role: An existing (shared) role of deployment custom resources.
+        Created if not specified.
         """
-        self.artifacts_bucket = EmptyS3Bucket(
-            scope,
-            self.__convert(prefix + 'FargateArtifacts'),
-            access_control=aws_s3.BucketAccessControl.PRIVATE,
-            bucket_name=self.__convert(prefix + 'FargateArtifacts'),
-        )
+        self.artifacts_bucket = artifacts_bucket or self.create_artifacts_bucket(scope, prefix)
 
         self.source_code_repository = aws_codecommit.Repository(
             scope,
@@ -85,7 +97,13 @@ class EcsPipeline:
             ecs_cluster=ecs_cluster,
             ecs_service=ecs_service,
             production_target_group=production_target_group,
-            deployment_target_group=deployment_target_group
+            deployment_target_group=deployment_target_group,
+            deployment_params=deployment_params,
+            deployment_alarm_names=deployment_alarm_names,
+            create_pipeline=not pipeline_params.single_pipeline,
+            resource_mode=resource_mode,
+            deployment_group_role=deployment_group_role,
+            custom_resource_role=custom_resource_role
         )
 
         self.commit_to_ecr = PipelineCommitToEcr(
@@ -94,9 +112,27 @@ class EcsPipeline:
             artifacts_bucket=self.artifacts_bucket,
             ecr_repository=self.ecr_repository,
             source_repository=self.source_code_repository,
-            build_environment=build_environment,
-            docker_build_args=docker_build_args,
-            next_pipeline=self.ecr_to_ecs.ecr_to_ecs_pipeline
+            pipeline_params=pipeline_params,
+            cpu_architecture=cpu_architecture,
+            next_pipeline=self.ecr_to_ecs.ecr_to_ecs_pipeline,
+            ecr_to_ecs=self.ecr_to_ecs if pipeline_params.single_pipeline else None
+        )
+
+    @classmethod
+    def create_artifacts_bucket(cls, scope: core.Stack, prefix: str) -> EmptyS3Bucket:
+        """
+        Creates a bucket for pipeline artifacts which is emptied before deletion.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param prefix: A prefix for newly created resources.
+
+        :return: Artifacts bucket.
+        """
+        return EmptyS3Bucket(
+            scope,
+            cls.__convert(prefix + 'FargateArtifacts'),
+            access_control=aws_s3.BucketAccessControl.PRIVATE,
+            bucket_name=cls.__convert(prefix + 'FargateArtifacts'),
         )
 
     @staticmethod
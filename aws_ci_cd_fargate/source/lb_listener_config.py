@@ -1,7 +1,9 @@
 from typing import List, Optional
 from aws_cdk import aws_elasticloadbalancingv2
 from aws_cdk.aws_ec2 import Vpc
+from aws_cdk.core import Fn
 from aws_ci_cd_fargate.parameters.lb_listener_parameters import LbListenerParameters
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
 
 
 class LbListenerConfig:
@@ -17,7 +19,9 @@ class LbListenerConfig:
             vpc: Vpc,
             listener_params: LbListenerParameters,
             healthy_http_codes: Optional[List[int]] = None,
-            health_check_path: Optional[str] = None
+            health_check_path: Optional[str] = None,
+            lb_params: Optional[LoadBalancerParams] = None,
+            target_group_port: int = TARGET_GROUP_PORT
     ) -> None:
         """
         Constructor.
@@ -30,10 +34,16 @@ class LbListenerConfig:
         (healthy) or not. Specify a list of http codes that your service can return and should be treated as healthy.
         :param health_check_path: The deployed instance is constantly pinged to determine if it is available
         (healthy) or not. Specify a path to ping.
+        :param lb_params: Loadbalancer parameters with target group settings. If specified, healthy http codes
+        and health check path are taken from these parameters.
+        :param target_group_port: A container port to which target groups route traffic.
         """
-        # By default a healthy http code is considered to be 200.
-        healthy_http_codes = [str(code) for code in healthy_http_codes] if healthy_http_codes else ['200']
-        healthy_http_codes = ','.join(healthy_http_codes)
+        self.lb_params = lb_params or LoadBalancerParams(
+            healthy_http_codes=healthy_http_codes,
+            health_check_path=health_check_path
+        )
+        self.vpc = vpc
+        self.target_group_port = target_group_port
 
         # If your service's task definition uses the awsvpc network mode
         # (which is required for the Fargate launch type), you must choose ip as the target type,
@@ -43,21 +53,20 @@ class LbListenerConfig:
         # self.target_type = aws_elasticloadbalancingv2.TargetType.IP
         self.target_type = 'ip'
 
+        # A load balancer full name (app/name/id) is used as a CloudWatch metric dimension.
+        # It is the last part of a load balancer ARN (arn:aws:elasticloadbalancing:...:loadbalancer/app/name/id).
+        load_balancer_arn_parts = Fn.split('/', listener_params.production_listener.load_balancer_arn)
+        self.load_balancer_full_name = Fn.join('/', [
+            Fn.select(1, load_balancer_arn_parts),
+            Fn.select(2, load_balancer_arn_parts),
+            Fn.select(3, load_balancer_arn_parts)
+        ])
+
         """
         PRODUCTION CONFIG
         """
 
-        self.production_target_group = aws_elasticloadbalancingv2.CfnTargetGroup(
-            scope,
-            prefix + 'FargateProdTG',
-            name=prefix + 'FargateProdTG',
-            matcher=aws_elasticloadbalancingv2.CfnTargetGroup.MatcherProperty(http_code=healthy_http_codes),
-            port=self.TARGET_GROUP_PORT,
-            protocol='HTTP',
-            vpc_id=vpc.vpc_id,
-            target_type=self.target_type,
-            health_check_path=health_check_path if health_check_path else '/'
-        )
+        self.production_target_group = self.__create_target_group(scope, prefix + 'FargateProdTG')
 
         self.production_rule = aws_elasticloadbalancingv2.CfnListenerRule(
             scope=scope,
@@ -79,16 +88,7 @@ class LbListenerConfig:
         DEPLOYMENT CONFIG
         """
 
-        self.deployment_target_group = aws_elasticloadbalancingv2.CfnTargetGroup(
-            scope, prefix + 'FargateDeplTG',
-            name=prefix + 'FargateDeplTG',
-            matcher=aws_elasticloadbalancingv2.CfnTargetGroup.MatcherProperty(http_code=healthy_http_codes),
-            port=self.TARGET_GROUP_PORT,
-            protocol='HTTP',
-            vpc_id=vpc.vpc_id,
-            target_type=self.target_type,
-            health_check_path=health_check_path if health_check_path else '/'
-        )
+        self.deployment_target_group = self.__create_target_group(scope, prefix + 'FargateDeplTG')
 
         self.deployment_rule = aws_elasticloadbalancingv2.CfnListenerRule(
             scope=scope,
@@ -105,3 +105,44 @@ class LbListenerConfig:
             listener_arn=listener_params.deployment_listener.ref,
             priority=listener_params.rule_priority
         )
+
+    def __create_target_group(self, scope, name: str) -> aws_elasticloadbalancingv2.CfnTargetGroup:
+        """
+        Creates a target group. Production and deployment target groups swap their roles after every
+        deployment, hence both of them must be created with identical settings.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param name: A name of a target group.
+
+        :return: Target group.
+        """
+        lb_params = self.lb_params
+
+        if lb_params.protocol_version == LoadBalancerParams.GRPC:
+            matcher = aws_elasticloadbalancingv2.CfnTargetGroup.MatcherProperty(
+                grpc_code=','.join([str(code) for code in lb_params.healthy_grpc_codes])
+            )
+        else:
+            matcher = aws_elasticloadbalancingv2.CfnTargetGroup.MatcherProperty(
+                http_code=','.join([str(code) for code in lb_params.healthy_http_codes])
+            )
+
+        return aws_elasticloadbalancingv2.CfnTargetGroup(
+            scope, name,
+            name=name,
+            matcher=matcher,
+            port=self.target_group_port,
+            protocol='HTTP',
+            protocol_version=lb_params.protocol_version,
+            vpc_id=self.vpc.vpc_id,
+            target_type=self.target_type,
+            health_check_path=lb_params.health_check_path,
+            health_check_interval_seconds=lb_params.health_check_interval,
+            health_check_timeout_seconds=lb_params.health_check_timeout,
+            healthy_threshold_count=lb_params.healthy_threshold_count,
+            unhealthy_threshold_count=lb_params.unhealthy_threshold_count,
+            target_group_attributes=[
+                aws_elasticloadbalancingv2.CfnTargetGroup.TargetGroupAttributeProperty(key=key, value=value)
+                for key, value in lb_params.target_group_attributes.items()
+            ] or None
+        )
@@ -0,0 +1,117 @@
+import json
+import logging
+import math
+import os
+import time
+import urllib.error
+import urllib.request
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import boto3
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+TEST_URL = os.environ['TEST_URL']
+REQUEST_TIMEOUT = int(os.environ['REQUEST_TIMEOUT'])
+
+
+def warm_up_handler(event: Dict[str, Any], context: Any) -> None:
+    """
+    AfterAllowTestTraffic hook. Requests warm up paths of green containers through the deployment listener.
+    Warm up never fails a deployment.
+    """
+    def warm_up() -> None:
+        paths = json.loads(os.environ['WARM_UP_PATHS'])
+        requests = int(os.environ['WARM_UP_REQUESTS'])
+
+        for path in paths:
+            results = _send_requests(path, requests, concurrency=min(requests, 10))
+            failed = len([success for success, _ in results if not success])
+            logger.info(f'Warmed up {path} with {requests} requests, {failed} of them failed.')
+
+    _run_hook(event, warm_up, fail_deployment=False)
+
+
+def load_test_handler(event: Dict[str, Any], context: Any) -> None:
+    """
+    BeforeAllowTraffic hook. Runs a short load test against green containers through the deployment listener
+    and fails a deployment if p99 latency or error rate exceeds configured thresholds.
+    """
+    def load_test() -> None:
+        path = os.environ['LOAD_TEST_PATH']
+        requests = int(os.environ['LOAD_TEST_REQUESTS'])
+        concurrency = int(os.environ['LOAD_TEST_CONCURRENCY'])
+        max_p99_latency = os.environ.get('MAX_P99_LATENCY')
+        max_error_rate = os.environ.get('MAX_ERROR_RATE')
+
+        results = _send_requests(path, requests, concurrency)
+
+        latencies = sorted(latency for _, latency in results)
+        p99_latency = latencies[math.ceil(len(latencies) * 0.99) - 1]
+        error_rate = len([success for success, _ in results if not success]) / len(results)
+
+        logger.info(f'Load test of {path}: p99 latency {p99_latency:.3f}s, error rate {error_rate:.3f}.')
+
+        if max_p99_latency and p99_latency > float(max_p99_latency):
+            raise RuntimeError(f'P99 latency {p99_latency:.3f}s exceeds {max_p99_latency}s.')
+
+        if max_error_rate and error_rate > float(max_error_rate):
+            raise RuntimeError(f'Error rate {error_rate:.3f} exceeds {max_error_rate}.')
+
+    _run_hook(event, load_test, fail_deployment=True)
+
+
+def _run_hook(event: Dict[str, Any], hook, fail_deployment: bool) -> None:
+    """
+    Runs a hook and reports its status back to CodeDeploy.
+    """
+    logger.info(f'Got new lifecycle event: {event}.')
+
+    status = 'Succeeded'
+
+    try:
+        hook()
+    except Exception:
+        logger.exception('Lifecycle hook failed.')
+
+        if fail_deployment:
+            status = 'Failed'
+
+    boto3.client('codedeploy').put_lifecycle_event_hook_execution_status(
+        deploymentId=event['DeploymentId'],
+        lifecycleEventHookExecutionId=event['LifecycleEventHookExecutionId'],
+        status=status
+    )
+
+
+def _send_requests(path: str, requests: int, concurrency: int) -> List[Tuple[bool, float]]:
+    """
+    Sends GET requests to a given path of the deployment listener.
+
+    :return: A list of (success, latency in seconds) tuples.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda _: _send_request(TEST_URL + path), range(requests)))
+
+
+def _send_request(url: str) -> Tuple[bool, float]:
+    """
+    Sends a single GET request. Server errors, connection errors and timeouts are considered failed.
+
+    :return: A (success, latency in seconds) tuple.
+    """
+    start = time.monotonic()
+
+    try:
+        with urllib.request.urlopen(url, timeout=REQUEST_TIMEOUT) as response:
+            response.read()
+        success = True
+    except urllib.error.HTTPError as ex:
+        success = ex.code < 500
+    except Exception:
+        success = False
+
+    return success, time.monotonic() - start
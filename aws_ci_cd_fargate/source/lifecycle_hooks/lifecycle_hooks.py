@@ -0,0 +1,122 @@
+import json
+import os
+
+from typing import Dict, List, Optional
+from aws_cdk import aws_ec2, aws_iam, aws_lambda
+from aws_cdk.core import Stack, Duration
+from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
+from aws_ci_cd_fargate.parameters.lifecycle_hook_parameters import LifecycleHookParams
+
+
+class LifecycleHooks:
+    """
+    Class that creates blue/green deployment lifecycle hook functions. A warm up function runs after test traffic
+    is shifted to green containers and a load test function runs right before production traffic is shifted.
+    """
+    # The oldest supported CDK version (1.130) has no constants of Python runtimes which are still supported.
+    RUNTIME = aws_lambda.Runtime('python3.12', aws_lambda.RuntimeFamily.PYTHON)
+
+    def __init__(
+            self,
+            scope: Stack,
+            prefix: str,
+            hook_params: LifecycleHookParams,
+            ecs_params: EcsParams,
+            vpc: aws_ec2.Vpc
+    ) -> None:
+        """
+        Constructor.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param prefix: A prefix for newly created resources.
+        :param hook_params: Lifecycle hook parameters.
+        :param ecs_params: Ecs parameters. Hook functions run in the same subnets and security groups as containers.
+        :param vpc: Virtual Private Cloud in which containers are located.
+        """
+        self.__scope = scope
+        self.__prefix = prefix
+        self.__hook_params = hook_params
+        self.__ecs_params = ecs_params
+        self.__vpc = vpc
+
+        self.warm_up_function: Optional[aws_lambda.Function] = None
+        self.load_test_function: Optional[aws_lambda.Function] = None
+
+        if hook_params.warm_up:
+            self.warm_up_function = self.__create_function('WarmUp', 'index.warm_up_handler', {
+                'WARM_UP_PATHS': json.dumps(hook_params.warm_up_paths),
+                'WARM_UP_REQUESTS': str(hook_params.warm_up_requests)
+            })
+
+        if hook_params.load_test:
+            environment = {
+                'LOAD_TEST_PATH': hook_params.load_test_path,
+                'LOAD_TEST_REQUESTS': str(hook_params.load_test_requests),
+                'LOAD_TEST_CONCURRENCY': str(hook_params.load_test_concurrency)
+            }
+
+            if hook_params.max_p99_latency is not None:
+                environment['MAX_P99_LATENCY'] = str(hook_params.max_p99_latency)
+
+            if hook_params.max_error_rate is not None:
+                environment['MAX_ERROR_RATE'] = str(hook_params.max_error_rate)
+
+            self.load_test_function = self.__create_function('LoadTest', 'index.load_test_handler', environment)
+
+    @property
+    def hooks(self) -> List[Dict[str, str]]:
+        """
+        Returns application specification hooks in the order they are run.
+
+        :return: A list of lifecycle event and function name pairs.
+        """
+        hooks = []
+
+        if self.warm_up_function:
+            hooks.append({'AfterAllowTestTraffic': self.warm_up_function.function_name})
+
+        if self.load_test_function:
+            hooks.append({'BeforeAllowTraffic': self.load_test_function.function_name})
+
+        return hooks
+
+    def __create_function(self, name: str, handler: str, environment: Dict[str, str]) -> aws_lambda.Function:
+        """
+        Creates a single lifecycle hook function.
+
+        :param name: A name of a function used in construct ids and function names.
+        :param handler: A function handler.
+        :param environment: Hook specific environment variables.
+
+        :return: Lambda function.
+        """
+        function = aws_lambda.Function(
+            self.__scope, self.__prefix + 'Fargate' + name + 'Hook',
+            function_name=self.__prefix + 'Fargate' + name + 'Hook',
+            code=aws_lambda.Code.from_asset(os.path.join(os.path.dirname(__file__), 'function')),
+            handler=handler,
+            runtime=self.RUNTIME,
+            timeout=Duration.minutes(self.__hook_params.hook_timeout),
+            memory_size=256,
+            environment={
+                'TEST_URL': self.__hook_params.test_url,
+                'REQUEST_TIMEOUT': str(self.__hook_params.request_timeout),
+                **environment
+            },
+            vpc=self.__vpc,
+            vpc_subnets=aws_ec2.SubnetSelection(subnets=self.__ecs_params.ecs_subnets),
+            security_groups=self.__ecs_params.ecs_security_groups
+        )
+
+        function.add_to_role_policy(aws_iam.PolicyStatement(
+            actions=['codedeploy:PutLifecycleEventHookExecutionStatus'],
+            resources=[self.__scope.format_arn(
+                service='codedeploy',
+                resource='deploymentgroup',
+                resource_name=f'*/{self.__prefix}FargateDeploymentGroup',
+                sep=':'
+            )],
+            effect=aws_iam.Effect.ALLOW
+        ))
+
+        return function
@@ -1,13 +1,22 @@
 import copy
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, List
 from aws_cdk import aws_codepipeline, aws_codepipeline_actions, aws_codecommit, aws_iam, aws_codebuild, aws_ecr
 from aws_cdk.aws_codepipeline import IPipeline
 from aws_cdk.aws_s3 import IBucket
-from aws_cdk.core import Stack
+from aws_cdk.core import Stack, Duration
+from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
+from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+from aws_ci_cd_fargate.source.pipeline_ecr_to_ecs import PipelineEcrToEcs
 
 
 class PipelineCommitToEcr:
+    # Docker platforms of images built for a given task cpu architecture.
+    DOCKER_PLATFORMS = {
+        EcsParams.X86_64: 'linux/amd64',
+        EcsParams.ARM64: 'linux/arm64'
+    }
+
     def __init__(
             self,
             scope: Stack,
@@ -15,14 +24,24 @@ class PipelineCommitToEcr:
             artifacts_bucket: IBucket,
             ecr_repository: aws_ecr.Repository,
             source_repository: aws_codecommit.Repository,
-            build_environment: Dict[str, Any],
-            docker_build_args: Dict[str, str],
-            next_pipeline: IPipeline
+            pipeline_params: PipelineParams,
+            cpu_architecture: str = EcsParams.X86_64,
+            next_pipeline: Optional[IPipeline] = None,
+            ecr_to_ecs: Optional[PipelineEcrToEcs] = None
     ):
         self.region = scope.region
         self.ecr_repository = ecr_repository
-        self.build_environment = build_environment
+        self.pipeline_params = pipeline_params
+        self.build_environment = pipeline_params.build_environment
         self.next_pipeline = next_pipeline
+        self.cpu_architecture = cpu_architecture
+
+        if pipeline_params.build_arm != (cpu_architecture == EcsParams.ARM64):
+            # Building for a foreign architecture requires slow emulation, hence images are built natively.
+            raise ValueError(
+                f'Images for {cpu_architecture} containers must be built on a matching build host. '
+                f'Set build_arm={cpu_architecture == EcsParams.ARM64} in pipeline parameters.'
+            )
 
         self.source_artifact = aws_codepipeline.Artifact(
             artifact_name=prefix + 'FargateCodeCommitSourceArtifact',
@@ -37,40 +56,26 @@ class PipelineCommitToEcr:
             output=self.source_artifact
         )
 
-        docker_build_command = 'docker build -t $REPOSITORY_URI:latest .'
-
-        for key, value in docker_build_args.items():
-            docker_build_command += f' --build-arg {key}={value}'
+        self.image_artifact = aws_codepipeline.Artifact(
+            artifact_name=prefix + 'FargateImageDetailArtifact',
+        )
 
         self.docker_build = aws_codebuild.PipelineProject(
             scope, prefix + 'FargateCodeBuildProject',
             project_name=prefix + 'FargateCodeBuildProject',
             environment_variables=self.build_environment_variables(),
             environment=aws_codebuild.BuildEnvironment(
-                build_image=aws_codebuild.LinuxBuildImage.UBUNTU_14_04_DOCKER_18_09_0,
-                compute_type=aws_codebuild.ComputeType.SMALL,
+                build_image=pipeline_params.build_image,
+                compute_type=pipeline_params.build_compute_type,
+                # Docker images can only be built in a privileged build container.
                 privileged=True
             ),
-            build_spec=aws_codebuild.BuildSpec.from_object(
-                {
-                    'version': 0.2,
-                    'phases': {
-                        'pre_build': {
-                            'commands': f'$(aws ecr get-login --no-include-email --region $REGION)'
-                        },
-                        'build': {
-                            'commands': docker_build_command,
-                        },
-                        'post_build': {
-                            'commands': [
-                                'docker push $REPOSITORY_URI:latest',
-                                f'aws codepipeline start-pipeline-execution --name $PIPELINE_NAME'
-                            ]
-                        },
-                    }
-                }
+            timeout=Duration.minutes(pipeline_params.build_timeout) if pipeline_params.build_timeout else None,
+            queued_timeout=(
+                Duration.minutes(pipeline_params.build_queue_timeout) if pipeline_params.build_queue_timeout else None
             ),
-
+            cache=self.build_cache(),
+            build_spec=aws_codebuild.BuildSpec.from_object(self.build_spec())
         )
 
         self.docker_build.role.add_to_policy(
@@ -82,12 +87,35 @@ class PipelineCommitToEcr:
                     "ecr:InitiateLayerUpload",
                     "ecr:BatchCheckLayerAvailability",
                     "ecr:PutImage",
-                    "codepipeline:StartPipelineExecution"
+                    "ecr:BatchGetImage",
+                    "ecr:GetDownloadUrlForLayer",
                 ],
                 resources=['*'],
                 effect=aws_iam.Effect.ALLOW)
         )
 
+        if self.next_pipeline:
+            self.docker_build.role.add_to_policy(
+                statement=aws_iam.PolicyStatement(
+                    actions=["codepipeline:StartPipelineExecution"],
+                    resources=[self.next_pipeline.pipeline_arn],
+                    effect=aws_iam.Effect.ALLOW)
+            )
+
+        source_actions = [self.source_action]
+        stages = []
+
+        if ecr_to_ecs:
+            # Single pipeline mode. A built image is handed straight to a deployment stage
+            # instead of starting a separate pipeline which would fetch its sources again.
+            source_actions.append(ecr_to_ecs.create_config_source_action())
+            stages.append(
+                aws_codepipeline.StageProps(
+                    stage_name='DeployStage',
+                    actions=[ecr_to_ecs.create_deploy_action(self.image_artifact)]
+                )
+            )
+
         self.codecommit_to_ecr_pipeline = aws_codepipeline.Pipeline(
             scope,
             prefix + 'FargateCodeCommitToEcrPipeline',
@@ -96,7 +124,7 @@ class PipelineCommitToEcr:
             stages=[
                 aws_codepipeline.StageProps(
                     stage_name='SourceStage',
-                    actions=[self.source_action]
+                    actions=source_actions
                 ),
                 aws_codepipeline.StageProps(
                     stage_name='BuildStage',
@@ -104,25 +132,204 @@ class PipelineCommitToEcr:
                         aws_codepipeline_actions.CodeBuildAction(
                             input=self.source_artifact,
                             project=self.docker_build,
+                            outputs=[self.image_artifact],
                             action_name='BuildAction',
                             run_order=1
                         )
                     ]
-                )
+                ),
+                *stages
             ]
         )
 
+        if ecr_to_ecs:
+            self.codecommit_to_ecr_pipeline.node.add_dependency(ecr_to_ecs.commit_custom)
+
+    def build_cache(self) -> Optional[aws_codebuild.Cache]:
+        """
+        Creates a CodeBuild cache configuration. A local cache keeps docker layers and source files on the build
+        host, hence consecutive builds that land on the same host skip unchanged layers entirely.
+
+        :return: CodeBuild cache configuration or None if caching is disabled.
+        """
+        if not self.pipeline_params.build_cache:
+            return None
+
+        return aws_codebuild.Cache.local(
+            aws_codebuild.LocalCacheMode.DOCKER_LAYER,
+            aws_codebuild.LocalCacheMode.SOURCE
+        )
+
+    def build_spec(self) -> Dict[str, Any]:
+        """
+        Creates a build specification which builds a docker image, pushes it to ECR and triggers a deployment.
+
+        :return: Build specification object.
+        """
+        pre_build_commands = [
+            'aws ecr get-login-password --region $REGION | '
+            'docker login --username AWS --password-stdin ${REPOSITORY_URI%%/*}',
+            # Every image is tagged with the commit it was built from. Such tag is never overwritten.
+            'export IMAGE_TAG=$CODEBUILD_RESOLVED_SOURCE_VERSION'
+        ]
+
+        if self.pipeline_params.build_cache:
+            # A missing cache image (e.g. the very first build) must not fail the build.
+            pre_build_commands.append('docker pull $REPOSITORY_URI:$CACHE_TAG || true')
+
+        build_commands = [self.docker_build_command()]
+
+        if self.pipeline_params.max_image_size:
+            max_bytes = self.pipeline_params.max_image_size * 1024 * 1024
+            build_commands.append(
+                f'test $(docker image inspect --format=\'{{{{.Size}}}}\' $REPOSITORY_URI:$IMAGE_TAG) -le {max_bytes} || '
+                f'{{ echo "Image exceeds the size budget of {self.pipeline_params.max_image_size} MiB."; exit 1; }}'
+            )
+
+        post_build_commands = [f'docker push $REPOSITORY_URI:{tag}' for tag in self.image_tags()]
+        # Pin the deployed image to the digest of the pushed image rather than to a mutable tag.
+        post_build_commands.append(
+            'export IMAGE_URI=$(docker inspect --format=\'{{index .RepoDigests 0}}\' $REPOSITORY_URI:$IMAGE_TAG)'
+        )
+
+        if self.pipeline_params.soci_index:
+            post_build_commands.extend(self.soci_index_commands())
+
+        if self.pipeline_params.zstd_image:
+            post_build_commands.extend([
+                'docker buildx create --use',
+                self.docker_build_command(zstd=True),
+                'export IMAGE_URI=$REPOSITORY_URI@$(jq -r \'."containerimage.digest"\' zstd-metadata.json)'
+            ])
+
+        post_build_commands.append('printf \'{"ImageURI":"%s"}\' $IMAGE_URI > imageDetail.json')
+
+        if self.next_pipeline:
+            post_build_commands.append('aws codepipeline start-pipeline-execution --name $PIPELINE_NAME')
+
+        return {
+            'version': 0.2,
+            'phases': {
+                'pre_build': {
+                    'commands': pre_build_commands
+                },
+                'build': {
+                    # Post build phase runs even if the build fails. Abort to never push a half-baked image.
+                    'on-failure': 'ABORT',
+                    'commands': build_commands,
+                },
+                'post_build': {
+                    'commands': post_build_commands
+                },
+            },
+            'artifacts': {
+                'files': ['imageDetail.json']
+            }
+        }
+
+    def image_tags(self) -> List[str]:
+        """
+        Returns tags with which a built image is tagged and pushed to ECR.
+
+        :return: A list of image tags.
+        """
+        tags = ['$IMAGE_TAG', 'latest']
+
+        if self.pipeline_params.build_cache:
+            tags.append('$CACHE_TAG')
+
+        return tags
+
+    def docker_build_command(self, zstd: bool = False) -> str:
+        """
+        Creates a docker build command. If build cache is enabled, the image is built with BuildKit,
+        reuses layers of the previously pushed cache image and embeds inline cache metadata into the newly
+        built image so the next build can reuse its layers without a separate cache export.
+        The target platform is pinned to the task cpu architecture, so a deployed image never disagrees
+        with a task definition.
+
+        :param zstd: Whether to build and push a zstd compressed image variant with docker buildx instead.
+
+        :return: Docker build command.
+        """
+        tag_arguments = ' '.join(f'-t $REPOSITORY_URI:{tag}' for tag in self.image_tags())
+        platform = self.DOCKER_PLATFORMS[self.cpu_architecture]
+
+        if zstd:
+            cache_argument = '--cache-from $REPOSITORY_URI:$CACHE_TAG ' if self.pipeline_params.build_cache else ''
+            docker_build_command = (
+                f'docker buildx build --platform {platform} '
+                f'{cache_argument}'
+                '--output type=image,name=$REPOSITORY_URI:$IMAGE_TAG-zstd,oci-mediatypes=true,'
+                'compression=zstd,force-compression=true,push=true '
+                '--metadata-file zstd-metadata.json .'
+            )
+        elif self.pipeline_params.build_cache:
+            docker_build_command = (
+                f'DOCKER_BUILDKIT=1 docker build --platform {platform} '
+                '--cache-from $REPOSITORY_URI:$CACHE_TAG '
+                '--build-arg BUILDKIT_INLINE_CACHE=1 '
+                f'{tag_arguments} .'
+            )
+        else:
+            docker_build_command = f'docker build --platform {platform} {tag_arguments} .'
+
+        for key, value in self.pipeline_params.docker_build_args.items():
+            docker_build_command += f' --build-arg {key}={value}'
+
+        return docker_build_command
+
+    def soci_index_commands(self) -> List[str]:
+        """
+        Creates commands which create a SOCI index for a pushed image and push the index to ECR.
+        The SOCI CLI works with containerd, hence the image is pulled into docker's containerd content store first.
+
+        :return: A list of build commands.
+        """
+        version = self.pipeline_params.soci_version
+        architecture = 'arm64' if self.pipeline_params.build_arm else 'amd64'
+        containerd = '--address /var/run/docker/containerd/containerd.sock'
+        credentials = '--user AWS:$(aws ecr get-login-password --region $REGION)'
+
+        return [
+            f'curl -sSL https://github.com/awslabs/soci-snapshotter/releases/download/v{version}/'
+            f'soci-snapshotter-{version}-linux-{architecture}.tar.gz | tar -xz -C /usr/local/bin soci',
+            f'ctr {containerd} image pull {credentials} $REPOSITORY_URI:$IMAGE_TAG',
+            f'soci {containerd} create $REPOSITORY_URI:$IMAGE_TAG',
+            f'soci {containerd} push {credentials} $REPOSITORY_URI:$IMAGE_TAG'
+        ]
+
     def build_environment_variables(self):
         base_environment = {
             'REPOSITORY_URI': aws_codebuild.BuildEnvironmentVariable(value=self.ecr_repository.repository_uri),
-            'PIPELINE_NAME': aws_codebuild.BuildEnvironmentVariable(value=self.next_pipeline.pipeline_name),
-            'REGION': aws_codebuild.BuildEnvironmentVariable(value=self.region)
+            'REGION': aws_codebuild.BuildEnvironmentVariable(value=self.region),
+            'CACHE_TAG': aws_codebuild.BuildEnvironmentVariable(value=self.pipeline_params.build_cache_tag)
         }
 
+        if self.next_pipeline:
+            base_environment['PIPELINE_NAME'] = aws_codebuild.BuildEnvironmentVariable(
+                value=self.next_pipeline.pipeline_name
+            )
+
         build_environment = copy.deepcopy(self.build_environment)
-        build_environment.pop('REPOSITORY_URI', None)
+
+        # CodeBuild grants read access to secrets and parameters referenced by environment variables.
+        for key, value in self.pipeline_params.build_secrets.items():
+            build_environment[key] = aws_codebuild.BuildEnvironmentVariable(
+                type=aws_codebuild.BuildEnvironmentVariableType.SECRETS_MANAGER,
+                value=value
+            )
+
+        for key, value in self.pipeline_params.build_parameters.items():
+            build_environment[key] = aws_codebuild.BuildEnvironmentVariable(
+                type=aws_codebuild.BuildEnvironmentVariableType.PARAMETER_STORE,
+                value=value
+            )
+
         build_environment.pop('PIPELINE_NAME', None)
-        build_environment.pop('REGION', None)
+
+        for key in base_environment.keys():
+            build_environment.pop(key, None)
 
         for key, value in build_environment.items():
             if not isinstance(value, aws_codebuild.BuildEnvironmentVariable):
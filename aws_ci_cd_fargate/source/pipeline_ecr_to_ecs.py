@@ -1,7 +1,10 @@
+from typing import List, Optional
 from aws_cdk import aws_codepipeline, aws_codepipeline_actions, aws_codecommit, aws_codedeploy, aws_elasticloadbalancingv2, aws_ecs, aws_ecr
-from aws_cdk.aws_ecs import CfnService
+from aws_cdk.aws_iam import IRole
 from aws_cdk.aws_s3 import IBucket
-from aws_cdk.core import Stack
+from aws_cdk.core import Construct, RemovalPolicy, Stack
+from aws_ci_cd_fargate.parameters.deployment_parameters import DeploymentParams
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
 from aws_ci_cd_fargate.source.custom.deployment_config import DeploymentConfig
 from aws_ci_cd_fargate.source.custom.deployment_group import DeploymentGroup
 
@@ -19,16 +22,53 @@ class PipelineEcrToEcs:
             main_listener: aws_elasticloadbalancingv2.CfnListener,
             deployments_listener: aws_elasticloadbalancingv2.CfnListener,
             ecs_cluster: aws_ecs.Cluster,
-            ecs_service: CfnService,
+            ecs_service: Optional[Construct],
             production_target_group,
-            deployment_target_group
+            deployment_target_group,
+            deployment_params: DeploymentParams,
+            deployment_alarm_names: Optional[List[str]] = None,
+            create_pipeline: bool = True,
+            resource_mode: str = ResourceMode.CUSTOM,
+            deployment_group_role: Optional[IRole] = None,
+            custom_resource_role: Optional[IRole] = None
     ):
         self.application = aws_codedeploy.EcsApplication(
             scope, prefix + 'FargateCodeDeployApplication',
             application_name=prefix + 'FargateCodeDeployApplication',
         )
 
-        self.deployment_group_custom = DeploymentGroup(
+        self.deployment_config = None
+        deployment_config_name = deployment_params.deployment_config_name
+
+        if deployment_params.custom_traffic_shift:
+            if deployment_params.traffic_shift_type == DeploymentParams.CANARY:
+                traffic_routing_config = aws_codedeploy.CfnDeploymentConfig.TrafficRoutingConfigProperty(
+                    type=deployment_params.traffic_shift_type,
+                    time_based_canary=aws_codedeploy.CfnDeploymentConfig.TimeBasedCanaryProperty(
+                        canary_percentage=deployment_params.traffic_shift_percentage,
+                        canary_interval=deployment_params.traffic_shift_interval
+                    )
+                )
+            else:
+                traffic_routing_config = aws_codedeploy.CfnDeploymentConfig.TrafficRoutingConfigProperty(
+                    type=deployment_params.traffic_shift_type,
+                    time_based_linear=aws_codedeploy.CfnDeploymentConfig.TimeBasedLinearProperty(
+                        linear_percentage=deployment_params.traffic_shift_percentage,
+                        linear_interval=deployment_params.traffic_shift_interval
+                    )
+                )
+
+            # The name is left for CloudFormation to generate, since deployment configurations
+            # can not be updated in place and are replaced on every change.
+            self.deployment_config = aws_codedeploy.CfnDeploymentConfig(
+                scope, prefix + 'FargateTrafficShiftConfig',
+                compute_platform='ECS',
+                traffic_routing_config=traffic_routing_config
+            )
+
+            deployment_config_name = self.deployment_config.ref
+
+        deployment_group = DeploymentGroup(
             stack=scope,
             prefix=prefix,
             code_repository=source_repository,
@@ -39,11 +79,37 @@ class PipelineEcrToEcs:
             deployments_listener=deployments_listener,
             ecs_cluster=ecs_cluster,
             production_target_group=production_target_group,
-            deployment_target_group=deployment_target_group
-        ).get_resource()
+            deployment_target_group=deployment_target_group,
+            deployment_config_name=deployment_config_name,
+            termination_wait_time=deployment_params.termination_wait_time,
+            deployment_ready_wait_time=deployment_params.deployment_ready_wait_time,
+            alarm_names=deployment_params.alarm_names + (deployment_alarm_names or []),
+            ignore_poll_alarm_failure=deployment_params.ignore_poll_alarm_failure,
+            deployment_group_role=deployment_group_role,
+            custom_resource_role=custom_resource_role
+        )
+
+        self.deployment_group_custom = None
+        self.deployment_group_native = None
+
+        if resource_mode in [ResourceMode.CUSTOM, ResourceMode.RETAIN]:
+            self.deployment_group_custom = deployment_group.get_resource()
+        elif resource_mode in [ResourceMode.IMPORT, ResourceMode.NATIVE]:
+            self.deployment_group_native = deployment_group.get_native_resource()
+
+        if resource_mode == ResourceMode.RETAIN:
+            self.deployment_group_custom.node.default_child.apply_removal_policy(RemovalPolicy.RETAIN)
+
+        if resource_mode == ResourceMode.IMPORT:
+            self.deployment_group_native.apply_removal_policy(RemovalPolicy.RETAIN)
+
+        deployment_group_resource = self.deployment_group_custom or self.deployment_group_native
+
+        if deployment_group_resource:
+            if ecs_service:
+                deployment_group_resource.node.add_dependency(ecs_service)
 
-        self.deployment_group_custom.node.add_dependency(ecs_service)
-        self.deployment_group_custom.node.add_dependency(ecs_cluster)
+            deployment_group_resource.node.add_dependency(ecs_cluster)
 
         self.deployment_group = aws_codedeploy.EcsDeploymentGroup.from_ecs_deployment_group_attributes(
             scope, prefix + 'FargateDeploymentGroup',
@@ -51,7 +117,8 @@ class PipelineEcrToEcs:
             deployment_group_name=prefix + 'FargateDeploymentGroup',
         )
 
-        self.deployment_group.node.add_dependency(self.deployment_group_custom)
+        if deployment_group_resource:
+            self.deployment_group.node.add_dependency(deployment_group_resource)
 
         self.deployment_config_repository = aws_codecommit.Repository(
             scope, prefix + 'FargateDeploymentConfigRepository',
@@ -64,12 +131,20 @@ class PipelineEcrToEcs:
             prefix=prefix,
             code_repository=self.deployment_config_repository,
             task_definition=task_def,
-            app_spec=app_spec
+            app_spec=app_spec,
+            role=custom_resource_role
         ).get_resource()
 
         self.ecr_repository_output_artifact = aws_codepipeline.Artifact('EcsImage')
         self.config_output_artifact = aws_codepipeline.Artifact('EcsConfig')
 
+        # In a single pipeline mode source, build and deploy stages live in one pipeline which
+        # is created by the build pipeline with the actions defined below.
+        self.ecr_to_ecs_pipeline = None
+
+        if not create_pipeline:
+            return
+
         self.ecr_to_ecs_pipeline = aws_codepipeline.Pipeline(
             scope,
             prefix + 'FargateEcrToEcsPipeline',
@@ -85,34 +160,55 @@ class PipelineEcrToEcs:
                             repository=ecr_repository,
                             run_order=1,
                         ),
-                        aws_codepipeline_actions.CodeCommitSourceAction(
-                            action_name='SourceCodeCommitAction',
-                            output=self.config_output_artifact,
-                            repository=self.deployment_config_repository,
-                            branch='master',
-                            run_order=1,
-                        )
+                        self.create_config_source_action()
                     ]
                 ),
                 aws_codepipeline.StageProps(
                     stage_name='DeployStage',
                     actions=[
-                        aws_codepipeline_actions.CodeDeployEcsDeployAction(
-                            action_name='DeployAction',
-                            deployment_group=self.deployment_group,
-                            app_spec_template_input=self.config_output_artifact,
-                            task_definition_template_input=self.config_output_artifact,
-                            container_image_inputs=[
-                                aws_codepipeline_actions.CodeDeployEcsContainerImageInput(
-                                    input=self.ecr_repository_output_artifact,
-                                    task_definition_placeholder='IMAGE1_NAME'
-                                )
-                            ],
-                            run_order=1
-                        )
+                        self.create_deploy_action(self.ecr_repository_output_artifact)
                     ]
                 )
             ]
         )
 
         self.ecr_to_ecs_pipeline.node.add_dependency(self.commit_custom)
+
+    def create_config_source_action(self) -> aws_codepipeline_actions.CodeCommitSourceAction:
+        """
+        Creates a source action which fetches appspec and taskdef files from a deployment config repository.
+
+        :return: Source action.
+        """
+        return aws_codepipeline_actions.CodeCommitSourceAction(
+            action_name='SourceCodeCommitAction',
+            output=self.config_output_artifact,
+            repository=self.deployment_config_repository,
+            branch='master',
+            run_order=1,
+        )
+
+    def create_deploy_action(
+            self,
+            image_input: aws_codepipeline.Artifact
+    ) -> aws_codepipeline_actions.CodeDeployEcsDeployAction:
+        """
+        Creates a blue/green deployment action.
+
+        :param image_input: An artifact containing imageDetail.json file of an image to deploy.
+
+        :return: Deploy action.
+        """
+        return aws_codepipeline_actions.CodeDeployEcsDeployAction(
+            action_name='DeployAction',
+            deployment_group=self.deployment_group,
+            app_spec_template_input=self.config_output_artifact,
+            task_definition_template_input=self.config_output_artifact,
+            container_image_inputs=[
+                aws_codepipeline_actions.CodeDeployEcsContainerImageInput(
+                    input=image_input,
+                    task_definition_placeholder='IMAGE1_NAME'
+                )
+            ],
+            run_order=1
+        )
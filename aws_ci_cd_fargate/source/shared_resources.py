@@ -0,0 +1,77 @@
+from typing import Dict
+from aws_cdk import aws_ec2, aws_iam
+from aws_cdk.core import Construct, Stack
+from aws_ci_cd_fargate.source.custom.deployment_group import DeploymentGroup
+from aws_ci_cd_fargate.source.ecs_main import Ecs
+from aws_ci_cd_fargate.source.ecs_pipeline import EcsPipeline
+
+
+class SharedResources:
+    """
+    Class that creates resources shared by many ecs services (see EcsFargateFleet): an ecs cluster,
+    a pipeline artifacts bucket and roles whose permissions do not depend on a particular service.
+    """
+    def __init__(
+            self,
+            scope: Stack,
+            prefix: str,
+            vpc: aws_ec2.Vpc
+    ) -> None:
+        """
+        Constructor.
+
+        :param scope: A CloudFormation template to which add resources.
+        :param prefix: A prefix for newly created resources.
+        :param vpc: Virtual Private Cloud in which containers are located.
+        """
+        self.cluster = Ecs.create_cluster(scope, prefix, vpc)
+
+        # Only one set of capacity providers can be associated with a cluster. Services choose between
+        # them with their own capacity provider strategies.
+        self.capacity_provider_associations = Ecs.create_capacity_provider_associations(
+            scope, prefix, self.cluster, [{'capacityProvider': 'FARGATE', 'weight': 1}]
+        )
+
+        self.artifacts_bucket = EcsPipeline.create_artifacts_bucket(scope, prefix)
+
+        self.deployment_group_role = DeploymentGroup.create_deployment_group_role(scope, prefix)
+
+        # Grants made by services (e.g. to their log groups) are already covered by the role's own policy.
+        # Dropping them keeps a single role below IAM policy size limits regardless of the amount of services.
+        self.task_execution_role = Ecs.create_task_execution_role(scope, prefix).without_policy_updates()
+
+        self.__prefix = prefix
+        self.__custom_resource_roles: Dict[str, aws_iam.IRole] = {}
+
+    def custom_resource_role(self, scope: Construct) -> aws_iam.IRole:
+        """
+        Returns a role for deployment custom resources of services in a given (nested) stack. All custom resources
+        of a stack are run by a single provider function with a single role, hence one role per stack is enough.
+
+        Every custom resource attaches its own policy to its role. With tens of services in a stack these policies
+        would exceed the IAM policy size limit of a single role. Instead, the role and a single managed policy grant
+        calls of all services in a stack, hence custom resources drop their own policies.
+
+        :param scope: A scope in which services are created.
+
+        :return: Custom resource role.
+        """
+        stack = Stack.of(scope)
+
+        if stack.node.path not in self.__custom_resource_roles:
+            role = DeploymentGroup.create_custom_resource_role(stack, self.__prefix)
+            role.add_managed_policy(aws_iam.ManagedPolicy(
+                stack, self.__prefix + 'CustomResourcePolicy',
+                statements=[
+                    aws_iam.PolicyStatement(
+                        actions=['codecommit:CreateCommit', 'codecommit:GetBranch'],
+                        # Deployment config repositories of all services (see PipelineEcrToEcs).
+                        resources=[stack.format_arn(service='codecommit', resource='*-deployment-config')],
+                        effect=aws_iam.Effect.ALLOW
+                    )
+                ]
+            ))
+
+            self.__custom_resource_roles[stack.node.path] = role.without_policy_updates()
+
+        return self.__custom_resource_roles[stack.node.path]
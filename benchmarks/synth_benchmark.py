@@ -0,0 +1,240 @@
+"""
+Synth benchmark of EcsFargateWithCiCd.
+
+Builds 1, 10 and 50 services (one stack per service next to a shared network stack) into an offline CDK app
+and records synth wall time, peak memory, construct count, CloudFormation resource count and template bytes.
+Fails when a count exceeds its budget, so regressions in construct and resource counts (which drive deploy time)
+and template sizes are caught before a release. Synth time and peak memory depend on a machine, hence they are
+only reported.
+
+Usage:
+    python benchmarks/synth_benchmark.py                    # Run every scenario and check budgets.
+    python benchmarks/synth_benchmark.py --services 1 10    # Run selected scenarios only.
+    python benchmarks/synth_benchmark.py --write-budgets    # Record current measurements as new budgets.
+
+Every scenario runs in a fresh process, since jsii keeps a single node process (where most of the memory
+is spent) per python process. Peak memory is the peak resident memory of the largest of the two processes.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Any, Dict, List
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGETS_FILE = os.path.join(BENCHMARKS_DIR, 'budgets.json')
+SCENARIOS = [1, 10, 50]
+
+# Multipliers applied to deterministic measurements when budgets are written. Only these measurements
+# have budgets, since a gate which fails on unchanged code (e.g. on a slower machine) would be ignored.
+HEADROOM = {
+    'constructs': 1.0,
+    'resources': 1.0,
+    'template_bytes': 1.05,
+}
+
+
+def run_scenario(services: int, outdir: str) -> Dict[str, Any]:
+    """
+    Builds and synthesizes an app with a given amount of services. Runs inside a scenario process.
+
+    :param services: An amount of services to build.
+    :param outdir: A directory to which a cloud assembly is written.
+
+    :return: Measurements (except peak memory which is measured by a parent process).
+    """
+    sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+
+    from aws_cdk import core, aws_ec2, aws_elasticloadbalancingv2
+    from aws_ci_cd_fargate.ecs_fargate_with_ci_cd import EcsFargateWithCiCd
+    from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
+    from aws_ci_cd_fargate.parameters.lb_listener_parameters import LbListenerParameters
+    from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+    from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+
+    start = time.perf_counter()
+
+    # An explicit environment and no lookups keep synthesis offline.
+    env = core.Environment(account='123456789012', region='eu-west-1')
+    app = core.App(outdir=outdir)
+
+    network = core.Stack(app, 'BenchmarkNetwork', env=env)
+    vpc = aws_ec2.Vpc(network, 'Vpc', max_azs=2)
+    security_group = aws_ec2.SecurityGroup(network, 'SecurityGroup', vpc=vpc)
+    load_balancer = aws_elasticloadbalancingv2.CfnLoadBalancer(
+        network, 'LoadBalancer',
+        subnets=[subnet.subnet_id for subnet in vpc.public_subnets]
+    )
+    listeners = [
+        aws_elasticloadbalancingv2.CfnListener(
+            network, name,
+            load_balancer_arn=load_balancer.ref,
+            port=port,
+            protocol='HTTP',
+            default_actions=[aws_elasticloadbalancingv2.CfnListener.ActionProperty(
+                type='fixed-response',
+                fixed_response_config=aws_elasticloadbalancingv2.CfnListener.FixedResponseConfigProperty(
+                    status_code='404'
+                )
+            )]
+        ) for name, port in [('ProductionListener', 80), ('DeploymentListener', 8080)]
+    ]
+
+    for index in range(services):
+        prefix = f'Benchmark{index}'
+        stack = core.Stack(app, prefix, env=env)
+
+        EcsFargateWithCiCd(
+            stack,
+            prefix=prefix,
+            vpc=vpc,
+            lb_params=LoadBalancerParams(),
+            ecs_params=EcsParams(
+                'FargateEcsContainer', 256, 512, {'SERVICE': prefix}, [security_group], vpc.private_subnets
+            ),
+            lb_listener_params=LbListenerParameters(
+                production_listener=listeners[0],
+                deployment_listener=listeners[1],
+                rule_priority=index + 1,
+                rule_condition=aws_elasticloadbalancingv2.CfnListenerRule.RuleConditionProperty(
+                    field='path-pattern',
+                    path_pattern_config=aws_elasticloadbalancingv2.CfnListenerRule.PathPatternConfigProperty(
+                        values=[f'/{prefix.lower()}/*']
+                    )
+                )
+            ),
+            pipeline_params=PipelineParams()
+        )
+
+    app.synth()
+
+    synth_seconds = time.perf_counter() - start
+
+    resources = 0
+    template_bytes = 0
+
+    for file_name in os.listdir(outdir):
+        if file_name.endswith('.template.json'):
+            path = os.path.join(outdir, file_name)
+            template_bytes += os.path.getsize(path)
+
+            with open(path) as template:
+                resources += len(json.load(template).get('Resources', {}))
+
+    return {
+        'synth_seconds': round(synth_seconds, 2),
+        'constructs': len(app.node.find_all()),
+        'resources': resources,
+        'template_bytes': template_bytes,
+    }
+
+
+def measure(services: int) -> Dict[str, Any]:
+    """
+    Runs a scenario in a fresh process and measures its peak memory.
+
+    :param services: An amount of services to build.
+
+    :return: All measurements of a scenario.
+    """
+    with tempfile.TemporaryDirectory() as outdir:
+        process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--run-scenario', str(services), '--outdir', outdir],
+            stdout=subprocess.PIPE,
+            env={**os.environ, 'JSII_SILENCE_WARNING_DEPRECATED_NODE_VERSION': '1'}
+        )
+
+        output = process.stdout.read()
+        process.stdout.close()
+        # Unlike subprocess, wait4 reports resource usage of a child together with its (node) children.
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = status
+
+        if status != 0:
+            raise RuntimeError(f'Scenario with {services} services failed.')
+
+    return {
+        **json.loads(output),
+        # Kilobytes on Linux.
+        'peak_memory_mib': round(usage.ru_maxrss / 1024),
+    }
+
+
+def check(results: Dict[str, Dict[str, Any]], budgets: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Compares deterministic measurements (counts) against budgets.
+
+    :param results: Measurements by scenario.
+    :param budgets: Budgets by scenario.
+
+    :return: Descriptions of exceeded budgets.
+    """
+    failures = []
+
+    for scenario, measurements in results.items():
+        if scenario not in budgets:
+            failures.append(f'{scenario} services: no budget, run with --write-budgets.')
+            continue
+
+        for metric in HEADROOM:
+            value, budget = measurements[metric], budgets[scenario].get(metric)
+
+            if budget is not None and value > budget:
+                failures.append(f'{scenario} services: {metric} {value} exceeds budget {budget}.')
+
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Synth benchmark of EcsFargateWithCiCd.')
+    parser.add_argument('--services', type=int, nargs='+', default=SCENARIOS, help='Scenarios to run.')
+    parser.add_argument('--budgets', default=BUDGETS_FILE, help='A budgets file.')
+    parser.add_argument('--write-budgets', action='store_true', help='Record measurements as new budgets.')
+    parser.add_argument('--run-scenario', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--outdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scenario is not None:
+        print(json.dumps(run_scenario(args.run_scenario, args.outdir)))
+        return
+
+    results = {}
+
+    for services in args.services:
+        results[str(services)] = measure(services)
+        print(f'{services} services: {json.dumps(results[str(services)])}')
+
+    budgets = {}
+
+    if os.path.exists(args.budgets):
+        with open(args.budgets) as file:
+            budgets = json.load(file)
+
+    if args.write_budgets:
+        for scenario, measurements in results.items():
+            budgets[scenario] = {
+                metric: round(value * HEADROOM[metric])
+                for metric, value in measurements.items() if metric in HEADROOM
+            }
+
+        with open(args.budgets, 'w') as file:
+            json.dump(budgets, file, indent=4, sort_keys=True)
+            file.write('\n')
+
+        print(f'Budgets written to {args.budgets}.')
+        return
+
+    failures = check(results, budgets)
+
+    for failure in failures:
+        print(failure)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+"""
+Fixtures which build services into an offline CDK app and synthesize them into CloudFormation templates.
+"""
+import json
+
+from typing import Any, Callable, Dict, List, Set, Tuple
+from aws_cdk import core, aws_ec2, aws_elasticloadbalancingv2
+from aws_ci_cd_fargate.ecs_fargate_with_ci_cd import EcsFargateWithCiCd
+from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
+from aws_ci_cd_fargate.parameters.lb_listener_parameters import LbListenerParameters
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+
+import pytest
+
+# An explicit environment and no lookups keep synthesis offline.
+ENVIRONMENT = core.Environment(account='123456789012', region='eu-west-1')
+
+
+class Network:
+    """
+    A vpc, a security group and a loadbalancer with production and deployment listeners shared by tested services.
+    """
+    def __init__(self, stack: core.Stack) -> None:
+        """
+        Constructor.
+
+        :param stack: A CloudFormation stack to which add resources.
+        """
+        self.vpc = aws_ec2.Vpc(stack, 'Vpc', max_azs=2)
+        self.security_group = aws_ec2.SecurityGroup(stack, 'SecurityGroup', vpc=self.vpc)
+
+        load_balancer = aws_elasticloadbalancingv2.CfnLoadBalancer(
+            stack, 'LoadBalancer',
+            subnets=[subnet.subnet_id for subnet in self.vpc.public_subnets]
+        )
+
+        self.production_listener, self.deployment_listener = [
+            aws_elasticloadbalancingv2.CfnListener(
+                stack, name,
+                load_balancer_arn=load_balancer.ref,
+                port=port,
+                protocol='HTTP',
+                default_actions=[aws_elasticloadbalancingv2.CfnListener.ActionProperty(
+                    type='fixed-response',
+                    fixed_response_config=aws_elasticloadbalancingv2.CfnListener.FixedResponseConfigProperty(
+                        status_code='404'
+                    )
+                )]
+            ) for name, port in [('ProductionListener', 80), ('DeploymentListener', 8080)]
+        ]
+
+    def ecs_params(self, **kwargs: Any) -> EcsParams:
+        """
+        Creates ecs parameters of a tested service.
+
+        :param kwargs: Optional ecs parameters.
+
+        :return: Ecs parameters.
+        """
+        return EcsParams(**{
+            'container_name': 'FargateEcsContainer',
+            'container_cpu': 256,
+            'container_ram': 512,
+            'container_environment': {},
+            'ecs_security_groups': [self.security_group],
+            'ecs_subnets': self.vpc.private_subnets,
+            **kwargs
+        })
+
+    def lb_listener_params(self, rule_priority: int = 100) -> LbListenerParameters:
+        """
+        Creates listener parameters of a tested service.
+
+        :param rule_priority: A priority of listener rules.
+
+        :return: Listener parameters.
+        """
+        return LbListenerParameters(
+            production_listener=self.production_listener,
+            deployment_listener=self.deployment_listener,
+            rule_priority=rule_priority,
+            rule_condition=aws_elasticloadbalancingv2.CfnListenerRule.RuleConditionProperty(
+                field='path-pattern',
+                path_pattern_config=aws_elasticloadbalancingv2.CfnListenerRule.PathPatternConfigProperty(
+                    values=[f'/{rule_priority}/*']
+                )
+            )
+        )
+
+
+class Template:
+    """
+    A synthesized CloudFormation template.
+    """
+    def __init__(self, template: Dict[str, Any]) -> None:
+        self.template = template
+
+    def resources(self, resource_type: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Finds resources of a given type.
+
+        :param resource_type: A CloudFormation resource type e.g. AWS::ECS::Service.
+
+        :return: Resources by logical id.
+        """
+        return {
+            logical_id: resource for logical_id, resource in self.template['Resources'].items()
+            if resource['Type'] == resource_type
+        }
+
+    def resource(self, resource_type: str) -> Dict[str, Any]:
+        """
+        Finds a single resource of a given type.
+
+        :param resource_type: A CloudFormation resource type e.g. AWS::ECS::Service.
+
+        :return: A resource.
+        """
+        resources = list(self.resources(resource_type).values())
+        assert len(resources) == 1, f'Expected a single {resource_type}, found {len(resources)}.'
+
+        return resources[0]
+
+    def properties(self, resource_type: str) -> Dict[str, Any]:
+        """
+        Finds properties of a single resource of a given type.
+
+        :param resource_type: A CloudFormation resource type e.g. AWS::ECS::Service.
+
+        :return: Resource properties.
+        """
+        return self.resource(resource_type)['Properties']
+
+    def custom_resource_call(self, name: str, action: str = 'Update') -> Tuple[Dict[str, Any], List[Any]]:
+        """
+        Finds an SDK call of a custom resource (AwsCustomResource).
+
+        :param name: A part of a logical id of the custom resource e.g. CustomFargateDeploymentGroupResource.
+        :param action: A call of the custom resource e.g. Create.
+
+        :return: The call where intrinsic functions are replaced with <<index>> placeholders, and a list
+        of replaced intrinsic functions.
+        """
+        payload = [
+            resource for logical_id, resource in self.resources('Custom::AWS').items() if name in logical_id
+        ][0]['Properties'][action]
+
+        parts = payload['Fn::Join'][1] if isinstance(payload, dict) else [payload]
+        intrinsics = [part for part in parts if not isinstance(part, str)]
+        call = json.loads(''.join(
+            part if isinstance(part, str) else f'<<{intrinsics.index(part)}>>' for part in parts
+        ))
+
+        return call, intrinsics
+
+    def deployment_files(self, action: str = 'Update') -> Tuple[Dict[str, str], List[Any]]:
+        """
+        Finds files (appspec.yaml and taskdef.json) committed to a deployment config repository on every stack
+        create and update.
+
+        :param action: A call of the committing custom resource e.g. Create.
+
+        :return: File contents by file path where intrinsic functions are replaced with <<index>> placeholders,
+        and a list of replaced intrinsic functions.
+        """
+        call, intrinsics = self.custom_resource_call('CustomDeploymentConfigUpdateResource', action)
+
+        return {
+            file['filePath']: file['fileContent'] for file in call['parameters']['putFiles']
+        }, intrinsics
+
+    def undefined_references(self) -> Set[str]:
+        """
+        Finds logical ids which are referenced (with Ref or Fn::GetAtt) but not defined in this template.
+
+        :return: A set of logical ids.
+        """
+        references = set()
+
+        def collect(value: Any) -> None:
+            if isinstance(value, list):
+                for item in value:
+                    collect(item)
+            elif isinstance(value, dict):
+                if 'Ref' in value and isinstance(value['Ref'], str):
+                    references.add(value['Ref'])
+                elif 'Fn::GetAtt' in value:
+                    attribute = value['Fn::GetAtt']
+                    references.add(attribute[0] if isinstance(attribute, list) else attribute.split('.')[0])
+
+                for item in value.values():
+                    collect(item)
+
+        collect(self.template)
+
+        defined = set(self.template.get('Resources', {})) | set(self.template.get('Parameters', {}))
+
+        return {reference for reference in references if reference not in defined and not reference.startswith('AWS::')}
+
+    def build_commands(self, phase: str) -> List[str]:
+        """
+        Returns commands of a docker build project's build phase.
+
+        :param phase: A build phase e.g. pre_build.
+
+        :return: A list of commands.
+        """
+        build_spec = json.loads(self.properties('AWS::CodeBuild::Project')['Source']['BuildSpec'])
+
+        return build_spec['phases'][phase]['commands']
+
+
+@pytest.fixture
+def app(tmp_path) -> core.App:
+    return core.App(outdir=str(tmp_path))
+
+
+@pytest.fixture
+def stack(app: core.App) -> core.Stack:
+    return core.Stack(app, 'TestStack', env=ENVIRONMENT)
+
+
+@pytest.fixture
+def network(stack: core.Stack) -> Network:
+    return Network(stack)
+
+
+@pytest.fixture
+def create_service(stack: core.Stack, network: Network) -> Callable[..., EcsFargateWithCiCd]:
+    """
+    Returns a function which creates a service with default parameters unless given otherwise.
+    """
+    def create_service(**kwargs: Any) -> EcsFargateWithCiCd:
+        parameters = {
+            'lb_params': LoadBalancerParams(),
+            'ecs_params': network.ecs_params(),
+            'lb_listener_params': network.lb_listener_params(),
+            'pipeline_params': PipelineParams(),
+            **kwargs
+        }
+
+        return EcsFargateWithCiCd(stack, prefix='Test', vpc=network.vpc, **parameters)
+
+    return create_service
+
+
+@pytest.fixture
+def synth(app: core.App, stack: core.Stack) -> Callable[[], Template]:
+    """
+    Returns a function which synthesizes the tested stack.
+    """
+    def synth() -> Template:
+        return Template(app.synth().get_stack_by_name(stack.stack_name).template)
+
+    return synth
+
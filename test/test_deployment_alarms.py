@@ -0,0 +1,79 @@
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
+
+import pytest
+
+LB_PARAMS = LoadBalancerParams(latency_p95_threshold=0.5, latency_p99_threshold=1.5, http_5xx_threshold=10)
+
+
+def test_alarm_metrics(create_service, synth):
+    create_service(lb_params=LB_PARAMS, deployment_alarms=True)
+
+    template = synth()
+    alarms = template.resources('AWS::CloudWatch::Alarm')
+    deployment_target_group = [
+        logical_id for logical_id in template.resources('AWS::ElasticLoadBalancingV2::TargetGroup')
+        if 'DeplTG' in logical_id
+    ][0]
+    deployment_alarms = {
+        (alarm['Properties']['MetricName'], alarm['Properties'].get('ExtendedStatistic')): alarm['Properties']
+        for logical_id, alarm in alarms.items() if 'DeplTG' in logical_id
+    }
+
+    # Both target groups are monitored, since they swap roles after every deployment.
+    assert len(alarms) == 6
+    assert set(deployment_alarms) == {
+        ('TargetResponseTime', 'p95'),
+        ('TargetResponseTime', 'p99'),
+        ('HTTPCode_Target_5XX_Count', None)
+    }
+    assert deployment_alarms[('TargetResponseTime', 'p95')]['Threshold'] == 0.5
+    assert deployment_alarms[('TargetResponseTime', 'p99')]['Threshold'] == 1.5
+    assert deployment_alarms[('HTTPCode_Target_5XX_Count', None)]['Statistic'] == 'Sum'
+    assert deployment_alarms[('HTTPCode_Target_5XX_Count', None)]['Threshold'] == 10
+
+    for alarm in deployment_alarms.values():
+        dimensions = {dimension['Name']: dimension['Value'] for dimension in alarm['Dimensions']}
+
+        assert alarm['Namespace'] == 'AWS/ApplicationELB'
+        assert alarm['ComparisonOperator'] == 'GreaterThanThreshold'
+        assert dimensions['TargetGroup'] == {'Fn::GetAtt': [deployment_target_group, 'TargetGroupFullName']}
+        # A loadbalancer full name (app/name/id) is the last part of a listener's loadbalancer arn.
+        assert dimensions['LoadBalancer']['Fn::Join'][0] == '/'
+        assert len(dimensions['LoadBalancer']['Fn::Join'][1]) == 3
+
+
+def test_alarm_names_in_custom_deployment_group(create_service, synth):
+    create_service(lb_params=LB_PARAMS, deployment_alarms=True)
+
+    template = synth()
+    alarms = template.resources('AWS::CloudWatch::Alarm')
+    deployment_group = [
+        resource for logical_id, resource in template.resources('Custom::AWS').items()
+        if 'DeploymentGroup' in logical_id
+    ][0]
+
+    for action in ['Create', 'Update']:
+        parts = deployment_group['Properties'][action]['Fn::Join'][1]
+
+        assert '"alarmConfiguration":{"enabled":true' in ''.join(part for part in parts if isinstance(part, str))
+
+        for logical_id in alarms:
+            assert {'Ref': logical_id} in parts
+
+
+@pytest.mark.parametrize('deployment_alarms', [True, False])
+def test_alarm_names_in_native_deployment_group(create_service, synth, deployment_alarms):
+    create_service(lb_params=LB_PARAMS, deployment_alarms=deployment_alarms, resource_mode=ResourceMode.NATIVE)
+
+    template = synth()
+    alarm_configuration = template.properties('AWS::CodeDeploy::DeploymentGroup').get('AlarmConfiguration')
+
+    if deployment_alarms:
+        assert alarm_configuration['Enabled'] is True
+        assert alarm_configuration['Alarms'] == [
+            {'Name': {'Ref': logical_id}} for logical_id in template.resources('AWS::CloudWatch::Alarm')
+        ]
+    else:
+        assert not template.resources('AWS::CloudWatch::Alarm')
+        assert not alarm_configuration or not alarm_configuration.get('Enabled')
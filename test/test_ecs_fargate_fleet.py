@@ -0,0 +1,98 @@
+import json
+
+from aws_ci_cd_fargate.ecs_fargate_fleet import EcsFargateFleet
+from aws_ci_cd_fargate.parameters.fleet_service_parameters import FleetServiceParams
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
+
+import pytest
+
+from test.conftest import Template
+
+
+@pytest.mark.parametrize('resource_mode', [ResourceMode.CUSTOM, ResourceMode.NATIVE])
+def test_nested_stacks_reference_only_own_resources(app, stack, network, resource_mode):
+    fleet = EcsFargateFleet(
+        stack,
+        prefix='Shop',
+        vpc=network.vpc,
+        services=[
+            FleetServiceParams(
+                prefix=prefix,
+                lb_params=LoadBalancerParams(),
+                ecs_params=network.ecs_params(),
+                lb_listener_params=network.lb_listener_params(rule_priority=100 + index),
+                pipeline_params=PipelineParams()
+            ) for index, prefix in enumerate(['Cart', 'Orders', 'Payments'])
+        ],
+        resource_mode=resource_mode,
+        services_per_stack=2
+    )
+
+    assembly = app.synth()
+    nested_templates = [
+        assembly.directory + '/' + nested_stack.template_file for nested_stack in fleet.nested_stacks
+    ]
+
+    assert len(nested_templates) == 2
+    assert not Template(assembly.get_stack_by_name(stack.stack_name).template).undefined_references()
+
+    # Resources of a parent stack (e.g. a shared task execution role) must be passed in as parameters.
+    for nested_template in nested_templates:
+        with open(nested_template) as file:
+            assert not Template(json.load(file)).undefined_references()
+
+
+def test_shared_role_policies_fit_iam_limits(app, stack, network):
+    # As many services per stack as the CloudFormation resource limit allows, and a remaining one.
+    fleet = EcsFargateFleet(
+        stack,
+        prefix='Shop',
+        vpc=network.vpc,
+        services=[
+            FleetServiceParams(
+                prefix=f'Service{index}',
+                lb_params=LoadBalancerParams(),
+                ecs_params=network.ecs_params(),
+                lb_listener_params=network.lb_listener_params(rule_priority=100 + index),
+                pipeline_params=PipelineParams()
+            ) for index in range(9)
+        ],
+        services_per_stack=8
+    )
+
+    assembly = app.synth()
+    custom_resource_policy_sizes = []
+
+    for nested_stack in fleet.nested_stacks:
+        with open(assembly.directory + '/' + nested_stack.template_file) as file:
+            template = Template(json.load(file))
+
+        policies = template.resources('AWS::IAM::Policy')
+
+        # Custom resources must not depend on their dropped policies.
+        for resource in template.template['Resources'].values():
+            assert set(resource.get('DependsOn', [])) <= set(template.template['Resources'])
+
+        for logical_id, role in template.resources('AWS::IAM::Role').items():
+            inline_policies = [policy['PolicyDocument'] for policy in role['Properties'].get('Policies', [])] + [
+                policy['Properties']['PolicyDocument'] for policy in policies.values()
+                if {'Ref': logical_id} in policy['Properties'].get('Roles', [])
+            ]
+
+            size = len(json.dumps(inline_policies, separators=(',', ':')))
+
+            # IAM limits a total size of inline policies of a role to 10240 characters (whitespace excluded).
+            assert size < 10240, logical_id
+
+            if 'CustomFargateDeploymentGroupRole' in logical_id:
+                custom_resource_policy_sizes.append(size)
+
+        statement = template.properties('AWS::IAM::ManagedPolicy')['PolicyDocument']['Statement'][0]
+
+        assert statement['Action'] == ['codecommit:CreateCommit', 'codecommit:GetBranch']
+
+    # A single custom resource role per stack is granted by policies which do not grow with services.
+    assert len(custom_resource_policy_sizes) == 2
+    assert custom_resource_policy_sizes[0] == custom_resource_policy_sizes[1]
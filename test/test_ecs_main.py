@@ -0,0 +1,219 @@
+import json
+
+from typing import Any, Dict, Tuple
+from aws_cdk import core, aws_ecs, aws_iam, aws_secretsmanager
+from aws_ci_cd_fargate.ecs_fargate_with_ci_cd import EcsFargateWithCiCd
+from aws_ci_cd_fargate.parameters.container_parameters import ContainerParams
+from aws_ci_cd_fargate.parameters.ecs_parameters import EcsParams
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+from aws_ci_cd_fargate.parameters.scaling_parameters import ScalingTarget, ScheduledScaling
+
+import pytest
+
+from test.conftest import ENVIRONMENT, Network, Template
+
+
+def test_request_count_scaling_tracks_both_target_groups(create_service, network, synth):
+    create_service(ecs_params=network.ecs_params(scaling_targets=[
+        ScalingTarget('Requests', ScalingTarget.REQUEST_COUNT, 1000),
+        ScalingTarget('Memory', ScalingTarget.MEMORY, 70)
+    ]))
+
+    template = synth()
+    policies = {
+        policy['Properties']['PolicyName']: policy['Properties']['TargetTrackingScalingPolicyConfiguration']
+        for policy in template.resources('AWS::ApplicationAutoScaling::ScalingPolicy').values()
+    }
+    target_groups = {
+        label: {'Fn::GetAtt': [logical_id, 'TargetGroupFullName']}
+        for label in ['ProdTG', 'DeplTG']
+        for logical_id in template.resources('AWS::ElasticLoadBalancingV2::TargetGroup') if label in logical_id
+    }
+
+    assert sorted(policies) == [
+        'TestFargateScalingPolicy',
+        'TestFargateScalingPolicyMemory',
+        'TestFargateScalingPolicyRequestsDeplTG',
+        'TestFargateScalingPolicyRequestsProdTG'
+    ]
+    assert 'ResourceLabel' not in policies['TestFargateScalingPolicyMemory']['PredefinedMetricSpecification']
+
+    for label, target_group in target_groups.items():
+        configuration = policies['TestFargateScalingPolicyRequests' + label]
+        metric = configuration['PredefinedMetricSpecification']
+
+        assert configuration['TargetValue'] == 1000
+        assert metric['PredefinedMetricType'] == 'ALBRequestCountPerTarget'
+        assert metric['ResourceLabel']['Fn::Join'][1][-1] == target_group
+
+
+def test_scheduled_scaling_time_zones(create_service, network, synth):
+    create_service(ecs_params=network.ecs_params(scheduled_scaling=[
+        ScheduledScaling('MorningPeak', '0 7 ? * MON-FRI *', min_capacity=3, time_zone='Europe/Vilnius'),
+        ScheduledScaling('Evening', '0 20 * * ? *', max_capacity=4),
+        ScheduledScaling('Night', '0 1 * * ? *', min_capacity=1, max_capacity=2, time_zone='America/New_York')
+    ]))
+
+    actions = {
+        action['ScheduledActionName']: action
+        for action in synth().properties('AWS::ApplicationAutoScaling::ScalableTarget')['ScheduledActions']
+    }
+
+    assert actions == {
+        'TestFargateScheduledScalingMorningPeak': {
+            'ScheduledActionName': 'TestFargateScheduledScalingMorningPeak',
+            'Schedule': 'cron(0 7 ? * MON-FRI *)',
+            'ScalableTargetAction': {'MinCapacity': 3},
+            'Timezone': 'Europe/Vilnius'
+        },
+        'TestFargateScheduledScalingEvening': {
+            'ScheduledActionName': 'TestFargateScheduledScalingEvening',
+            'Schedule': 'cron(0 20 * * ? *)',
+            'ScalableTargetAction': {'MaxCapacity': 4}
+        },
+        'TestFargateScheduledScalingNight': {
+            'ScheduledActionName': 'TestFargateScheduledScalingNight',
+            'Schedule': 'cron(0 1 * * ? *)',
+            'ScalableTargetAction': {'MinCapacity': 1, 'MaxCapacity': 2},
+            'Timezone': 'America/New_York'
+        }
+    }
+
+
+def test_task_definition_object(create_service, network, synth):
+    create_service(ecs_params=network.ecs_params(
+        cpu_architecture=EcsParams.ARM64,
+        ephemeral_storage=30,
+        sidecars=[ContainerParams('Proxy', 'envoyproxy/envoy:v1.24.0', container_ports=[9901])]
+    ), pipeline_params=PipelineParams(build_arm=True))
+
+    template = synth()
+    files, intrinsics = template.deployment_files()
+    task_definition = json.loads(files['taskdef.json'])
+    containers = {container['name']: container for container in task_definition['containerDefinitions']}
+    execution_role = [
+        logical_id for logical_id in template.resources('AWS::IAM::Role') if 'TaskExecutionRole' in logical_id
+    ][0]
+
+    assert containers['FargateEcsContainer']['image'] == '<IMAGE1_NAME>'
+    assert containers['FargateEcsContainer']['portMappings'] == [{'containerPort': 80, 'protocol': 'tcp'}]
+    assert containers['Proxy']['image'] == 'envoyproxy/envoy:v1.24.0'
+    assert task_definition['runtimePlatform'] == {'cpuArchitecture': 'ARM64', 'operatingSystemFamily': 'LINUX'}
+    assert template.properties('AWS::ECS::TaskDefinition')['RuntimePlatform'] == {
+        'CpuArchitecture': 'ARM64', 'OperatingSystemFamily': 'LINUX'
+    }
+    assert task_definition['ephemeralStorage'] == {'sizeInGiB': 30}
+    assert task_definition['family'] == 'test'
+    assert intrinsics[int(task_definition['executionRoleArn'].strip('<>'))] == {
+        'Fn::GetAtt': [execution_role, 'Arn']
+    }
+    assert not template.undefined_references()
+
+
+def test_task_definition_object_references_other_stacks(app, stack, create_service, network, synth):
+    other_stack = core.Stack(app, 'OtherStack', env=core.Environment(account=stack.account, region=stack.region))
+    database_role = aws_iam.Role(other_stack, 'DatabaseRole', assumed_by=aws_iam.AccountRootPrincipal())
+    database_secret = aws_secretsmanager.Secret(other_stack, 'DatabaseSecret')
+
+    create_service(ecs_params=network.ecs_params(
+        container_environment={'DATABASE_ROLE': database_role.role_arn},
+        container_secrets={'DATABASE_PASSWORD': aws_ecs.Secret.from_secrets_manager(database_secret)}
+    ))
+
+    template = synth()
+    files, intrinsics = template.deployment_files()
+    container = json.loads(files['taskdef.json'])['containerDefinitions'][0]
+    exports = {
+        output['Value']['Ref'] if 'Ref' in output['Value'] else output['Value']['Fn::GetAtt'][0]: output['Export']['Name']
+        for output in app.synth().get_stack_by_name('OtherStack').template['Outputs'].values()
+    }
+    database_role_id, database_secret_id = [
+        [logical_id for logical_id in exports if logical_id.startswith(name)][0]
+        for name in ['DatabaseRole', 'DatabaseSecret']
+    ]
+
+    # Values of other stacks are exported from them and imported into a task definition object.
+    assert intrinsics[int(container['environment'][0]['value'].strip('<>'))] == {
+        'Fn::ImportValue': exports[database_role_id]
+    }
+    assert intrinsics[int(container['secrets'][0]['valueFrom'].strip('<>'))] == {
+        'Fn::ImportValue': exports[database_secret_id]
+    }
+    assert not template.undefined_references()
+
+
+def test_task_definition_object_committed_on_update(tmp_path):
+    # Every synth gets its own app, which stands for a separate stack deployment.
+    def synth(**kwargs) -> Template:
+        app = core.App(outdir=str(tmp_path / str(len(list(tmp_path.iterdir())))))
+        stack = core.Stack(app, 'TestStack', env=ENVIRONMENT)
+        network = Network(stack)
+
+        EcsFargateWithCiCd(
+            stack,
+            prefix='Test',
+            vpc=network.vpc,
+            lb_params=LoadBalancerParams(),
+            ecs_params=network.ecs_params(**kwargs),
+            lb_listener_params=network.lb_listener_params(),
+            pipeline_params=PipelineParams()
+        )
+
+        return Template(app.synth().get_stack_by_name(stack.stack_name).template)
+
+    def branch_head(template: Template) -> Tuple[str, Dict[str, Any]]:
+        logical_id, resource = [
+            (logical_id, resource) for logical_id, resource in template.resources('Custom::AWS').items()
+            if 'CustomDeploymentConfigBranchHead' in logical_id
+        ][0]
+        parts = resource['Properties']['Update']['Fn::Join'][1]
+
+        return logical_id, json.loads(''.join(part if isinstance(part, str) else '' for part in parts))
+
+    template, updated_template = synth(), synth(stop_timeout=60)
+    files, intrinsics = updated_template.deployment_files()
+    branch_head_id, get_branch = branch_head(updated_template)
+
+    assert 'stopTimeout' not in json.loads(template.deployment_files()[0]['taskdef.json'])['containerDefinitions'][0]
+    # A stack update commits new files on top of the branch head.
+    assert json.loads(files['taskdef.json'])['containerDefinitions'][0]['stopTimeout'] == 60
+    assert {'Fn::GetAtt': [branch_head_id, 'branch.commitId']} in intrinsics
+    assert get_branch['action'] == 'getBranch'
+    # The branch head is read again (its physical id changes) whenever files change and only then.
+    assert get_branch['physicalResourceId'] != branch_head(template)[1]['physicalResourceId']
+    assert branch_head(synth())[1]['physicalResourceId'] == branch_head(template)[1]['physicalResourceId']
+
+
+def test_validate_ports(create_service, network):
+    service = create_service(ecs_params=network.ecs_params(container_ports=[8080, 9090]))
+    task_def, app_spec = service.ecs.create_task_def(), service.ecs.create_appspec()
+
+    service.ecs.validate_ports(task_def, app_spec)
+
+    with pytest.raises(ValueError, match='port 7070 in appspec'):
+        service.ecs.validate_ports(task_def, app_spec.replace('ContainerPort: 8080', 'ContainerPort: 7070'))
+
+    # A task definition which does not map a port receiving loadbalancer traffic.
+    with pytest.raises(ValueError, match=r'port 8080 in appspec .* maps ports \[9090\]'):
+        service.ecs.validate_ports(json.dumps({'containerDefinitions': [{
+            'name': 'FargateEcsContainer',
+            'image': '<IMAGE1_NAME>',
+            'portMappings': [{'containerPort': 9090, 'protocol': 'tcp'}]
+        }]}), app_spec)
+
+    with pytest.raises(ValueError, match='exactly one container with a deployed image'):
+        service.ecs.validate_ports(json.dumps({'containerDefinitions': [{
+            'name': 'FargateEcsContainer',
+            'image': 'nginx'
+        }]}), app_spec)
+
+
+def test_default_runtime_platform_not_set(create_service, synth):
+    create_service()
+
+    template = synth()
+
+    # Setting the default platform explicitly would replace task definitions of existing stacks.
+    assert 'RuntimePlatform' not in template.properties('AWS::ECS::TaskDefinition')
+    assert 'runtimePlatform' not in json.loads(template.deployment_files()[0]['taskdef.json'])
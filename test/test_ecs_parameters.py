@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.mark.parametrize('health_check_grace_period', [-1, 2147483648])
+def test_health_check_grace_period_range(network, health_check_grace_period):
+    with pytest.raises(ValueError, match=f'between 0 and 2147483647 seconds, got {health_check_grace_period}'):
+        network.ecs_params(health_check_grace_period=health_check_grace_period)
@@ -0,0 +1,60 @@
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
+
+import pytest
+
+STRATEGY = [
+    {'CapacityProvider': 'FARGATE', 'Base': 2, 'Weight': 1},
+    {'CapacityProvider': 'FARGATE_SPOT', 'Weight': 3}
+]
+
+
+def test_capacity_provider_strategy_in_custom_service(create_service, network, synth):
+    create_service(ecs_params=network.ecs_params(fargate_spot_weight=3, fargate_base=2))
+
+    on_create = synth().properties('Custom::EcsService')['OnCreate']
+
+    assert on_create['capacityProviderStrategy'] == [
+        {'capacityProvider': 'FARGATE', 'base': 2, 'weight': 1},
+        {'capacityProvider': 'FARGATE_SPOT', 'weight': 3}
+    ]
+    assert 'launchType' not in on_create
+
+
+@pytest.mark.parametrize('fargate_spot_weight', [3, None])
+def test_capacity_provider_strategy_in_native_service(create_service, network, synth, fargate_spot_weight):
+    create_service(
+        ecs_params=network.ecs_params(fargate_spot_weight=fargate_spot_weight, fargate_base=2),
+        resource_mode=ResourceMode.NATIVE
+    )
+
+    template = synth()
+    service = template.properties('AWS::ECS::Service')
+
+    if fargate_spot_weight:
+        associations = template.properties('AWS::ECS::ClusterCapacityProviderAssociations')
+
+        assert service['CapacityProviderStrategy'] == STRATEGY
+        assert 'LaunchType' not in service
+        assert associations['CapacityProviders'] == ['FARGATE', 'FARGATE_SPOT']
+    else:
+        assert service['LaunchType'] == 'FARGATE'
+        assert 'CapacityProviderStrategy' not in service
+
+
+def test_capacity_provider_strategy_in_appspec(create_service, network):
+    service = create_service(ecs_params=network.ecs_params(fargate_spot_weight=3, fargate_base=2))
+
+    assert service.ecs.create_appspec().endswith('\n'.join([
+        '        CapacityProviderStrategy:',
+        '          - CapacityProvider: "FARGATE"',
+        '            Base: 2',
+        '            Weight: 1',
+        '          - CapacityProvider: "FARGATE_SPOT"',
+        '            Weight: 3'
+    ]))
+
+
+def test_appspec_without_capacity_provider_strategy(create_service):
+    service = create_service()
+
+    assert 'CapacityProviderStrategy' not in service.ecs.create_appspec()
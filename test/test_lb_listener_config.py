@@ -0,0 +1,70 @@
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+
+
+def test_target_group_settings(create_service, synth):
+    create_service(lb_params=LoadBalancerParams(
+        healthy_http_codes=[200, 204],
+        health_check_path='/health',
+        deregistration_delay=30,
+        least_outstanding_requests=True,
+        health_check_interval=10,
+        health_check_timeout=5,
+        healthy_threshold_count=2,
+        unhealthy_threshold_count=3,
+        protocol_version=LoadBalancerParams.HTTP2
+    ))
+
+    target_groups = list(synth().resources('AWS::ElasticLoadBalancingV2::TargetGroup').values())
+
+    # Production and deployment target groups swap their roles, hence their settings must be identical.
+    assert len(target_groups) == 2
+
+    for target_group in target_groups:
+        properties = target_group['Properties']
+
+        assert properties['Matcher'] == {'HttpCode': '200,204'}
+        assert properties['ProtocolVersion'] == 'HTTP2'
+        assert properties['HealthCheckPath'] == '/health'
+        assert properties['HealthCheckIntervalSeconds'] == 10
+        assert properties['HealthCheckTimeoutSeconds'] == 5
+        assert properties['HealthyThresholdCount'] == 2
+        assert properties['UnhealthyThresholdCount'] == 3
+        assert properties['TargetGroupAttributes'] == [
+            {'Key': 'deregistration_delay.timeout_seconds', 'Value': '30'},
+            {'Key': 'load_balancing.algorithm.type', 'Value': 'least_outstanding_requests'}
+        ]
+
+
+def test_target_group_defaults(create_service, synth):
+    create_service()
+
+    for target_group in synth().resources('AWS::ElasticLoadBalancingV2::TargetGroup').values():
+        properties = target_group['Properties']
+
+        # AWS defaults apply to everything which is not configured.
+        assert properties['Matcher'] == {'HttpCode': '200'}
+        assert not {
+            'ProtocolVersion',
+            'HealthCheckIntervalSeconds',
+            'HealthCheckTimeoutSeconds',
+            'HealthyThresholdCount',
+            'UnhealthyThresholdCount',
+            'TargetGroupAttributes'
+        } & set(properties)
+
+
+def test_grpc_target_group(create_service, synth):
+    create_service(lb_params=LoadBalancerParams(
+        healthy_http_codes=[200],
+        slow_start=60,
+        protocol_version=LoadBalancerParams.GRPC,
+        healthy_grpc_codes=[0, 12]
+    ))
+
+    for target_group in synth().resources('AWS::ElasticLoadBalancingV2::TargetGroup').values():
+        properties = target_group['Properties']
+
+        # Healthy http codes are ignored by gRPC health checks.
+        assert properties['Matcher'] == {'GrpcCode': '0,12'}
+        assert properties['ProtocolVersion'] == 'GRPC'
+        assert properties['TargetGroupAttributes'] == [{'Key': 'slow_start.duration_seconds', 'Value': '60'}]
@@ -0,0 +1,28 @@
+from aws_ci_cd_fargate.parameters.lifecycle_hook_parameters import LifecycleHookParams
+
+import pytest
+
+TEST_URL = 'http://internal-test.eu-west-1.elb.amazonaws.com:8080'
+
+
+@pytest.mark.parametrize('name', ['warm_up_requests', 'load_test_requests', 'load_test_concurrency', 'request_timeout'])
+@pytest.mark.parametrize('value', [0, -1])
+def test_counts_must_be_positive(name, value):
+    with pytest.raises(ValueError, match=name):
+        LifecycleHookParams(TEST_URL, ['/health'], load_test_path='/', max_error_rate=0.01, **{name: value})
+
+
+def test_worst_case_duration_within_hook_timeout():
+    # 200 requests by 10 concurrent ones, each of which times out after 30 seconds, take 10 minutes.
+    params = LifecycleHookParams(
+        TEST_URL, load_test_path='/', max_error_rate=0.01, request_timeout=30, hook_timeout=10
+    )
+
+    assert params.max_load_test_duration == 600
+
+    with pytest.raises(ValueError, match='Load test may take up to 600 seconds'):
+        LifecycleHookParams(TEST_URL, load_test_path='/', max_error_rate=0.01, request_timeout=30, hook_timeout=9)
+
+    # Each of 3 paths is requested 25 times by 10 concurrent requests, i.e. in 3 rounds of 10 seconds.
+    with pytest.raises(ValueError, match='Warm up may take up to 90 seconds'):
+        LifecycleHookParams(TEST_URL, ['/a', '/b', '/c'], warm_up_requests=25, request_timeout=10, hook_timeout=1)
@@ -0,0 +1,59 @@
+from aws_ci_cd_fargate.parameters.lifecycle_hook_parameters import LifecycleHookParams
+
+HOOK_PARAMS = LifecycleHookParams(
+    'http://internal-test.eu-west-1.elb.amazonaws.com:8080',
+    warm_up_paths=['/health'],
+    load_test_path='/',
+    max_p99_latency=0.5
+)
+
+
+def test_appspec_hooks(create_service, synth):
+    create_service(lifecycle_hook_params=HOOK_PARAMS)
+
+    template = synth()
+    files, intrinsics = template.deployment_files()
+    functions = template.resources('AWS::Lambda::Function')
+
+    hooks = files['appspec.yaml'].split('Hooks:\n')[1].split('\n')
+
+    # Hooks are run in this order.
+    assert [hook.split(':')[0] for hook in hooks] == ['  - AfterAllowTestTraffic', '  - BeforeAllowTraffic']
+
+    for hook, name, handler in zip(hooks, ['WarmUp', 'LoadTest'], ['index.warm_up_handler', 'index.load_test_handler']):
+        logical_id, function = [
+            (logical_id, function) for logical_id, function in functions.items() if name + 'Hook' in logical_id
+        ][0]
+
+        assert intrinsics[int(hook.split('"')[1].strip('<>'))] == {'Ref': logical_id}
+        assert function['Properties']['FunctionName'] == f'TestFargate{name}Hook'
+        assert function['Properties']['Handler'] == handler
+        assert function['Properties']['Runtime'] == 'python3.12'
+        assert function['Properties']['Timeout'] == HOOK_PARAMS.hook_timeout * 60
+
+
+def test_appspec_without_hooks(create_service, synth):
+    create_service()
+
+    assert 'Hooks:' not in synth().deployment_files()[0]['appspec.yaml']
+
+
+def test_hook_status_permission_scoped_to_deployment_group(create_service, synth):
+    create_service(lifecycle_hook_params=HOOK_PARAMS)
+
+    template = synth()
+    statements = [
+        statement
+        for logical_id, policy in template.resources('AWS::IAM::Policy').items() if 'Hook' in logical_id
+        for statement in policy['Properties']['PolicyDocument']['Statement']
+        if statement['Action'] == 'codedeploy:PutLifecycleEventHookExecutionStatus'
+    ]
+
+    assert len(statements) == 2
+
+    for statement in statements:
+        assert statement['Resource'] == {'Fn::Join': ['', [
+            'arn:',
+            {'Ref': 'AWS::Partition'},
+            ':codedeploy:eu-west-1:123456789012:deploymentgroup:*/TestFargateDeploymentGroup'
+        ]]}
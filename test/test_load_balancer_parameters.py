@@ -0,0 +1,43 @@
+from aws_ci_cd_fargate.parameters.load_balancer_parameters import LoadBalancerParams
+
+import pytest
+
+
+@pytest.mark.parametrize('name, value, minimum, maximum', [
+    ('deregistration_delay', -1, 0, 3600),
+    ('deregistration_delay', 3601, 0, 3600),
+    ('slow_start', 29, 30, 900),
+    ('slow_start', 901, 30, 900),
+    ('health_check_interval', 4, 5, 300),
+    ('health_check_interval', 301, 5, 300),
+    ('health_check_timeout', 1, 2, 120),
+    ('health_check_timeout', 121, 2, 120),
+    ('healthy_threshold_count', 1, 2, 10),
+    ('healthy_threshold_count', 11, 2, 10),
+    ('unhealthy_threshold_count', 1, 2, 10),
+    ('unhealthy_threshold_count', 11, 2, 10),
+])
+def test_ranges(name, value, minimum, maximum):
+    with pytest.raises(ValueError, match=f'{name} must be between {minimum} and {maximum}, got {value}.'):
+        LoadBalancerParams(**{name: value})
+
+
+def test_slow_start_with_least_outstanding_requests():
+    with pytest.raises(ValueError, match='Slow start can not be used together with least outstanding requests'):
+        LoadBalancerParams(slow_start=60, least_outstanding_requests=True)
+
+
+def test_health_check_timeout_less_than_interval():
+    # The default interval is 30 seconds.
+    with pytest.raises(ValueError, match='Health check timeout must be less than health check interval.'):
+        LoadBalancerParams(health_check_timeout=30)
+
+    with pytest.raises(ValueError, match='Health check timeout must be less than health check interval.'):
+        LoadBalancerParams(health_check_interval=10, health_check_timeout=10)
+
+    assert LoadBalancerParams(health_check_interval=10, health_check_timeout=9).health_check_timeout == 9
+
+
+def test_protocol_version():
+    with pytest.raises(ValueError, match='Unsupported protocol version HTTP3.'):
+        LoadBalancerParams(protocol_version='HTTP3')
@@ -0,0 +1,199 @@
+import json
+
+from aws_ci_cd_fargate.parameters.pipeline_parameters import PipelineParams
+
+import pytest
+
+
+def test_build_cache_modes(create_service, synth):
+    create_service()
+
+    cache = synth().properties('AWS::CodeBuild::Project')['Cache']
+
+    assert cache['Type'] == 'LOCAL'
+    assert sorted(cache['Modes']) == ['LOCAL_DOCKER_LAYER_CACHE', 'LOCAL_SOURCE_CACHE']
+
+
+def test_build_cache_commands(create_service, synth):
+    create_service(pipeline_params=PipelineParams(build_cache_tag='cache'))
+
+    template = synth()
+    environment = template.properties('AWS::CodeBuild::Project')['Environment']['EnvironmentVariables']
+    build_command = template.build_commands('build')[0]
+
+    assert {'Name': 'CACHE_TAG', 'Type': 'PLAINTEXT', 'Value': 'cache'} in environment
+    assert 'docker pull $REPOSITORY_URI:$CACHE_TAG || true' in template.build_commands('pre_build')
+    assert build_command.startswith('DOCKER_BUILDKIT=1 docker build ')
+    assert '--cache-from $REPOSITORY_URI:$CACHE_TAG' in build_command
+    assert '--build-arg BUILDKIT_INLINE_CACHE=1' in build_command
+    assert '-t $REPOSITORY_URI:$CACHE_TAG' in build_command
+    assert 'docker push $REPOSITORY_URI:$CACHE_TAG' in template.build_commands('post_build')
+
+
+def test_build_cache_disabled(create_service, synth):
+    create_service(pipeline_params=PipelineParams(build_cache=False))
+
+    template = synth()
+    commands = [
+        command for phase in ['pre_build', 'build', 'post_build'] for command in template.build_commands(phase)
+    ]
+
+    # Older CDK versions omit a cache while newer ones render it as NO_CACHE.
+    assert template.properties('AWS::CodeBuild::Project').get('Cache', {}).get('Type', 'NO_CACHE') == 'NO_CACHE'
+    assert not [command for command in commands if '$CACHE_TAG' in command or 'BUILDKIT_INLINE_CACHE' in command]
+
+
+@pytest.mark.parametrize('single_pipeline, stages', [
+    (True, [['SourceStage', 'BuildStage', 'DeployStage']]),
+    (False, [['SourceStage', 'BuildStage'], ['SourceStage', 'DeployStage']])
+])
+def test_single_pipeline(create_service, synth, single_pipeline, stages):
+    create_service(pipeline_params=PipelineParams(single_pipeline=single_pipeline))
+
+    template = synth()
+    pipelines = template.resources('AWS::CodePipeline::Pipeline').values()
+    build_role = template.properties('AWS::CodeBuild::Project')['ServiceRole']['Fn::GetAtt'][0]
+    build_actions = [
+        action
+        for policy in template.resources('AWS::IAM::Policy').values()
+        if {'Ref': build_role} in policy['Properties']['Roles']
+        for statement in policy['Properties']['PolicyDocument']['Statement']
+        for action in ([statement['Action']] if isinstance(statement['Action'], str) else statement['Action'])
+    ]
+    start_command = 'aws codepipeline start-pipeline-execution --name $PIPELINE_NAME'
+
+    assert sorted([stage['Name'] for stage in pipeline['Properties']['Stages']] for pipeline in pipelines) == stages
+    # A built image is handed to the deploy stage instead of starting another pipeline.
+    assert (start_command in template.build_commands('post_build')) is not single_pipeline
+    assert ('codepipeline:StartPipelineExecution' in build_actions) is not single_pipeline
+
+
+def test_zstd_image_requires_single_pipeline():
+    with pytest.raises(ValueError, match='single_pipeline=True'):
+        PipelineParams(zstd_image=True)
+
+    with pytest.raises(ValueError, match='can not be used together'):
+        PipelineParams(zstd_image=True, soci_index=True, single_pipeline=True)
+
+
+def test_zstd_image_commands(create_service, synth):
+    create_service(pipeline_params=PipelineParams(zstd_image=True, single_pipeline=True))
+
+    template = synth()
+    post_build_commands = template.build_commands('post_build')
+    buildx_command = [command for command in post_build_commands if command.startswith('docker buildx build ')][0]
+    image_uri_commands = [command for command in post_build_commands if command.startswith('export IMAGE_URI=')]
+
+    assert post_build_commands.index('docker buildx create --use') < post_build_commands.index(buildx_command)
+    assert 'name=$REPOSITORY_URI:$IMAGE_TAG-zstd' in buildx_command
+    assert 'compression=zstd,force-compression=true,push=true' in buildx_command
+    assert buildx_command.endswith('--metadata-file zstd-metadata.json .')
+    # The zstd variant is deployed, hence its digest is exported last and written into the build artifact.
+    assert image_uri_commands[-1] == (
+        'export IMAGE_URI=$REPOSITORY_URI@$(jq -r \'."containerimage.digest"\' zstd-metadata.json)'
+    )
+    assert post_build_commands.index(image_uri_commands[-1]) < post_build_commands.index(
+        'printf \'{"ImageURI":"%s"}\' $IMAGE_URI > imageDetail.json'
+    )
+
+
+def test_soci_index_commands(create_service, synth):
+    create_service(pipeline_params=PipelineParams(soci_index=True, soci_version='0.4.0'))
+
+    post_build_commands = synth().build_commands('post_build')
+    curl_command = [command for command in post_build_commands if command.startswith('curl ')][0]
+    # An index is created for an already pushed image.
+    soci_commands = post_build_commands[post_build_commands.index(curl_command):]
+
+    assert post_build_commands.index('docker push $REPOSITORY_URI:$IMAGE_TAG') < post_build_commands.index(curl_command)
+    assert 'soci-snapshotter-0.4.0-linux-amd64.tar.gz' in soci_commands[0]
+    assert soci_commands[1].startswith('ctr --address /var/run/docker/containerd/containerd.sock image pull ')
+    assert soci_commands[2].endswith('create $REPOSITORY_URI:$IMAGE_TAG')
+    assert soci_commands[3].endswith('push --user AWS:$(aws ecr get-login-password --region $REGION) '
+                                     '$REPOSITORY_URI:$IMAGE_TAG')
+    assert not [command for command in post_build_commands if 'zstd' in command]
+
+
+@pytest.mark.parametrize('pipeline_params', [
+    PipelineParams(soci_index=True),
+    PipelineParams(zstd_image=True, single_pipeline=True)
+])
+def test_build_role_pushes_image_variants(create_service, synth, pipeline_params):
+    create_service(pipeline_params=pipeline_params)
+
+    template = synth()
+    build_role = template.properties('AWS::CodeBuild::Project')['ServiceRole']['Fn::GetAtt'][0]
+    actions = {
+        action
+        for policy in template.resources('AWS::IAM::Policy').values()
+        if {'Ref': build_role} in policy['Properties']['Roles']
+        for statement in policy['Properties']['PolicyDocument']['Statement'] if statement['Resource'] == '*'
+        for action in ([statement['Action']] if isinstance(statement['Action'], str) else statement['Action'])
+    }
+
+    # A SOCI index and a zstd variant are pushed as separate manifests with the same ECR permissions as an image.
+    assert {
+        'ecr:GetAuthorizationToken',
+        'ecr:BatchCheckLayerAvailability',
+        'ecr:InitiateLayerUpload',
+        'ecr:UploadLayerPart',
+        'ecr:CompleteLayerUpload',
+        'ecr:PutImage',
+        'ecr:BatchGetImage',
+        'ecr:GetDownloadUrlForLayer'
+    } <= actions
+
+
+def test_build_role_reads_only_configured_secrets(create_service, synth):
+    create_service(pipeline_params=PipelineParams(
+        build_secrets={
+            'NPM_TOKEN': 'npm-token:token',
+            'DOCKER_PASSWORD': 'arn:aws:secretsmanager:eu-west-1:123456789012:secret:docker-AbCdEf:password'
+        },
+        build_parameters={'API_URL': '/shop/api-url', 'FLAG': 'flag'}
+    ))
+
+    template = synth()
+    build_role = template.properties('AWS::CodeBuild::Project')['ServiceRole']['Fn::GetAtt'][0]
+    resources = {'secretsmanager:GetSecretValue': [], 'ssm:GetParameters': []}
+
+    for policy in template.resources('AWS::IAM::Policy').values():
+        if {'Ref': build_role} not in policy['Properties']['Roles']:
+            continue
+
+        for statement in policy['Properties']['PolicyDocument']['Statement']:
+            actions = [statement['Action']] if isinstance(statement['Action'], str) else statement['Action']
+            statement_resources = statement['Resource'] if isinstance(statement['Resource'], list) else [
+                statement['Resource']
+            ]
+
+            for action in set(actions) & set(resources):
+                resources[action].extend(
+                    # Partitions are the only intrinsic functions of secret and parameter arns.
+                    ''.join(part if isinstance(part, str) else 'aws' for part in resource['Fn::Join'][1])
+                    if isinstance(resource, dict) else resource
+                    for resource in statement_resources
+                )
+
+    assert sorted(resources['secretsmanager:GetSecretValue']) == [
+        'arn:aws:secretsmanager:eu-west-1:123456789012:secret:docker-AbCdEf*',
+        'arn:aws:secretsmanager:eu-west-1:123456789012:secret:npm-token-??????'
+    ]
+    assert sorted(resources['ssm:GetParameters']) == [
+        'arn:aws:ssm:eu-west-1:123456789012:parameter/flag',
+        'arn:aws:ssm:eu-west-1:123456789012:parameter/shop/api-url'
+    ]
+
+
+def test_build_role_reads_no_secrets_by_default(create_service, synth):
+    create_service()
+
+    template = synth()
+    build_role = template.properties('AWS::CodeBuild::Project')['ServiceRole']['Fn::GetAtt'][0]
+    actions = json.dumps([
+        policy for policy in template.resources('AWS::IAM::Policy').values()
+        if {'Ref': build_role} in policy['Properties']['Roles']
+    ])
+
+    assert 'secretsmanager:' not in actions
+    assert 'ssm:' not in actions
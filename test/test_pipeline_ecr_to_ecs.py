@@ -0,0 +1,51 @@
+from aws_ci_cd_fargate.parameters.deployment_parameters import DeploymentParams
+from aws_ci_cd_fargate.parameters.resource_mode import ResourceMode
+
+import pytest
+
+
+@pytest.mark.parametrize('traffic_shift_type, time_based', [
+    (DeploymentParams.CANARY, {'TimeBasedCanary': {'CanaryPercentage': 20, 'CanaryInterval': 3}}),
+    (DeploymentParams.LINEAR, {'TimeBasedLinear': {'LinearPercentage': 20, 'LinearInterval': 3}})
+])
+@pytest.mark.parametrize('resource_mode', [ResourceMode.CUSTOM, ResourceMode.NATIVE])
+def test_custom_traffic_shift(create_service, synth, traffic_shift_type, time_based, resource_mode):
+    create_service(
+        deployment_params=DeploymentParams(
+            traffic_shift_type=traffic_shift_type,
+            traffic_shift_percentage=20,
+            traffic_shift_interval=3
+        ),
+        resource_mode=resource_mode
+    )
+
+    template = synth()
+    config_id, config = list(template.resources('AWS::CodeDeploy::DeploymentConfig').items())[0]
+
+    assert config['Properties'] == {
+        'ComputePlatform': 'ECS',
+        'TrafficRoutingConfig': {'Type': traffic_shift_type, **time_based}
+    }
+
+    # A deployment group uses the generated name of the deployment config.
+    if resource_mode == ResourceMode.CUSTOM:
+        for action in ['Create', 'Update']:
+            call, intrinsics = template.custom_resource_call('CustomFargateDeploymentGroupResource', action)
+
+            assert intrinsics[int(call['parameters']['deploymentConfigName'].strip('<>'))] == {'Ref': config_id}
+    else:
+        deployment_group = template.properties('AWS::CodeDeploy::DeploymentGroup')
+
+        assert deployment_group['DeploymentConfigName'] == {'Ref': config_id}
+
+
+def test_built_in_deployment_config(create_service, synth):
+    create_service(
+        deployment_params=DeploymentParams(deployment_config_name=DeploymentParams.CANARY_10_PERCENT_5_MINUTES)
+    )
+
+    template = synth()
+    call, _ = template.custom_resource_call('CustomFargateDeploymentGroupResource', 'Create')
+
+    assert not template.resources('AWS::CodeDeploy::DeploymentConfig')
+    assert call['parameters']['deploymentConfigName'] == DeploymentParams.CANARY_10_PERCENT_5_MINUTES